@@ -6,6 +6,7 @@ from core.database import db
 from datetime import datetime
 from bson import ObjectId
 from core.logger import get_logger
+from services.pretranslation import pretranslator
 
 router = APIRouter(prefix="/api/v1/documents", tags=["Documents"])
 logger = get_logger(__name__)
@@ -35,7 +36,10 @@ async def save_document(
 
     # Insert into database
     result = await database.documents.insert_one(doc_dict)
-    
+
+    # Translate the explanation into the configured languages once the service is idle
+    pretranslator.submit(str(result.inserted_id))
+
     # Return response with generated ID
     return DocumentResponse(
         id=str(result.inserted_id),
@@ -69,7 +73,8 @@ async def get_document_history(
             severity=doc.get("severity"),
             explanation=doc["explanation"],
             metadata=doc.get("metadata"),
-            created_at=doc["created_at"]
+            created_at=doc["created_at"],
+            translations=doc.get("translations")
         ))
     
     return documents
@@ -1,4 +1,13 @@
 from fastapi import APIRouter
+from core.workers import pools
+from services.analysis_cache import cache_stats
+from services.llm_clients import llm_clients
+from services.llm_router import llm_router
+from services.llm_scheduler import llm_scheduler
+from services import llm_cache
+from services import notice_pipeline, simplifier
+from services.job_queue import job_queue
+from services.pretranslation import pretranslator
 
 router = APIRouter()
 
@@ -6,5 +15,17 @@ router = APIRouter()
 def health_check():
     return {
         "status": "ok",
-        "service": "CivicSense AI Backend"
+        "service": "CivicSense AI Backend",
+        "workers": pools.stats(),
+        "llm_clients": llm_clients.stats(),
+        "llm_router": llm_router.stats(),
+        "llm_scheduler": llm_scheduler.stats(),
+        "analysis_cache": cache_stats(),
+        "llm_cache": llm_cache.cache_stats(),
+        "coalescing": {
+            **notice_pipeline.coalescing_stats(),
+            "llm": simplifier.coalescing_stats()
+        },
+        "jobs": job_queue.stats(),
+        "pretranslation": pretranslator.stats()
     }
@@ -0,0 +1,92 @@
+import asyncio
+from fastapi import APIRouter, UploadFile, File, HTTPException, status
+from fastapi.responses import StreamingResponse
+from models.job import JobSubmitted, JobStatus
+from services.job_queue import job_queue, JobQueueFull, FINISHED_STATUSES
+from services.notice_pipeline import ALLOWED_CONTENT_TYPES
+from utils.sse import format_sse, SSE_KEEPALIVE
+from core.logger import get_logger
+
+router = APIRouter()
+logger = get_logger(__name__)
+
+@router.post("/jobs/upload-notice", response_model=JobSubmitted, status_code=status.HTTP_202_ACCEPTED)
+async def submit_notice_job(file: UploadFile = File(...)):
+    """
+    Queue a notice for background analysis and return a job id immediately.
+    Poll /jobs/{job_id} or subscribe to /jobs/{job_id}/events for progress.
+    """
+    if file.content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file type. Please upload JPG, PNG, or PDF."
+        )
+
+    try:
+        file_bytes = await file.read()
+        job = job_queue.submit(file_bytes, file.filename)
+    except JobQueueFull as e:
+        logger.warning(f"Rejecting notice job, {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy processing other notices. Please try again shortly."
+        )
+    except Exception as e:
+        logger.error(f"Error queuing notice job: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while queuing the notice. Please try again."
+        )
+
+    job_id = job["job_id"]
+    return JobSubmitted(
+        job_id=job_id,
+        status=job["status"],
+        status_url=f"/api/v1/jobs/{job_id}",
+        events_url=f"/api/v1/jobs/{job_id}/events"
+    )
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_notice_job(job_id: str):
+    """
+    Poll job state: status, current stage, progress and the final result.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobStatus(**job)
+
+def _job_event(job: dict) -> str:
+    event = job["status"] if job["status"] in FINISHED_STATUSES else "progress"
+    return format_sse(event, JobStatus(**job).model_dump(mode="json"))
+
+@router.get("/jobs/{job_id}/events")
+async def stream_notice_job(job_id: str):
+    """
+    Server-Sent Events stream of job state. Sends the current state, then one
+    'progress' event per stage, and closes after a 'completed' or 'failed' event.
+    """
+    if job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_stream():
+        # Subscribe before reading state so no transition is missed
+        events = job_queue.subscribe(job_id)
+        try:
+            job = job_queue.get(job_id)
+            yield _job_event(job)
+            while job["status"] not in FINISHED_STATUSES:
+                try:
+                    job = await asyncio.wait_for(events.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield SSE_KEEPALIVE
+                    continue
+                yield _job_event(job)
+        finally:
+            job_queue.unsubscribe(job_id, events)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from services.scheme_engine import match_schemes, get_all_schemes, refresh_schemes, get_api_status
+from services.scheme_engine import (
+    match_schemes, refresh_schemes, get_api_status, search_schemes, get_catalog_response
+)
+from core.config import SCHEMES_CACHE_MAX_AGE
 from core.logger import get_logger
 
 router = APIRouter()
@@ -30,18 +34,35 @@ def api_status():
         )
 
 @router.get("/schemes")
-def list_all_schemes():
+def list_all_schemes(
+    request: Request,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    fields: Optional[str] = Query(None, description="Comma-separated scheme fields to return, e.g. name,category")
+):
     """
     Get all available government schemes.
     Frontend can use this to display full scheme catalog.
+    Supports pagination (offset/limit) and field projection; responses are
+    served pre-compressed with an ETag, and If-None-Match gets a 304.
+    Without a limit, only the full catalog (all fields or the scheme card
+    fields) is returned whole; other requests get pages of up to 1000.
     """
     try:
-        all_schemes = get_all_schemes()
-        logger.info(f"Returning {len(all_schemes)} schemes")
-        return {
-            "schemes": all_schemes,
-            "total": len(all_schemes)
+        projection = tuple(sorted({f.strip() for f in fields.split(",") if f.strip()})) if fields else ()
+        body = get_catalog_response(projection, offset, limit)
+        encoding = body.encoding_for(request.headers.get("accept-encoding"))
+        headers = {
+            "ETag": body.etags[encoding],
+            "Cache-Control": f"public, max-age={SCHEMES_CACHE_MAX_AGE}",
+            "Vary": "Accept-Encoding"
         }
+        if body.not_modified(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=body.bodies[encoding], media_type="application/json", headers=headers)
     except Exception as e:
         logger.error(f"Error fetching schemes: {str(e)}")
         raise HTTPException(
@@ -49,6 +70,34 @@ def list_all_schemes():
             detail="An error occurred while fetching schemes."
         )
 
+@router.get("/schemes/search")
+def search_all_schemes(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Typo-tolerant search of the scheme catalog ("kisan samman", "ujwala").
+    Returns ranked, paginated schemes plus completions for the last word
+    typed, for search-as-you-type.
+    """
+    try:
+        found = search_schemes(q, limit, offset)
+        return {
+            "query": q,
+            "schemes": found["results"],
+            "total": found["total"],
+            "offset": offset,
+            "limit": limit,
+            "completions": found["completions"]
+        }
+    except Exception as e:
+        logger.error(f"Error searching schemes: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while searching schemes."
+        )
+
 @router.post("/find-schemes")
 def find_schemes(data: SchemeRequest):
     """
@@ -83,13 +132,13 @@ def find_schemes(data: SchemeRequest):
         )
 
 @router.get("/schemes/refresh")
-def refresh_all_schemes():
+async def refresh_all_schemes():
     """
     Reload schemes from data file.
     Useful after manual updates to schemes database.
     """
     try:
-        schemes = refresh_schemes()
+        schemes = await refresh_schemes()
         logger.info(f"Reloaded {len(schemes)} schemes")
         return {
             "message": "Schemes reloaded successfully",
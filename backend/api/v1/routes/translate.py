@@ -1,8 +1,8 @@
+from typing import Dict, List
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
-from services.simplifier import _simplify_with_groq
-from core.config import GROQ_API_KEY
-import json
+from services.translator import translate_segments, translate_text as translate
+from core.config import TRANSLATE_MAX_SEGMENTS, TRANSLATE_MAX_LANGUAGES
 
 router = APIRouter(prefix="/api/v1", tags=["Translation"])
 
@@ -13,6 +13,14 @@ class TranslationRequest(BaseModel):
 class TranslationResponse(BaseModel):
     translated_text: str
 
+class BatchTranslationRequest(BaseModel):
+    segments: List[str]
+    target_languages: List[str]
+
+class BatchTranslationResponse(BaseModel):
+    # target language -> translated segments, in request order
+    translations: Dict[str, List[str]]
+
 @router.post("/translate", response_model=TranslationResponse)
 async def translate_text(request: TranslationRequest):
     """
@@ -22,43 +30,41 @@ async def translate_text(request: TranslationRequest):
         if not request.text:
             return TranslationResponse(translated_text="")
 
-        prompt = f"""Translate the following text to {request.target_language}. 
-        Maintain the tone and formatting. 
-        Return ONLY the translated text, no introductory or concluding remarks.
-        
-        Text to translate:
-        {request.text}
-        """
+        translated = await translate(request.text, request.target_language)
+        return TranslationResponse(translated_text=translated)
 
-        # Reuse the Groq helper but we need to bypass the strict JSON constraint of _simplify_with_groq 
-        # or adapt it. Since _simplify_with_groq enforces JSON output matching a specific schema,
-        # we should probably instantiate a direct client here or make a generic helper.
-        # For speed, let's use a direct client call similar to _simplify_with_groq but for plain text/translation.
-        
-        from groq import Groq
-        client = Groq(api_key=GROQ_API_KEY)
-        
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": f"You are a professional translator. Translate content to {request.target_language} accurately."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1000
+    except Exception as e:
+        print(f"Translation error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Translation service failed"
         )
-        
-        translated = response.choices[0].message.content.strip()
-        
-        # Cleanup if it returns quotes
-        if translated.startswith('"') and translated.endswith('"'):
-            translated = translated[1:-1]
-            
-        return TranslationResponse(translated_text=translated)
+
+@router.post("/translate/batch", response_model=BatchTranslationResponse)
+async def translate_batch(request: BatchTranslationRequest):
+    """
+    Translate many segments (e.g. every field of an explanation) into one or
+    more languages with as few LLM calls as possible
+    """
+    if len(request.segments) > TRANSLATE_MAX_SEGMENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many segments. Please send at most {TRANSLATE_MAX_SEGMENTS} at once."
+        )
+    if len(request.target_languages) > TRANSLATE_MAX_LANGUAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many languages. Please request at most {TRANSLATE_MAX_LANGUAGES} at once."
+        )
+
+    try:
+        languages = list(dict.fromkeys(request.target_languages))
+        translations = await translate_segments(request.segments, languages)
+        return BatchTranslationResponse(translations=translations)
 
     except Exception as e:
         print(f"Translation error: {e}")
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Translation service failed"
         )
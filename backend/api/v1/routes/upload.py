@@ -1,9 +1,13 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from services.ocr_service import extract_text
-from services.notice_classifier import classify_notice
-from services.severity_analyzer import analyze_severity
-from services.simplifier import simplify_notice
-from services.scheme_engine import suggest_schemes
+from fastapi.responses import StreamingResponse
+from typing import List
+import asyncio
+import json
+from services.notice_pipeline import process_notice, process_notice_when_ready, stream_notice, ALLOWED_CONTENT_TYPES
+from core.workers import WorkerPoolBusy
+from core.singleflight import SingleFlightTimeout
+from core.config import BATCH_CONCURRENCY, BATCH_MAX_FILES
+from utils.sse import format_sse
 from core.logger import get_logger
 
 router = APIRouter()
@@ -19,50 +23,24 @@ async def upload_notice(file: UploadFile = File(...)):
         logger.info(f"Processing file: {file.filename}")
         
         # Validate file type
-        allowed_types = ['image/jpeg', 'image/png', 'image/jpg', 'application/pdf']
-        if file.content_type not in allowed_types:
+        if file.content_type not in ALLOWED_CONTENT_TYPES:
             raise HTTPException(
                 status_code=400, 
                 detail="Invalid file type. Please upload JPG, PNG, or PDF."
             )
         
-        text = extract_text(file)
-        
-        logger.info(f"Extracted text length: {len(text)} characters")
-        
-        # More lenient validation - allow shorter text for demo
-        # More lenient validation - allow shorter text for demo
-        if not text or len(text.strip()) < 5:
-            logger.warning(f"Insufficient text extracted: '{text[:100] if text else ''}'")
-            return {
-                "notice_type": "No_Text_Detected",
-                "severity": "Rejected",
-                "explanation": {
-                    "english": "We could not detect any text in this image. It appears to be a picture of an object, scene, or a very blurry document.",
-                    "hinglish": "Is tasveer mein koi text nahi mila. Yeh kisi object ya scene ki photo lag rahi hai.",
-                    "is_notice": False
-                },
-                "scheme_suggestions": []
-            }
-        
-        logger.debug(f"Extracted text preview: {text[:100]}...")
+        file_bytes = await file.read()
         
-        notice_type = classify_notice(text)
-        severity = analyze_severity(text)
-        explanation = simplify_notice(text, notice_type, severity)
-        schemes = suggest_schemes(text)
-        
-        logger.info(f"Successfully processed notice: {notice_type}")
-
-        return {
-            "notice_type": notice_type,
-            "severity": severity,
-            "explanation": explanation,
-            "scheme_suggestions": schemes
-        }
+        return await process_notice(file_bytes, file.filename)
     
     except HTTPException:
         raise
+    except (WorkerPoolBusy, SingleFlightTimeout) as e:
+        logger.warning(f"Rejecting upload, {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy processing other notices. Please try again shortly."
+        )
     except Exception as e:
         logger.error(f"Error processing notice: {str(e)}")
         raise HTTPException(
@@ -70,6 +48,90 @@ async def upload_notice(file: UploadFile = File(...)):
             detail="An error occurred while processing the notice. Please try again."
         )
 
+@router.post("/upload-notice/stream")
+async def upload_notice_stream(file: UploadFile = File(...)):
+    """
+    Upload and analyze a notice, streaming results as Server-Sent Events.
+    notice_type, severity and scheme_suggestions arrive in an 'analysis' event
+    right after OCR; the LLM explanation follows as 'explanation_delta' chunks,
+    then 'explanation' and a final 'done' event with the full result.
+    """
+    logger.info(f"Streaming analysis for file: {file.filename}")
+
+    if file.content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file type. Please upload JPG, PNG, or PDF."
+        )
+
+    file_bytes = await file.read()
+
+    async def event_stream():
+        try:
+            async for event, data in stream_notice(file_bytes, file.filename):
+                yield format_sse(event, data)
+        except (WorkerPoolBusy, SingleFlightTimeout) as e:
+            logger.warning(f"Rejecting streamed upload, {str(e)}")
+            yield format_sse("error", {"detail": "Server is busy processing other notices. Please try again shortly."})
+        except Exception as e:
+            logger.error(f"Error streaming notice: {str(e)}")
+            yield format_sse("error", {"detail": "An error occurred while processing the notice. Please try again."})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/upload-notices")
+async def upload_notices(files: List[UploadFile] = File(...)):
+    """
+    Upload and analyze many notices in one request.
+    Files are processed concurrently (BATCH_CONCURRENCY at a time) and each
+    result is streamed as one NDJSON line as soon as that file finishes.
+    Each line has "index", "filename", "status" ("ok" or "error") and
+    either "result" or "detail".
+    """
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Please upload at most {BATCH_MAX_FILES} notices at once."
+        )
+
+    logger.info(f"Processing batch of {len(files)} files")
+
+    # Read everything before streaming starts; uploads are closed once the handler returns
+    uploads = []
+    for index, file in enumerate(files):
+        uploads.append((index, file.filename, file.content_type, await file.read()))
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def process_one(index, filename, content_type, file_bytes):
+        line = {"index": index, "filename": filename}
+        if content_type not in ALLOWED_CONTENT_TYPES:
+            line.update(status="error", detail="Invalid file type. Please upload JPG, PNG, or PDF.")
+            return line
+        async with semaphore:
+            try:
+                line.update(status="ok", result=await process_notice_when_ready(file_bytes, filename))
+            except Exception as e:
+                logger.error(f"Error processing {filename} in batch: {str(e)}")
+                line.update(status="error", detail="An error occurred while processing the notice. Please try again.")
+        return line
+
+    async def result_stream():
+        tasks = [asyncio.create_task(process_one(*upload)) for upload in uploads]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield json.dumps(await finished, ensure_ascii=False) + "\n"
+        finally:
+            # Client went away - don't keep OCR/LLM busy for nobody
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(result_stream(), media_type="application/x-ndjson")
+
 import shutil
 import os
 import uuid
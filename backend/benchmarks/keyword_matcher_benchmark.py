@@ -0,0 +1,104 @@
+"""
+Rule-based triage cost: the old per-keyword substring loops in
+classify_notice/analyze_severity vs the single-scan KeywordMatcher.
+
+Usage (from backend/):
+    python benchmarks/keyword_matcher_benchmark.py [--repeat 5]
+
+Texts of 1 KB to 1 MB are built from a real notice paragraph. The rule set is
+the shipped notice_rules.json, then grown with synthetic keywords to a few
+thousand entries. Times are the best of --repeat runs of classify + severity.
+"""
+import argparse
+import copy
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.keyword_matcher import KeywordMatcher, notice_rules
+
+PARAGRAPH = (
+    "OFFICE OF THE ASSISTANT COMMISSIONER OF INCOME TAX. Notice under section 143(2) "
+    "of the Income Tax Act, 1961. Your income tax return for assessment year 2023-24 "
+    "has been selected for scrutiny. You are required to submit the documents listed "
+    "below and appear before the undersigned within 15 days. Failure to comply may "
+    "attract penalty and legal action as per law. "
+)
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+KEYWORD_COUNTS = [0, 1_000, 5_000]
+
+
+def legacy_triage(rules: dict, text: str):
+    """classify_notice + analyze_severity as they were before the shared matcher"""
+    text_lower = text.lower()
+    category_scores = {}
+    for category, data in rules.items():
+        if category == "severity_keywords":
+            continue
+        score = sum(1 for keyword in data.get("keywords", []) if keyword in text_lower)
+        if score > 0:
+            category_scores[category] = score
+    notice_type = "General Government Notice"
+    if category_scores:
+        best = max(category_scores, key=category_scores.get)
+        types = rules[best].get("types", [])
+        notice_type = next(
+            (t for t in types if any(w in text_lower for w in t.lower().split())),
+            types[0] if types else "Government Notice"
+        )
+    text_lower = text.lower()
+    severity = "🟢 Informational"
+    if any(k in text_lower for k in rules["severity_keywords"]["urgent"]):
+        severity = "🔴 Urgent"
+    elif any(k in text_lower for k in rules["severity_keywords"]["action_required"]):
+        severity = "🟡 Action Required"
+    return notice_type, severity
+
+
+def grow_rules(extra_keywords: int) -> dict:
+    """Copy of notice_rules with synthetic keywords spread over the categories"""
+    rules = copy.deepcopy(notice_rules)
+    categories = [c for c in rules if c != "severity_keywords"]
+    rng = random.Random(42)
+    for i in range(extra_keywords):
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        rules[categories[i % len(categories)]]["keywords"].append(" ".join(words))
+    return rules
+
+
+def best_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'keywords':>9} {'text':>9} {'legacy ms':>10} {'matcher ms':>11} {'speedup':>8} {'compile ms':>11}")
+    for extra in KEYWORD_COUNTS:
+        rules = grow_rules(extra)
+        start = time.perf_counter()
+        matcher = KeywordMatcher(rules)
+        compile_ms = (time.perf_counter() - start) * 1000
+        for size in SIZES:
+            text = (PARAGRAPH * (size // len(PARAGRAPH) + 1))[:size]
+            legacy = best_ms(lambda: legacy_triage(rules, text), args.repeat)
+            # One scan serves both classify_notice and analyze_severity
+            new = best_ms(lambda: matcher.scan(text), args.repeat)
+            print(f"{matcher.keyword_count:9} {size // 1000:>7}KB {legacy:10.2f} {new:11.2f} "
+                  f"{legacy / new:7.1f}x {compile_ms:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Offline load test of the analysis pipeline and /translate against the mock
+LLM provider (LLM_PROVIDER=mock) - no network or API keys needed.
+
+Usage (from backend/):
+    python benchmarks/llm_load_benchmark.py [--requests 200] [--concurrency 20] [--long]
+
+Mock behaviour is configured with the usual environment variables, e.g.
+    MOCK_LLM_LATENCY_MS=800 MOCK_LLM_LATENCY_SIGMA=0.7 MOCK_LLM_ERROR_RATE=0.05 \\
+    MOCK_LLM_RATE_LIMIT_RATE=0.02 python benchmarks/llm_load_benchmark.py
+
+Every request uses a distinct notice text so the caches do not hide LLM
+latency; caches live in a throwaway directory. --long uses gazette-sized
+texts that take the map-reduce path.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ["LLM_PROVIDER"] = "mock"
+_scratch = tempfile.mkdtemp(prefix="llm-bench-")
+os.environ["CACHE_DB_PATH"] = os.path.join(_scratch, "cache.sqlite3")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.notice_pipeline import analyze_notice_text
+from services.simplifier import is_fallback_explanation
+from services.mock_llm import mock_llm
+from api.v1.routes.translate import translate_text, TranslationRequest
+
+NOTICE = (
+    "OFFICE OF THE ASSISTANT COMMISSIONER OF INCOME TAX\n"
+    "Notice No. {n} under section 143(2) of the Income Tax Act, 1961.\n"
+    "Your income tax return for assessment year 2023-24 has been selected for scrutiny. "
+    "You are required to submit the documents listed below within 15 days. "
+    "Failure to comply may attract penalty and legal action.\n"
+)
+
+
+def notice_text(n: int, long: bool) -> str:
+    text = NOTICE.format(n=n)
+    if long:
+        text += "".join(f"\n{i}. SCHEDULE ITEM {i}\n" + NOTICE.format(n=f"{n}-{i}") * 12 for i in range(1, 30))
+    return text
+
+
+async def run(label: str, make_call, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one(n):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            ok = await make_call(n)
+            latencies.append(time.perf_counter() - started)
+            failures += 0 if ok else 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(n) for n in range(requests)])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    print(
+        f"{label:<10} {requests:>6} {elapsed:>8.2f}s {requests / elapsed:>8.1f}/s "
+        f"{statistics.median(latencies) * 1000:>8.0f} {pick(0.95):>8.0f} {pick(0.99):>8.0f} {failures:>9}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--long", action="store_true", help="gazette-sized notices (map-reduce path)")
+    args = parser.parse_args()
+
+    async def analyze(n):
+        result = await analyze_notice_text(notice_text(n, args.long))
+        return not is_fallback_explanation(result["explanation"])
+
+    async def translate(n):
+        try:
+            await translate_text(TranslationRequest(text=f"Submit documents by day {n}", target_language="Hindi"))
+            return True
+        except Exception:
+            return False
+
+    print(f"{'endpoint':<10} {'reqs':>6} {'wall':>9} {'rate':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'fallbacks':>9}")
+    await run("analyze", analyze, args.requests, args.concurrency)
+    await run("translate", translate, args.requests, args.concurrency)
+    print(f"mock provider: {mock_llm.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
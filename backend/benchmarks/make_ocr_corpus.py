@@ -0,0 +1,166 @@
+"""
+Synthetic phone photos of notices for benchmarks/ocr_benchmark.py.
+
+Usage (from backend/):
+    python benchmarks/make_ocr_corpus.py out_dir/ [--count 12] [--seed 7]
+
+Each notice is rendered as an A4 page, then photographed: placed on a desk
+at a perspective, tilted, unevenly lit, slightly out of focus, with sensor
+noise and JPEG compression, at common phone (12 MP, 8 MP) and WhatsApp-
+forwarded (1600 px) sizes. The rendered text is saved next to each photo as
+<name>.txt so the benchmark can report word recall. Real photos are better;
+this is for when none are at hand.
+"""
+import argparse
+import os
+import random
+import textwrap
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+FONT_DIR = "/usr/share/fonts/truetype/dejavu"
+FONTS = [("DejaVuSerif.ttf", "DejaVuSerif-Bold.ttf"), ("DejaVuSans.ttf", "DejaVuSans-Bold.ttf")]
+
+NOTICES = [
+    ("OFFICE OF THE ASSISTANT COMMISSIONER OF INCOME TAX", "Notice under section 143(2) of the Income Tax Act, 1961", [
+        "Notice No. ITBA/AST/S/143(2)/2024-25/1001234567 dated 12/03/2024",
+        "To Shri Ramesh Kumar, PAN ABCPK1234D, 14 Lajpat Nagar, New Delhi 110024.",
+        "The return of income filed by you for Assessment Year 2023-24 has been selected for scrutiny. "
+        "You are required to furnish the documents listed below on or before 28.03.2024 through the "
+        "e-filing portal. Failure to comply may attract a penalty of Rs. 10,000 under section 272A(1)(d).",
+        "1. Bank statements for all accounts held during the previous year.",
+        "2. Details of investments claimed as deductions under Chapter VI-A.",
+        "3. Evidence of the source of cash deposits exceeding Rs. 2,00,000.",
+    ]),
+    ("BSES RAJDHANI POWER LIMITED", "Disconnection Notice", [
+        "CA No. 151234567 Bill Month: February 2024",
+        "Dear Consumer, an amount of Rs. 8,420 is outstanding against the above connection. "
+        "Please pay the amount within 15 days from the date of this notice, failing which the "
+        "supply will be disconnected without further notice under section 56 of the Electricity Act, 2003.",
+        "Reconnection charges and late payment surcharge will be payable in addition to the dues. "
+        "Payments can be made online, at any customer care centre or through authorised collection agents.",
+    ]),
+    ("MUNICIPAL CORPORATION OF GREATER MUMBAI", "Property Tax Demand Notice", [
+        "Property Account No. KW0203450012 Ward K/West",
+        "Property tax of Rs. 24,650 for the year 2024-25 is due. The amount must be paid by 30 June 2024. "
+        "A penalty of 2 per cent per month will be levied on the unpaid amount after the due date.",
+        "Objections to the rateable value, if any, must be filed in writing with the Assessor and "
+        "Collector within 21 days of receipt of this notice along with supporting documents.",
+    ]),
+    ("IN THE COURT OF THE CIVIL JUDGE, SENIOR DIVISION, PUNE", "Summons to Defendant", [
+        "Civil Suit No. 482 of 2024",
+        "Whereas the plaintiff has instituted a suit against you for recovery of Rs. 3,75,000, you are "
+        "hereby summoned to appear in this court in person or by a pleader on 18 April 2024 at 11 AM "
+        "to answer the claim. You must file your written statement on or before the said date.",
+        "Take notice that in default of your appearance the suit will be heard and determined in your absence.",
+    ]),
+    ("EMPLOYEES PROVIDENT FUND ORGANISATION", "Notice for Non-Payment of Contributions", [
+        "Establishment Code MHBAN0012345000",
+        "It is observed that contributions for the months of October 2023 to January 2024 have not been "
+        "remitted. You are directed to remit the dues of Rs. 1,12,340 along with interest under section 7Q "
+        "within 10 days, and to appear before the undersigned on 05.04.2024 with all records.",
+        "Failure to comply will result in proceedings under section 14B and recovery action under section 8B.",
+    ]),
+    ("DELHI TRAFFIC POLICE", "e-Challan Notice", [
+        "Challan No. DL116789012345678 Vehicle No. DL3CAB1234",
+        "The above vehicle was found jumping a red light at ITO crossing on 02.03.2024 at 18:42. "
+        "A fine of Rs. 5,000 is payable under section 184 of the Motor Vehicles Act. Pay online within "
+        "60 days, after which the challan will be sent to the virtual court for disposal.",
+    ]),
+]
+
+# (long side px, JPEG quality): 12 MP and 8 MP camera output, WhatsApp-forwarded copies
+CAPTURES = [(4032, 90), (3264, 88), (1600, 72)]
+
+
+def render_page(title: str, subject: str, paragraphs: list, rng: random.Random):
+    """A4 page at 150 dpi; returns (RGB array, text as printed)"""
+    regular, bold = rng.choice(FONTS)
+    size = rng.randint(22, 27)
+    body_font = ImageFont.truetype(os.path.join(FONT_DIR, regular), size)
+    head_font = ImageFont.truetype(os.path.join(FONT_DIR, bold), size + 6)
+    paper = tuple(rng.randint(235, 252) - shade for shade in (0, 2, rng.randint(6, 20)))
+    page = Image.new("RGB", (1240, 1754), paper)
+    draw = ImageDraw.Draw(page)
+    ink = (rng.randint(10, 50),) * 3
+
+    lines = [(title, head_font), (subject, head_font), ("", body_font)]
+    width = int(1040 / (size * 0.55))
+    for paragraph in paragraphs:
+        lines += [(line, body_font) for line in textwrap.wrap(paragraph, width)]
+        lines.append(("", body_font))
+
+    y = 110
+    for line, font in lines:
+        if font is head_font:
+            x = (1240 - draw.textlength(line, font=font)) / 2
+        else:
+            x = 100
+        draw.text((x, y), line, font=font, fill=ink)
+        y += int(font.size * 1.5)
+    return np.array(page), "\n".join(line for line, _ in lines if line)
+
+
+def photograph(page: np.ndarray, long_side: int, rng: random.Random) -> np.ndarray:
+    """The page as a phone camera sees it on a desk"""
+    height, width = long_side, long_side * 3 // 4
+    desk = np.array([rng.randint(60, 140), rng.randint(50, 120), rng.randint(40, 100)], dtype=np.float32)
+    frame = np.empty((height, width, 3), dtype=np.float32)
+    frame[:] = desk
+    frame += np.random.default_rng(rng.randint(0, 2 ** 32)).normal(0, 12, (height, width, 1))
+
+    # Page fills 70-90% of the frame, corners jittered for perspective, plus a tilt
+    fill = rng.uniform(0.7, 0.9)
+    page_h = height * fill
+    page_w = page_h * page.shape[1] / page.shape[0]
+    cx, cy = width / 2 + rng.uniform(-0.04, 0.04) * width, height / 2 + rng.uniform(-0.03, 0.03) * height
+    corners = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype=np.float32) * [page_w / 2, page_h / 2]
+    corners += np.array([[rng.uniform(-0.05, 0.05) * page_w, rng.uniform(-0.03, 0.03) * page_h] for _ in range(4)])
+    angle = np.radians(rng.uniform(-7, 7))
+    rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]], dtype=np.float32)
+    corners = corners @ rotation.T + [cx, cy]
+    source = np.array([[0, 0], [page.shape[1], 0], [page.shape[1], page.shape[0]], [0, page.shape[0]]],
+                      dtype=np.float32)
+    matrix = cv2.getPerspectiveTransform(source, corners.astype(np.float32))
+    warped = cv2.warpPerspective(page.astype(np.float32), matrix, (width, height), flags=cv2.INTER_CUBIC)
+    mask = cv2.warpPerspective(np.ones(page.shape[:2], np.float32), matrix, (width, height))[..., None]
+    frame = frame * (1 - mask) + warped * mask
+
+    # Uneven light: a gradient from one side and a vignette
+    ys, xs = np.mgrid[0:height, 0:width].astype(np.float32)
+    direction = rng.uniform(0, 2 * np.pi)
+    gradient = ((xs / width - 0.5) * np.cos(direction) + (ys / height - 0.5) * np.sin(direction))
+    light = 1 - rng.uniform(0.15, 0.4) * (gradient + 0.5)
+    light *= 1 - 0.25 * (((xs / width - 0.5) ** 2 + (ys / height - 0.5) ** 2) / 0.5)
+    frame *= light[..., None]
+
+    frame = cv2.GaussianBlur(frame, (0, 0), rng.uniform(0.6, 1.8) * long_side / 3000)
+    frame += np.random.default_rng(rng.randint(0, 2 ** 32)).normal(0, rng.uniform(3, 8), frame.shape)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir")
+    parser.add_argument("--count", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    os.makedirs(args.out_dir, exist_ok=True)
+    for i in range(args.count):
+        title, subject, paragraphs = NOTICES[i % len(NOTICES)]
+        long_side, quality = CAPTURES[i % len(CAPTURES)]
+        page, text = render_page(title, subject, paragraphs, rng)
+        photo = photograph(page, long_side, rng)
+        name = f"notice_{i + 1:02d}_{long_side}px"
+        Image.fromarray(photo).save(os.path.join(args.out_dir, f"{name}.jpg"), quality=quality)
+        with open(os.path.join(args.out_dir, f"{name}.txt"), "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"{name}.jpg")
+
+
+if __name__ == "__main__":
+    main()
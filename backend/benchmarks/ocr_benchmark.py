@@ -0,0 +1,139 @@
+"""
+Per-image OCR latency: the old three-pass Tesseract strategy vs the adaptive
+single pass in services.ocr_service.
+
+Usage (from backend/):
+    python benchmarks/ocr_benchmark.py path/to/phone_notices/ [--repeat 3]
+
+The corpus directory should contain JPG/PNG photos of notices. For every image
+it prints the latency and number of tesseract processes spawned by each
+strategy, followed by median/p95 totals. An image with its text next to it
+(<name>.txt, as written by make_ocr_corpus.py) also gets word recall: the
+share of its words each strategy read. See README.md for recorded results.
+"""
+import argparse
+import io
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytesseract
+from PIL import Image
+from services.ocr_service import _extract_from_image
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+_WORD = re.compile(r"[a-z0-9]+")
+
+_tesseract_runs = 0
+_run_and_get_output = pytesseract.pytesseract.run_and_get_output
+
+
+def _counting_run_and_get_output(*args, **kwargs):
+    global _tesseract_runs
+    _tesseract_runs += 1
+    return _run_and_get_output(*args, **kwargs)
+
+
+pytesseract.pytesseract.run_and_get_output = _counting_run_and_get_output
+
+
+def legacy_extract_from_image(file_bytes: bytes) -> str:
+    """The pre-adaptive strategy: up to three full-image Tesseract passes"""
+    image = Image.open(io.BytesIO(file_bytes))
+    if image.mode not in ('L', 'RGB'):
+        image = image.convert('RGB')
+    text = pytesseract.image_to_string(image, lang='eng')
+    if not text.strip():
+        text = pytesseract.image_to_string(image, lang='eng', config='--psm 6')
+    if not text.strip():
+        binary = image.convert('L').point(lambda p: 255 if p > 128 else 0)
+        text = pytesseract.image_to_string(binary, lang='eng')
+    return text.strip()
+
+
+def measure(extract, file_bytes: bytes, repeat: int):
+    """Best-of-repeat latency in ms, tesseract runs per call, characters extracted"""
+    global _tesseract_runs
+    timings = []
+    for _ in range(repeat):
+        _tesseract_runs = 0
+        start = time.perf_counter()
+        text = extract(file_bytes)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), _tesseract_runs, text
+
+
+def word_recall(expected: str, text: str):
+    """Share of the expected words (with repeats) found in text"""
+    found = {}
+    for word in _WORD.findall(text.lower()):
+        found[word] = found.get(word, 0) + 1
+    words = _WORD.findall(expected.lower())
+    hits = 0
+    for word in words:
+        if found.get(word):
+            found[word] -= 1
+            hits += 1
+    return hits / len(words) if words else None
+
+
+def _recall_column(recall) -> str:
+    return f"{recall:6.1%}" if recall is not None else f"{'-':>6}"
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="directory of notice photos")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per image (best is reported)")
+    args = parser.parse_args()
+
+    paths = sorted(
+        os.path.join(args.corpus, name) for name in os.listdir(args.corpus)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    if not paths:
+        sys.exit(f"No images found in {args.corpus}")
+
+    print(f"{'image':28} {'before ms':>10} {'runs':>5} {'chars':>6} {'recall':>6} "
+          f"{'after ms':>10} {'runs':>5} {'chars':>6} {'recall':>6}")
+    before, after, recalls = [], [], []
+    for path in paths:
+        with open(path, 'rb') as f:
+            file_bytes = f.read()
+        expected_path = os.path.splitext(path)[0] + '.txt'
+        expected = None
+        if os.path.exists(expected_path):
+            with open(expected_path, encoding='utf-8') as f:
+                expected = f.read()
+        old_ms, old_runs, old_text = measure(legacy_extract_from_image, file_bytes, args.repeat)
+        new_ms, new_runs, new_text = measure(_extract_from_image, file_bytes, args.repeat)
+        old_recall = word_recall(expected, old_text) if expected else None
+        new_recall = word_recall(expected, new_text) if expected else None
+        before.append(old_ms)
+        after.append(new_ms)
+        if old_recall is not None:
+            recalls.append((old_recall, new_recall))
+        print(f"{os.path.basename(path)[:28]:28} {old_ms:10.0f} {old_runs:5} {len(old_text):6} "
+              f"{_recall_column(old_recall)} {new_ms:10.0f} {new_runs:5} {len(new_text):6} {_recall_column(new_recall)}")
+
+    print()
+    print(f"{len(paths)} images")
+    print(f"median  before {statistics.median(before):8.0f} ms   after {statistics.median(after):8.0f} ms")
+    print(f"p95     before {percentile(before, 95):8.0f} ms   after {percentile(after, 95):8.0f} ms")
+    print(f"total   before {sum(before):8.0f} ms   after {sum(after):8.0f} ms")
+    if recalls:
+        print(f"recall  before {statistics.mean(r[0] for r in recalls):8.1%}      "
+              f"after {statistics.mean(r[1] for r in recalls):8.1%}   (mean, {len(recalls)} images)")
+
+
+if __name__ == "__main__":
+    main()
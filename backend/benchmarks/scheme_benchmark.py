@@ -0,0 +1,164 @@
+"""
+Scheme catalog lookups as the catalog grows: eligibility matching with the old
+per-scheme Python loop vs the columnar SchemeIndex, BM25 scheme suggestions
+for notices (SchemeRanker), typo-tolerant search (SchemeSearchIndex) and
+publishing a refreshed catalog snapshot (CatalogSnapshot.successor).
+
+Usage (from backend/):
+    python benchmarks/scheme_benchmark.py [--repeat 20]
+
+The shipped schemes_cache.json is grown with synthetic central and state
+schemes (random limits, states and categories drawn from the real catalog)
+to 10k and 50k entries. Times are the best of --repeat runs per profile or
+notice; "top-3 ms" includes tokenizing the notice, which is also shown on
+its own ("terms ms").
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.scheme_catalog import CatalogSnapshot
+from services.scheme_engine import SCHEMES_CACHE_FILE
+from services.scheme_index import SchemeIndex
+from services.scheme_ranker import SchemeRanker, terms
+from services.scheme_search import SchemeSearchIndex
+
+SIZES = [0, 10_000, 50_000]
+PROFILES = [
+    {"age": 30, "income": 150000, "occupation": "Farmer", "state": "Maharashtra", "category": "General"},
+    {"age": 19, "income": 80000, "occupation": "Student", "state": "Kerala", "category": "Select Category"},
+    {"age": 45, "income": 600000, "occupation": "Salaried", "state": "Select Region", "category": "Women"},
+]
+
+NOTICES = {
+    "crop": ("Agriculture Notice", "Claims for crop loss under the insurance scheme for the kharif season must be "
+                                   "filed by farmers with land records and bank details at the agriculture office."),
+    "tax": ("Income Tax Notice", "OFFICE OF THE ASSISTANT COMMISSIONER OF INCOME TAX. Notice under section 143(2). "
+                                 "Your return for assessment year 2023-24 has been selected for scrutiny. " * 30),
+}
+
+QUERIES = ["ujwala", "kisan samman", "sc", "scholarship for girl", "pm yojna"]
+
+
+def load_catalog(extra: int) -> list:
+    """The shipped catalog plus `extra` synthetic schemes"""
+    with open(SCHEMES_CACHE_FILE, "r", encoding="utf-8") as f:
+        schemes = json.load(f)
+    rng = random.Random(42)
+    states = sorted({s["state"] for s in schemes})
+    categories = sorted({s["category"] for s in schemes})
+    words = " ".join(s["description"] + " " + s["eligibility"] for s in schemes).split()
+    shipped = list(schemes)
+    for i in range(extra):
+        template = rng.choice(shipped)
+        age_min = rng.choice([0, 0, 14, 18, 21, 40, 60])
+        schemes.append({
+            **template,
+            "name": f"{template['name']} {i}",
+            "description": " ".join(rng.choices(words, k=12)),
+            "eligibility": " ".join(rng.choices(words, k=10)),
+            "max_income": rng.choice([100000, 250000, 500000, 800000, 1800000, 10000000]),
+            "age_min": age_min,
+            "age_max": rng.choice([age_min + 10, 35, 60, 100]),
+            "state": rng.choice(states) if rng.random() < 0.7 else "All",
+            "category": rng.choice(categories),
+        })
+    return schemes
+
+
+def legacy_match(schemes: list, user_data: dict) -> list:
+    """SchemeEngine.match_schemes before the index (income and age only)"""
+    eligible = []
+    age = user_data.get("age", 0)
+    income = user_data.get("income", 0)
+    for scheme in schemes:
+        if income > scheme.get("max_income", float('inf')):
+            continue
+        if age < scheme.get("age_min", 0) or age > scheme.get("age_max", 150):
+            continue
+        eligible.append(scheme)
+    return eligible
+
+
+def best_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'schemes':>8} {'build ms':>9} {'profile':>9} {'legacy ms':>10} {'index ms':>9} {'matches':>8}")
+    for extra in SIZES:
+        schemes = load_catalog(extra)
+        start = time.perf_counter()
+        index = SchemeIndex(schemes)
+        build_ms = (time.perf_counter() - start) * 1000
+        for profile in PROFILES:
+            legacy = best_ms(lambda: legacy_match(schemes, profile), args.repeat)
+            indexed = best_ms(lambda: index.match(profile), args.repeat)
+            print(f"{len(schemes):8} {build_ms:9.1f} {profile['occupation']:>9} {legacy:10.3f} "
+                  f"{indexed:9.3f} {len(index.match(profile)):8}")
+
+    print()
+    print(f"{'schemes':>8} {'build ms':>9} {'notice':>7} {'words':>6} {'terms ms':>9} {'top-3 ms':>9}")
+    for extra in SIZES:
+        schemes = load_catalog(extra)
+        start = time.perf_counter()
+        ranker = SchemeRanker(schemes)
+        build_ms = (time.perf_counter() - start) * 1000
+        for label, (notice_type, text) in NOTICES.items():
+            terms_ms = best_ms(lambda: terms(text), args.repeat)
+            top_ms = best_ms(lambda: ranker.top(text, notice_type), args.repeat)
+            print(f"{len(schemes):8} {build_ms:9.1f} {label:>7} {len(text.split()):6} "
+                  f"{terms_ms:9.3f} {top_ms:9.3f}")
+
+    print()
+    print(f"{'schemes':>8} {'build ms':>9} {'update ms':>10} {'query':>22} {'ms':>7} {'hits':>7}")
+    for extra in SIZES:
+        schemes = load_catalog(extra)
+        index = SchemeSearchIndex()
+        start = time.perf_counter()
+        index.update(schemes)
+        build_ms = (time.perf_counter() - start) * 1000
+        # A refresh that changes 1% of the catalog
+        changed = [dict(s, description=s["description"] + " (revised)") if i % 100 == 0 else s
+                   for i, s in enumerate(schemes)]
+        start = time.perf_counter()
+        index.update(changed)
+        update_ms = (time.perf_counter() - start) * 1000
+        for query in QUERIES:
+            index.search(query)  # first query after an update builds that word's postings
+            query_ms = best_ms(lambda: index.search(query), args.repeat)
+            print(f"{len(schemes):8} {build_ms:9.1f} {update_ms:10.1f} {query:>22} {query_ms:7.3f} "
+                  f"{index.search(query)['total']:7}")
+
+    print()
+    print(f"{'schemes':>8} {'first ms':>9} {'copy ms':>8} {'next ms':>8}")
+    for extra in SIZES:
+        schemes = load_catalog(extra)
+        start = time.perf_counter()
+        snapshot, _ = CatalogSnapshot.empty().successor(schemes)
+        first_ms = (time.perf_counter() - start) * 1000
+        copy_ms = best_ms(snapshot.search_index.copy, 3)
+        changed = [dict(s, description=s["description"] + " (revised)") if i % 100 == 0 else s
+                   for i, s in enumerate(schemes)]
+        start = time.perf_counter()
+        snapshot.successor(changed)
+        next_ms = (time.perf_counter() - start) * 1000
+        print(f"{len(schemes):8} {first_ms:9.1f} {copy_ms:8.1f} {next_ms:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
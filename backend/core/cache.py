@@ -0,0 +1,175 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from core.config import CACHE_DB_PATH
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TieredCache:
+    """
+    Two-tier key/value cache: an in-memory LRU in front of a SQLite table.
+    Values must be JSON-serializable. Entries expire after ttl seconds and are
+    tagged with a version string; entries from another version are never
+    returned and are purged when the cache is opened. If max_persistent_entries
+    is set, the SQLite tier drops its oldest entries once it grows past that.
+    """
+
+    def __init__(self, namespace: str, version: str, ttl: int, max_memory_entries: int = 1024,
+                 db_path: str = CACHE_DB_PATH, max_persistent_entries: int = 0):
+        self.namespace = namespace
+        self.version = version
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_persistent_entries = max_persistent_entries
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # entries dropped from the SQLite tier to stay under max_persistent_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._open()
+
+    def _open(self):
+        """Open the SQLite tier; on failure the cache runs memory-only"""
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, version TEXT NOT NULL, "
+                "value TEXT NOT NULL, expires_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expiry ON cache (namespace, expires_at)")
+            self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND (version != ? OR expires_at < ?)",
+                (self.namespace, self.version, time.time())
+            )
+            self._conn.commit()
+        except Exception as e:
+            logger.error(f"Cache '{self.namespace}': SQLite tier unavailable, using memory only: {e}")
+            self._conn = None
+
+    def get(self, key: str):
+        """Return the cached value or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            row = self._get_persistent(key, now)
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = row
+            self._remember(key, value, expires_at)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value):
+        """Store a value in both tiers"""
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (namespace, key, version, value, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.namespace, key, self.version, json.dumps(value, ensure_ascii=False), expires_at)
+                )
+                self._evict_persistent()
+                self._conn.commit()
+            except Exception as e:
+                logger.error(f"Cache '{self.namespace}': failed to persist entry: {e}")
+
+    def clear(self):
+        """Drop every entry in this namespace"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+                self._conn.commit()
+
+    def stats(self):
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            return {
+                "version": self.version,
+                "memory_entries": len(self._memory),
+                "persistent": self._conn is not None,
+                "persistent_entries": self._count_persistent(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _remember(self, key, value, expires_at):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _count_persistent(self) -> int:
+        if self._conn is None:
+            return 0
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+
+    def _evict_persistent(self):
+        """Drop expired rows, then the oldest rows beyond max_persistent_entries"""
+        if not self.max_persistent_entries:
+            return
+        excess = self._count_persistent() - self.max_persistent_entries
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND expires_at < ?",
+            (self.namespace, time.time())
+        )
+        excess = self._count_persistent() - self.max_persistent_entries
+        if excess > 0:
+            # Every entry gets the same ttl, so the earliest expiry is the oldest write
+            self._conn.execute(
+                "DELETE FROM cache WHERE rowid IN ("
+                "SELECT rowid FROM cache WHERE namespace = ? ORDER BY expires_at LIMIT ?)",
+                (self.namespace, excess)
+            )
+            self.evictions += excess
+
+    def _get_persistent(self, key, now):
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ? AND version = ?",
+                (self.namespace, key, self.version)
+            ).fetchone()
+        except Exception as e:
+            logger.error(f"Cache '{self.namespace}': lookup failed: {e}")
+            return None
+        if row is None or row[1] < now:
+            return None
+        return json.loads(row[0]), row[1]
@@ -7,7 +7,7 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 
 # LLM Configuration
-LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq")  # "openai", "gemini", or "groq"
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq")  # "openai", "gemini", "groq", or "mock" (offline, see below)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")  # Add your Groq API key
@@ -15,3 +15,150 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")  # Add your Groq API key
 # API Configuration
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "8000"))
+
+# Worker Pools
+# OCR/PDF parsing is CPU-bound and runs in a process pool. Pending counts include
+# running jobs, so OCR_MAX_PENDING - OCR_POOL_SIZE is the queue depth allowed.
+OCR_POOL_SIZE = int(os.getenv("OCR_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+OCR_MAX_PENDING = int(os.getenv("OCR_MAX_PENDING", "32"))
+
+# LLM Routing
+# Providers tried after LLM_PROVIDER, in this order (only those with an API key)
+LLM_PROVIDER_ORDER = [p.strip() for p in os.getenv("LLM_PROVIDER_ORDER", "groq,gemini,openai").split(",") if p.strip()]
+LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", "45"))  # seconds for the whole call, incl. failover
+# A hedged request goes to the next provider once the current one is slower
+# than its own p95 latency (LLM_HEDGE_DEFAULT_DELAY until enough samples)
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "1"))  # seconds
+LLM_HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "8"))  # seconds
+LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "100"))  # recent calls kept per provider
+# Circuit breaker: after this many consecutive failures a provider is skipped
+# for LLM_BREAKER_COOLDOWN seconds, then one trial request is let through
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+# LLM Rate Limits (per provider/model; 0 = unlimited)
+# Calls wait in a priority queue (urgent notices first, translations last)
+# until both the requests-per-minute and tokens-per-minute buckets allow them
+LLM_RPM_GROQ = int(os.getenv("LLM_RPM_GROQ", "30"))
+LLM_TPM_GROQ = int(os.getenv("LLM_TPM_GROQ", "12000"))
+LLM_RPM_GEMINI = int(os.getenv("LLM_RPM_GEMINI", "15"))
+LLM_TPM_GEMINI = int(os.getenv("LLM_TPM_GEMINI", "1000000"))
+LLM_RPM_OPENAI = int(os.getenv("LLM_RPM_OPENAI", "500"))
+LLM_TPM_OPENAI = int(os.getenv("LLM_TPM_OPENAI", "200000"))
+LLM_RPM_MOCK = int(os.getenv("LLM_RPM_MOCK", "0"))
+LLM_TPM_MOCK = int(os.getenv("LLM_TPM_MOCK", "0"))
+
+# Mock LLM (LLM_PROVIDER=mock) - deterministic offline provider for load tests
+# Latency = time to first token (log-normal around the median) + output tokens / throughput
+MOCK_LLM_SEED = int(os.getenv("MOCK_LLM_SEED", "42"))
+MOCK_LLM_LATENCY_MS = float(os.getenv("MOCK_LLM_LATENCY_MS", "400"))  # median time to first token
+MOCK_LLM_LATENCY_SIGMA = float(os.getenv("MOCK_LLM_LATENCY_SIGMA", "0.5"))  # log-normal spread, 0 = fixed
+MOCK_LLM_TOKENS_PER_SECOND = float(os.getenv("MOCK_LLM_TOKENS_PER_SECOND", "250"))
+MOCK_LLM_ERROR_RATE = float(os.getenv("MOCK_LLM_ERROR_RATE", "0"))  # fraction of calls failing with a 500
+MOCK_LLM_RATE_LIMIT_RATE = float(os.getenv("MOCK_LLM_RATE_LIMIT_RATE", "0"))  # fraction failing with a 429
+
+# Prompt Condensing
+# Deadlines, reference numbers, sections, amounts and authorities are
+# extracted by rules and sent as fields; notices above this many tokens are
+# also cut down to their relevant sentences before prompting
+LLM_CONDENSE_MIN_TOKENS = int(os.getenv("LLM_CONDENSE_MIN_TOKENS", "800"))
+
+# Long Notices (map-reduce summarization)
+# Notices estimated above LLM_INPUT_TOKEN_BUDGET prompt tokens are split into
+# section-aware chunks, each condensed by its own LLM call (map), and the
+# condensed sections are explained in one final call (reduce)
+LLM_INPUT_TOKEN_BUDGET = int(os.getenv("LLM_INPUT_TOKEN_BUDGET", "6000"))
+LLM_CHUNK_TOKENS = int(os.getenv("LLM_CHUNK_TOKENS", "2500"))
+LLM_MAP_MAX_TOKENS = int(os.getenv("LLM_MAP_MAX_TOKENS", "300"))  # output per section summary
+LLM_MAP_CONCURRENCY = int(os.getenv("LLM_MAP_CONCURRENCY", "4"))
+LLM_MAX_CHUNKS = int(os.getenv("LLM_MAX_CHUNKS", "16"))  # later sections are dropped
+
+# Translation
+# Segments of a batch are packed into as few calls as fit TRANSLATE_PACK_TOKENS
+# of input; translations (Devanagari especially) run ~2x the input tokens, so
+# the pack size keeps output under TRANSLATE_MAX_TOKENS. Longer segments are split.
+TRANSLATE_MAX_TOKENS = int(os.getenv("TRANSLATE_MAX_TOKENS", "1000"))  # output per call
+TRANSLATE_PACK_TOKENS = int(os.getenv("TRANSLATE_PACK_TOKENS", "400"))
+TRANSLATE_CONCURRENCY = int(os.getenv("TRANSLATE_CONCURRENCY", "4"))  # calls at once per request
+TRANSLATE_MAX_SEGMENTS = int(os.getenv("TRANSLATE_MAX_SEGMENTS", "100"))
+TRANSLATE_MAX_LANGUAGES = int(os.getenv("TRANSLATE_MAX_LANGUAGES", "5"))
+
+# Pre-translation of Saved Documents
+# Explanations of saved documents are translated into these languages in the
+# background (empty = off). The worker only runs while no notice job, OCR task
+# or rate-limited LLM call is waiting and the translation provider has at least
+# PRETRANSLATE_MIN_HEADROOM of its per-minute limits unused.
+PRETRANSLATE_LANGUAGES = [l.strip().lower() for l in os.getenv("PRETRANSLATE_LANGUAGES", "").split(",") if l.strip()]
+PRETRANSLATE_MAX_QUEUED = int(os.getenv("PRETRANSLATE_MAX_QUEUED", "1000"))
+PRETRANSLATE_MIN_HEADROOM = float(os.getenv("PRETRANSLATE_MIN_HEADROOM", "0.5"))
+PRETRANSLATE_IDLE_POLL = float(os.getenv("PRETRANSLATE_IDLE_POLL", "5"))  # seconds between load checks
+
+# Request Coalescing
+# Identical concurrent uploads / LLM prompts share one in-flight computation;
+# requests joining one give up after this many seconds
+SINGLEFLIGHT_TIMEOUT = float(os.getenv("SINGLEFLIGHT_TIMEOUT", "120"))
+
+# Caching
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", os.path.join(DATA_DIR, "cache.sqlite3"))
+ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "1024"))
+# Near-duplicate notices (same template, different name/amount/date): the
+# explanation of a previously analyzed notice is reused with the changed
+# values substituted, instead of a new LLM call
+NEAR_DUP_ENABLED = os.getenv("NEAR_DUP_ENABLED", "true").lower() == "true"
+NEAR_DUP_MAX_DISTANCE = int(os.getenv("NEAR_DUP_MAX_DISTANCE", "6"))  # SimHash bits (at most 7: 8-band index)
+NEAR_DUP_MIN_SIMILARITY = float(os.getenv("NEAR_DUP_MIN_SIMILARITY", "0.85"))  # share of matching words
+NEAR_DUP_MAX_SPAN_TOKENS = int(os.getenv("NEAR_DUP_MAX_SPAN_TOKENS", "6"))  # longer edits are not template fills
+NEAR_DUP_MAX_ENTRIES = int(os.getenv("NEAR_DUP_MAX_ENTRIES", "5000"))
+# Raw LLM responses, keyed by provider/model/prompt version/input
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))  # seconds
+LLM_CACHE_MAX_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MAX_MEMORY_ENTRIES", "2048"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))  # on disk
+
+# Scheme Catalog
+# GET /schemes responses are pre-serialized per catalog version and may be
+# cached by browsers/CDNs for this long, then revalidated with If-None-Match
+SCHEMES_CACHE_MAX_AGE = int(os.getenv("SCHEMES_CACHE_MAX_AGE", "300"))  # seconds
+# data.gov.in resources are fetched concurrently in the background (at startup
+# when a key is set, then every SCHEMES_REFRESH_INTERVAL); the current catalog
+# keeps being served until a refreshed one is ready
+DATA_GOV_IN_API_BASE = os.getenv("DATA_GOV_IN_API_BASE", "https://api.data.gov.in/resource")
+DATA_GOV_IN_API_KEY = os.getenv("DATA_GOV_IN_API_KEY", "")
+SCHEMES_REFRESH_INTERVAL = int(os.getenv("SCHEMES_REFRESH_INTERVAL", str(6 * 3600)))  # seconds, 0 = startup only
+SCHEMES_FETCH_TIMEOUT = float(os.getenv("SCHEMES_FETCH_TIMEOUT", "10"))  # seconds per request
+SCHEMES_FETCH_RETRIES = int(os.getenv("SCHEMES_FETCH_RETRIES", "3"))
+SCHEMES_FETCH_BACKOFF = float(os.getenv("SCHEMES_FETCH_BACKOFF", "1"))  # seconds, doubled per retry (with jitter)
+SCHEMES_FETCH_CONCURRENCY = int(os.getenv("SCHEMES_FETCH_CONCURRENCY", "5"))
+
+# Notice Jobs (async upload mode)
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", os.path.join(DATA_DIR, "jobs.sqlite3"))
+JOB_SPOOL_DIR = os.getenv("JOB_SPOOL_DIR", os.path.join(BASE_DIR, "job_spool"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", "256"))
+JOB_RETENTION = int(os.getenv("JOB_RETENTION", str(24 * 3600)))  # seconds finished jobs are kept
+
+# Batch Uploads
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))  # files processed at once per request
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "50"))
+
+# OCR
+OCR_TARGET_DPI = int(os.getenv("OCR_TARGET_DPI", "300"))
+OCR_MIN_CONFIDENCE = float(os.getenv("OCR_MIN_CONFIDENCE", "60"))  # blocks below this are re-read
+OCR_MAX_RETRY_REGIONS = int(os.getenv("OCR_MAX_RETRY_REGIONS", "8"))
+
+# PDF Extraction
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))  # pages beyond this are ignored
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "4"))  # pages per OCR pool task
+PDF_MIN_PAGE_CHARS = int(os.getenv("PDF_MIN_PAGE_CHARS", "20"))  # below this a page is treated as scanned
+# Stop once this many characters are extracted - enough for classification and
+# severity on very long gazettes. 0 disables early exit.
+PDF_EARLY_EXIT_CHARS = int(os.getenv("PDF_EARLY_EXIT_CHARS", "0"))
+
+# LLM Clients (one long-lived async client per provider)
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "10"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))  # seconds
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))  # seconds
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))  # seconds
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
@@ -0,0 +1,56 @@
+import asyncio
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SingleFlightTimeout(Exception):
+    """Raised to a follower that gave up waiting on another request's computation"""
+    pass
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller (the leader)
+    starts the computation, later callers (followers) wait on the same task and
+    get the same result or exception. The key is forgotten once the task
+    finishes, so later calls go through the caches as usual.
+
+    The task is shielded from caller cancellation - if the leader's client
+    disconnects, followers still get their result.
+    """
+
+    def __init__(self, name: str, follower_timeout: float = None):
+        self.name = name
+        self.follower_timeout = follower_timeout
+        self.coalesced = 0
+        self._inflight = {}
+
+    async def do(self, key: str, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs), sharing one in-flight call per key"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+            return await asyncio.shield(task)
+
+        self.coalesced += 1
+        logger.info(f"{self.name}: waiting on in-flight computation {key[:12]}")
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), self.follower_timeout)
+        except asyncio.TimeoutError:
+            raise SingleFlightTimeout(
+                f"{self.name}: gave up after {self.follower_timeout}s waiting on {key[:12]}"
+            )
+
+    def stats(self):
+        return {"in_flight": len(self._inflight), "coalesced": self.coalesced}
+
+    def _forget(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Retrieve the exception so a task whose callers all went away does not
+        # log "exception was never retrieved"
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,99 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from core.config import OCR_POOL_SIZE, OCR_MAX_PENDING
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class WorkerPoolBusy(Exception):
+    """Raised when the OCR queue is full and new work should be rejected"""
+    pass
+
+
+class WorkerPools:
+    """
+    Bounded executor that keeps CPU-bound work off the event loop.
+    OCR/PDF extraction runs in a process pool; LLM calls are natively async
+    (see services/llm_clients.py) and need no pool.
+    """
+
+    def __init__(self):
+        self.ocr_executor = None
+        self.ocr_pending = 0
+        self.ocr_restarts = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Create the executors (called from the app lifespan)"""
+        with self._lock:
+            if self.ocr_executor is None:
+                self.ocr_executor = _ocr_executor()
+        logger.info(f"Worker pools started (ocr={OCR_POOL_SIZE})")
+
+    def shutdown(self):
+        """Stop the executors, cancelling anything still queued"""
+        if self.ocr_executor:
+            self.ocr_executor.shutdown(wait=False, cancel_futures=True)
+            self.ocr_executor = None
+        logger.info("Worker pools stopped")
+
+    async def run_ocr(self, fn, *args, **kwargs):
+        """
+        Run a CPU-bound function in the OCR process pool.
+        fn and its arguments must be picklable (module-level function, bytes, str).
+        """
+        if self.ocr_pending >= OCR_MAX_PENDING:
+            raise WorkerPoolBusy(f"OCR queue is full ({self.ocr_pending} pending)")
+        if self.ocr_executor is None:
+            self.start()
+
+        self.ocr_pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            for attempt in range(2):
+                executor = self.ocr_executor
+                try:
+                    return await loop.run_in_executor(executor, partial(fn, *args, **kwargs))
+                except BrokenProcessPool:
+                    # A worker died (killed, out of memory): every later call
+                    # would fail too, so replace the pool and retry this one once
+                    self._replace_broken(executor)
+                    if attempt:
+                        raise
+        finally:
+            self.ocr_pending -= 1
+
+    def _replace_broken(self, executor):
+        """Swap in a fresh OCR pool, once per broken pool however many callers saw it break"""
+        with self._lock:
+            if self.ocr_executor is not executor:
+                return
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.ocr_executor = _ocr_executor()
+            self.ocr_restarts += 1
+        logger.warning("OCR worker process died; process pool restarted")
+
+    def stats(self):
+        """Pool sizes and queue depths for monitoring"""
+        return {
+            "ocr": {
+                "pool_size": OCR_POOL_SIZE,
+                "pending": self.ocr_pending,
+                "queue_depth": max(0, self.ocr_pending - OCR_POOL_SIZE),
+                "max_pending": OCR_MAX_PENDING,
+                "restarts": self.ocr_restarts
+            }
+        }
+
+
+def _ocr_executor() -> ProcessPoolExecutor:
+    # spawn keeps child processes clean of the server's threads and sockets
+    return ProcessPoolExecutor(max_workers=OCR_POOL_SIZE, mp_context=multiprocessing.get_context("spawn"))
+
+
+pools = WorkerPools()
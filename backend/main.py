@@ -8,6 +8,11 @@ import os
 
 from contextlib import asynccontextmanager
 from core.database import db
+from core.workers import pools
+from services.llm_clients import llm_clients
+from services.job_queue import job_queue
+from services.pretranslation import pretranslator
+from services.scheme_engine import scheme_refresher
 
 load_dotenv()
 
@@ -15,8 +20,18 @@ load_dotenv()
 async def lifespan(app: FastAPI):
     # Startup
     db.connect()
+    pools.start()
+    llm_clients.start()
+    await job_queue.start()
+    pretranslator.start()
+    scheme_refresher.start()
     yield
     # Shutdown
+    await scheme_refresher.stop()
+    await pretranslator.stop()
+    await job_queue.stop()
+    await llm_clients.close()
+    pools.shutdown()
     db.close()
 
 app = FastAPI(
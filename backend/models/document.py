@@ -25,6 +25,8 @@ class DocumentInDB(DocumentBase):
 class DocumentResponse(DocumentBase):
     id: str
     created_at: datetime
+    # language -> explanation translated in the background (see PRETRANSLATE_LANGUAGES)
+    translations: Optional[Dict[str, Any]] = None
 
     class Config:
         from_attributes = True
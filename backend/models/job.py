@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from datetime import datetime
+
+class JobSubmitted(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+    events_url: str
+
+class JobStatus(BaseModel):
+    job_id: str
+    filename: str
+    status: str
+    stage: Optional[str] = None
+    progress: float
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,92 @@
+import hashlib
+from core.cache import TieredCache
+from core.config import ANALYSIS_CACHE_TTL, ANALYSIS_CACHE_MAX_ENTRIES, NEAR_DUP_ENABLED
+from core.logger import get_logger
+from services.simplifier import PROMPT_VERSION
+from services.keyword_matcher import rules_fingerprint
+from utils.text_cleaner import normalize_whitespace
+from services.near_duplicate import NearDuplicateIndex, patch_explanation
+
+logger = get_logger(__name__)
+
+# Editing the prompt or notice_rules.json invalidates cached analyses
+ANALYSIS_CACHE_VERSION = f"prompt-{PROMPT_VERSION}:rules-{rules_fingerprint}"
+# Cached results leave out scheme suggestions, which are ranked against the
+# current catalog on every hit; older entries still carry a stale ranking
+RESULT_CACHE_VERSION = f"{ANALYSIS_CACHE_VERSION}:schemes-live"
+
+# Keyed by the hash of the uploaded bytes - skips OCR entirely on a repeat upload
+_file_cache = TieredCache(
+    "analysis_by_file", RESULT_CACHE_VERSION, ANALYSIS_CACHE_TTL, ANALYSIS_CACHE_MAX_ENTRIES
+)
+# Keyed by the hash of the normalized extracted text - catches re-scans/re-encodes of the same notice
+_text_cache = TieredCache(
+    "analysis_by_text", RESULT_CACHE_VERSION, ANALYSIS_CACHE_TTL, ANALYSIS_CACHE_MAX_ENTRIES
+)
+# Explanations of earlier notices, found by SimHash - catches the same template
+# with a different name, amount or date
+_near_duplicates = NearDuplicateIndex(ANALYSIS_CACHE_VERSION)
+
+
+def file_key(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(normalize_whitespace(text).encode('utf-8')).hexdigest()
+
+
+def _without_schemes(result: dict) -> dict:
+    return {k: v for k, v in result.items() if k != "scheme_suggestions"}
+
+
+def get_by_file(key: str):
+    """Cached result (without scheme suggestions) plus the extracted "text" it came from"""
+    return _file_cache.get(key)
+
+
+def set_by_file(key: str, result: dict, text: str):
+    _file_cache.set(key, {**_without_schemes(result), "text": text})
+
+
+def get_by_text(key: str):
+    """Cached result without scheme suggestions"""
+    return _text_cache.get(key)
+
+
+def set_by_text(key: str, result: dict):
+    _text_cache.set(key, _without_schemes(result))
+
+
+def reuse_near_duplicate(text: str, notice_type: str, severity: str):
+    """
+    Explanation of an earlier notice from the same template, with the values
+    that differ (names, amounts, dates, numbers) swapped in; None if there is none.
+    """
+    if not NEAR_DUP_ENABLED:
+        return None
+    match = _near_duplicates.find(text, f"{notice_type}|{severity}")
+    if match is None:
+        return None
+    explanation, changes = match
+    patched = patch_explanation(explanation, changes)
+    if patched is None:
+        logger.info("Near-duplicate notice: changed values not all found in its explanation, not reusing")
+        return None
+    logger.info(f"Near-duplicate notice: reusing explanation with {len(changes)} changed values")
+    return patched
+
+
+def remember_explanation(text: str, notice_type: str, severity: str, explanation):
+    """Index an LLM explanation for reuse by later near-duplicates"""
+    if NEAR_DUP_ENABLED:
+        _near_duplicates.add(text, f"{notice_type}|{severity}", explanation)
+
+
+def cache_stats():
+    """Hit/miss counters for the analysis caches"""
+    return {
+        "by_file": _file_cache.stats(),
+        "by_text": _text_cache.stats(),
+        "near_duplicates": _near_duplicates.stats()
+    }
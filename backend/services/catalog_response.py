@@ -0,0 +1,124 @@
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Serialized for every catalog version when it is built, at the highest
+# compression: the full catalog and the fields the frontend's scheme cards use
+CANONICAL_PROJECTIONS = ((), ("benefits", "category", "description", "ministry", "name", "state"))
+# Any other variant is a page of at most this many schemes, serialized on
+# first request at a cheaper compression level and kept in a small LRU
+MAX_PAGE_LIMIT = 1000
+MAX_VARIANTS = 64
+PAGE_GZIP_LEVEL = 6
+PAGE_BROTLI_QUALITY = 5
+
+
+def _parse_accept_encoding(header: str) -> dict:
+    """Accept-Encoding -> {coding: q}"""
+    codings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[name.strip().lower()] = q
+    return codings
+
+
+class CatalogBody:
+    """
+    One catalog response serialized once, in every supported content coding,
+    with a strong ETag per coding (same content, so a client switching
+    encodings still revalidates).
+    """
+
+    def __init__(self, payload: dict, gzip_level: int = 9, brotli_quality: int = 11):
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()[:24]
+        self.bodies = {"identity": raw, "gzip": gzip.compress(raw, compresslevel=gzip_level, mtime=0)}
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(raw, quality=brotli_quality)
+        self.etags = {
+            coding: f'"{digest}"' if coding == "identity" else f'"{digest}-{coding}"'
+            for coding in self.bodies
+        }
+
+    def encoding_for(self, accept_encoding: str) -> str:
+        """Best coding the client accepts: brotli, then gzip, then none"""
+        accepted = _parse_accept_encoding(accept_encoding or "")
+        for coding in ("br", "gzip"):
+            q = accepted.get(coding, accepted.get("*", 0.0))
+            if coding in self.bodies and q > 0:
+                return coding
+        return "identity"
+
+    def not_modified(self, if_none_match: str) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return any(etag in tags for etag in self.etags.values())
+
+
+class CatalogResponses:
+    """
+    Pre-serialized GET /schemes responses for one catalog version. The
+    canonical variants (CANONICAL_PROJECTIONS of the whole catalog) are built
+    with the catalog, off the request path. Other variants are pages bounded
+    by MAX_PAGE_LIMIT, built on first request outside the lock (so a slow one
+    never holds up other requests) and then served as stored bytes until the
+    catalog changes; the least recently served are evicted past MAX_VARIANTS.
+    Canonical variants are read without a lock; looking up a page variant
+    takes the lock only for the dict access.
+    """
+
+    def __init__(self, schemes: list):
+        self.schemes = schemes
+        self._canonical = {(fields, 0, None): self._build(fields, 0, None) for fields in CANONICAL_PROJECTIONS}
+        self._variants = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fields: tuple = (), offset: int = 0, limit: int = None) -> CatalogBody:
+        if limit is None and (offset or fields not in CANONICAL_PROJECTIONS):
+            limit = MAX_PAGE_LIMIT
+        key = (fields, offset, limit)
+        body = self._canonical.get(key)
+        if body is not None:
+            return body
+        with self._lock:
+            body = self._variants.get(key)
+            if body is not None:
+                self._variants.move_to_end(key)
+                return body
+
+        body = self._build(fields, offset, limit, PAGE_GZIP_LEVEL, PAGE_BROTLI_QUALITY)
+        with self._lock:
+            # A concurrent request may have built the same page meanwhile
+            body = self._variants.setdefault(key, body)
+            while len(self._variants) > MAX_VARIANTS:
+                self._variants.popitem(last=False)
+        return body
+
+    def _build(self, fields: tuple, offset: int, limit: int, gzip_level: int = 9,
+               brotli_quality: int = 11) -> CatalogBody:
+        page = self.schemes[offset:offset + limit if limit is not None else None]
+        if fields:
+            page = [{k: v for k, v in scheme.items() if k in fields} for scheme in page]
+        return CatalogBody(
+            {"schemes": page, "total": len(self.schemes), "offset": offset, "limit": limit},
+            gzip_level, brotli_quality
+        )
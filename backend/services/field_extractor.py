@@ -0,0 +1,186 @@
+import re
+from services.keyword_matcher import scan_notice, tokenize
+from services.notice_chunker import estimate_tokens
+
+_MONTHS = (
+    r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|"
+    r"sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+)
+_DATE = re.compile(
+    rf"\b(?:\d{{1,2}}[/.-]\d{{1,2}}[/.-](?:\d{{4}}|\d{{2}})"              # 12/03/2024, 12-03-24, 12.03.2024
+    rf"|\d{{4}}-\d{{2}}-\d{{2}}"                                          # 2024-03-12
+    rf"|\d{{1,2}}(?:st|nd|rd|th)?[\s-]+(?:{_MONTHS})[a-z]*[\s,-]+\d{{2,4}}"  # 12th March 2024, 12-Mar-24
+    rf"|(?:{_MONTHS})[a-z]*\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}})\b",   # March 12, 2024
+    re.IGNORECASE
+)
+_RELATIVE_DEADLINE = re.compile(
+    r"\b(?:within|in|before the expiry of|not later than)\s+(?:a period of\s+)?"
+    r"(\d{1,3}|one|two|three|seven|ten|fifteen|thirty|sixty|ninety)\s*(?:\(\w+\)\s*)?"
+    r"(days?|weeks?|months?)\b",
+    re.IGNORECASE
+)
+_DEADLINE_CONTEXT = re.compile(
+    r"\b(?:on or before|before|by|latest by|last date|due date|not later than|till|until|hearing on|appear on)\b",
+    re.IGNORECASE
+)
+_REFERENCE = re.compile(
+    r"\b(?:notice|ref(?:erence)?|letter|order|memo|challan|case|file|demand|assessment|din|"
+    r"application|receipt|acknowledg(?:e)?ment|srn|fir|suit)\s*"
+    r"(?:(?:no|number|num|id|#)\.?)?\s*[:.\-]?\s*"
+    r"(?=[A-Z/\-.()]*\d)([A-Z0-9][A-Z0-9/\-.()]{2,40}[A-Z0-9)])",
+    re.IGNORECASE
+)
+_SECTION = re.compile(
+    r"\b(?:u/s\.?|sec(?:tion)?s?\.?|rule|clause|article)\s*"
+    r"(\d+[A-Z]{0,3}(?:\(\w{1,4}\))*(?:\s*(?:,|and|&|/|read with|r/w)\s*\d+[A-Z]{0,3}(?:\(\w{1,4}\))*)*)"
+    r"(?:\s+of\s+(?:the\s+)?([A-Z][\w&,'\- ]{2,80}?\b(?:Act|Code|Rules|Regulations)(?:,?\s*\d{4})?))?",
+    re.IGNORECASE
+)
+_AMOUNT = re.compile(
+    r"(?:₹|\brs\.?|\binr\b|\brupees\b)\s*(\d{1,3}(?:,\d{2,3})*(?:\.\d{1,2})?|\d+(?:\.\d{1,2})?)"
+    r"(?:\s*(lakhs?|lacs?|crores?|thousand))?",
+    re.IGNORECASE
+)
+_AUTHORITY = re.compile(
+    r"\b(?:office of the [\w .,&-]{3,60}|government of [a-z ]{3,40}|ministry of [\w ,&]{3,60}|"
+    r"(?:income tax|gst|customs|excise|revenue|police|transport|labour|municipal|forest|"
+    r"electricity|water|health|education)\s+(?:department|dept\.?|office|board|authority)|"
+    r"municipal corporation(?: of [a-z ]{3,30})?|nagar (?:nigam|palika|panchayat)|gram panchayat|"
+    r"(?:traffic|city|district) police|regional transport office|rto [a-z ]{3,20}|"
+    r"(?:district|high|supreme|civil|sessions|family|consumer|virtual) court(?: of [a-z ]{3,30})?|"
+    r"(?:assistant |deputy |joint |chief )?commissioner of [\w ]{3,40}|tehsildar[\w ,]{0,30}|"
+    r"collector(?:ate)?(?: of [a-z ]{3,30})?|employees'? provident fund organi[sz]ation|epfo|esic)",
+    re.IGNORECASE
+)
+# A sentence ends at terminal punctuation followed by a capital (so "Rs. 500",
+# "A.Y. 2023-24" and "28.03.2024" stay whole)
+_SENTENCE_END = re.compile(r"(?<=[.!?।])\s+(?=[A-Z\u0900-\u097F\"'(])")
+# Case and punctuation are ignored when spotting a repeated sentence
+_NON_WORD = re.compile(r"\W+")
+
+# Words that mark a sentence as something the citizen must know or do
+_ACTION_WORDS = {
+    "pay", "payable", "submit", "appear", "reply", "respond", "file", "furnish", "produce",
+    "deposit", "comply", "attend", "due", "deadline", "last", "within", "failure", "fail",
+    "penalty", "fine", "liable", "required", "directed", "hereby", "must", "shall",
+    "affected", "applicable", "eligible", "owner", "occupier", "assessee", "applicant"
+}
+
+_MAX_VALUES = 8
+# Leading lines usually hold the issuing office and the notice title
+_HEADER_LINES = 4
+
+
+def extract_fields(text: str) -> dict:
+    """
+    Rule-based pre-analysis of a notice: dates (and which look like deadlines),
+    relative deadlines ("within 15 days"), notice/reference numbers, section
+    citations, rupee amounts and issuing authorities. Values are de-duplicated
+    and kept in order of appearance.
+    """
+    dates, deadlines = [], []
+    for match in _DATE.finditer(text):
+        value = " ".join(match.group().split())
+        before = text[max(0, match.start() - 40):match.start()]
+        target = deadlines if _DEADLINE_CONTEXT.search(before) else dates
+        _append(target, value)
+    for match in _RELATIVE_DEADLINE.finditer(text):
+        _append(deadlines, " ".join(match.group().split()))
+
+    references = []
+    for match in _REFERENCE.finditer(text):
+        _append(references, match.group(1).rstrip(".-/"))
+
+    sections = []
+    for match in _SECTION.finditer(text):
+        citation = " ".join(match.group().split()).rstrip(",.")
+        _append(sections, citation)
+
+    amounts = []
+    for match in _AMOUNT.finditer(text):
+        value = f"₹{match.group(1)}" + (f" {match.group(2).lower()}" if match.group(2) else "")
+        _append(amounts, value)
+
+    authorities = []
+    for match in _AUTHORITY.finditer(text):
+        _append(authorities, " ".join(match.group().split()).strip(" ,.-"))
+
+    return {
+        "dates": dates[:_MAX_VALUES],
+        "deadlines": deadlines[:_MAX_VALUES],
+        "reference_numbers": references[:_MAX_VALUES],
+        "sections": sections[:_MAX_VALUES],
+        "amounts": amounts[:_MAX_VALUES],
+        "authorities": authorities[:_MAX_VALUES]
+    }
+
+
+def format_fields(fields: dict) -> str:
+    """Fields as compact 'Label: a; b' lines for the LLM prompt (empty ones omitted)"""
+    labels = {
+        "deadlines": "Deadlines",
+        "dates": "Other dates",
+        "reference_numbers": "Notice/reference numbers",
+        "sections": "Sections cited",
+        "amounts": "Amounts",
+        "authorities": "Authorities mentioned"
+    }
+    return "\n".join(
+        f"- {label}: {'; '.join(fields[key])}" for key, label in labels.items() if fields.get(key)
+    )
+
+
+def condense_notice(text: str, fields: dict, max_tokens: int = None) -> str:
+    """
+    The parts of a notice worth sending to the LLM: the header lines, then
+    every sentence that carries an extracted field, a rule keyword or an
+    action word, in original order (up to about max_tokens, if given). Boilerplate
+    (addresses, signatures, repeated legal text) is left out. Sentences may span
+    OCR line breaks; a sentence repeated (e.g. on every page) is kept once.
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    nonblank = [i for i, line in enumerate(lines) if line]
+    header = [lines[i] for i in nonblank[:_HEADER_LINES]]
+    body = lines[nonblank[_HEADER_LINES - 1] + 1:] if len(nonblank) > _HEADER_LINES else []
+
+    values = {v.lower() for key in fields for v in fields[key]}
+    keywords = set()
+    for keyword in scan_notice(text).keywords:
+        keywords.update(keyword.split())
+    relevant = keywords | _ACTION_WORDS
+
+    kept = list(header)
+    used = estimate_tokens("\n".join(kept))
+    seen = set()
+    for sentence in _sentences(body):
+        normalized = _NON_WORD.sub(" ", sentence.lower()).strip()
+        if len(sentence) < 12 or normalized in seen:
+            continue
+        seen.add(normalized)
+        lowered = sentence.lower()
+        if not (relevant & set(tokenize(sentence)) or any(v in lowered for v in values)):
+            continue
+        cost = estimate_tokens(sentence)
+        if max_tokens is not None and used + cost > max_tokens:
+            break
+        kept.append(sentence)
+        used += cost
+    return "\n".join(kept)
+
+
+def _sentences(lines: list):
+    """Sentences of a paragraph's lines joined up (OCR wraps mid-sentence); blank lines end a paragraph"""
+    paragraph = []
+    for line in lines + [""]:
+        if line:
+            paragraph.append(line)
+            continue
+        if paragraph:
+            for sentence in _SENTENCE_END.split(" ".join(paragraph)):
+                yield " ".join(sentence.split())
+            paragraph = []
+
+
+def _append(values: list, value: str):
+    if value and value not in values:
+        values.append(value)
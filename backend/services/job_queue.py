@@ -0,0 +1,231 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+import uuid
+from core.config import JOBS_DB_PATH, JOB_SPOOL_DIR, JOB_WORKERS, JOB_MAX_QUEUED, JOB_RETENTION
+from core.logger import get_logger
+from services.notice_pipeline import process_notice_when_ready, STAGES
+
+logger = get_logger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+FINISHED_STATUSES = (COMPLETED, FAILED)
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already waiting"""
+    pass
+
+
+class JobStore:
+    """SQLite persistence for job state so a restart does not lose jobs"""
+
+    def __init__(self, db_path: str = JOBS_DB_PATH):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, filename TEXT NOT NULL, status TEXT NOT NULL, "
+            "stage TEXT, result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def create(self, job_id: str, filename: str) -> dict:
+        now = time.time()
+        self._conn.execute(
+            "INSERT INTO jobs (job_id, filename, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, filename, QUEUED, now, now)
+        )
+        self._conn.commit()
+        return self.get(job_id)
+
+    def update(self, job_id: str, **fields):
+        if "result" in fields and fields["result"] is not None:
+            fields["result"] = json.dumps(fields["result"], ensure_ascii=False)
+        fields["updated_at"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        self._conn.execute(
+            f"UPDATE jobs SET {columns} WHERE job_id = ?",
+            (*fields.values(), job_id)
+        )
+        self._conn.commit()
+
+    def get(self, job_id: str):
+        row = self._conn.execute(
+            "SELECT job_id, filename, status, stage, result, error, created_at, updated_at "
+            "FROM jobs WHERE job_id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row[0],
+            "filename": row[1],
+            "status": row[2],
+            "stage": row[3],
+            "progress": _progress(row[2], row[3]),
+            "result": json.loads(row[4]) if row[4] else None,
+            "error": row[5],
+            "created_at": row[6],
+            "updated_at": row[7]
+        }
+
+    def unfinished(self):
+        """Job ids that were queued or running, oldest first"""
+        rows = self._conn.execute(
+            "SELECT job_id FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+            (QUEUED, RUNNING)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def purge_finished(self, older_than: float):
+        self._conn.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+            (COMPLETED, FAILED, older_than)
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+def _progress(status: str, stage) -> float:
+    """Fraction of pipeline stages started (1.0 once finished)"""
+    if status in FINISHED_STATUSES:
+        return 1.0
+    if stage in STAGES:
+        return round(STAGES.index(stage) / len(STAGES), 2)
+    return 0.0
+
+
+class NoticeJobQueue:
+    """
+    In-process worker queue running the notice pipeline for submitted jobs.
+    Uploaded bytes are spooled to disk and job state lives in SQLite; on startup
+    any queued or interrupted job is picked up again.
+    """
+
+    def __init__(self):
+        self.store = None
+        self._queue = None
+        self._workers = []
+        self._subscribers = {}
+
+    async def start(self):
+        """Open the store, requeue unfinished jobs and start workers"""
+        os.makedirs(JOB_SPOOL_DIR, exist_ok=True)
+        self.store = JobStore()
+        self.store.purge_finished(time.time() - JOB_RETENTION)
+        self._queue = asyncio.Queue()
+
+        pending = self.store.unfinished()
+        for job_id in pending:
+            self.store.update(job_id, status=QUEUED, stage=None)
+            self._queue.put_nowait(job_id)
+        if pending:
+            logger.info(f"Requeued {len(pending)} unfinished notice jobs")
+
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(JOB_WORKERS)]
+        logger.info(f"Notice job queue started with {JOB_WORKERS} workers")
+
+    async def stop(self):
+        """Cancel workers; interrupted jobs stay 'running' and are requeued next start"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self.store:
+            self.store.close()
+            self.store = None
+
+    def submit(self, file_bytes: bytes, filename: str) -> dict:
+        """Spool the upload, record the job and queue it; returns the job state"""
+        if self._queue.qsize() >= JOB_MAX_QUEUED:
+            raise JobQueueFull(f"{self._queue.qsize()} jobs already queued")
+
+        job_id = uuid.uuid4().hex
+        with open(self._spool_path(job_id), "wb") as f:
+            f.write(file_bytes)
+
+        job = self.store.create(job_id, filename)
+        self._queue.put_nowait(job_id)
+        logger.info(f"Queued notice job {job_id} for {filename}")
+        return job
+
+    def get(self, job_id: str):
+        return self.store.get(job_id)
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Queue that receives the job state after every change"""
+        events = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(events)
+        return events
+
+    def unsubscribe(self, job_id: str, events: asyncio.Queue):
+        listeners = self._subscribers.get(job_id)
+        if listeners:
+            listeners.discard(events)
+            if not listeners:
+                del self._subscribers[job_id]
+
+    def stats(self):
+        return {
+            "workers": len(self._workers),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queued": JOB_MAX_QUEUED
+        }
+
+    def _update(self, job_id: str, **fields):
+        self.store.update(job_id, **fields)
+        job = self.store.get(job_id)
+        for events in self._subscribers.get(job_id, ()):
+            events.put_nowait(job)
+
+    def _spool_path(self, job_id: str) -> str:
+        return os.path.join(JOB_SPOOL_DIR, job_id)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = self.store.get(job_id)
+        if job is None:
+            return
+
+        spool_path = self._spool_path(job_id)
+        if not os.path.exists(spool_path):
+            logger.error(f"Notice job {job_id}: spooled upload is missing")
+            self._update(job_id, status=FAILED, error="Uploaded file is no longer available. Please upload again.")
+            return
+
+        with open(spool_path, "rb") as f:
+            file_bytes = f.read()
+
+        self._update(job_id, status=RUNNING)
+        try:
+            result = await process_notice_when_ready(
+                file_bytes, job["filename"],
+                on_stage=lambda stage: self._update(job_id, stage=stage)
+            )
+            self._update(job_id, status=COMPLETED, result=result)
+            logger.info(f"Notice job {job_id} completed")
+        except Exception as e:
+            logger.error(f"Notice job {job_id} failed: {str(e)}")
+            self._update(job_id, status=FAILED, error="An error occurred while processing the notice. Please try again.")
+
+        os.remove(spool_path)
+
+
+job_queue = NoticeJobQueue()
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import string
+from functools import lru_cache
+from core.config import DATA_DIR
+
+# Load notice classification and severity rules (once, shared by classifier and severity analyzer)
+rules_path = os.path.join(DATA_DIR, "notice_rules.json")
+notice_rules = {}
+rules_fingerprint = "no-rules"
+
+if os.path.exists(rules_path):
+    with open(rules_path, 'rb') as f:
+        raw_rules = f.read()
+    notice_rules = json.loads(raw_rules.decode('utf-8'))
+    rules_fingerprint = hashlib.sha256(raw_rules).hexdigest()[:16]
+
+DEFAULT_SEVERITY_KEYWORDS = {
+    "urgent": [
+        "penalty", "fine", "legal action", "court", "arrest", "warrant",
+        "immediate", "deadline", "last notice", "foreclosure", "eviction"
+    ],
+    "action_required": [
+        "submit", "response required", "verification", "clarification",
+        "documents needed", "appear", "within days", "compliance"
+    ]
+}
+
+# Punctuation becomes whitespace before splitting into words (str.translate + split
+# is several times faster than a \w+ regex on large OCR texts)
+_PUNCTUATION = str.maketrans({c: " " for c in string.punctuation + "₹“”‘’—–…•·।"})
+
+
+def tokenize(text: str) -> list:
+    """Lowercase words of text, punctuation dropped"""
+    return text.lower().translate(_PUNCTUATION).split()
+
+
+class ScanResult:
+    """Everything the rule-based steps need from one pass over the text"""
+
+    def __init__(self, keywords: set, category_scores: dict, severity_hits: dict):
+        self.keywords = keywords                # distinct keywords present (normalized)
+        self.category_scores = category_scores  # category -> distinct keyword hits, in rules order
+        self.severity_hits = severity_hits      # severity level -> keywords present
+
+    def has(self, keyword: str) -> bool:
+        return normalize_keyword(keyword) in self.keywords
+
+
+class KeywordMatcher:
+    """
+    Finds every category keyword, notice-type word and severity keyword in one
+    pass over the text.
+
+    The text is tokenized once into words; single-word keywords are then found
+    with one set intersection, and multi-word keywords are only searched for
+    (in the space-joined word list) when their first word occurs. The cost
+    depends on the text length, not on the number of keywords.
+    Keywords match whole words only (so "pan" no longer fires inside "company"),
+    across any whitespace or punctuation (including OCR line breaks), and also
+    match their simple plural ("summon" -> "summons").
+    """
+
+    def __init__(self, rules: dict):
+        self.categories = {}
+        type_words = set()
+        for category, data in rules.items():
+            if category == "severity_keywords":
+                continue
+            self.categories[category] = {normalize_keyword(k) for k in data.get("keywords", [])}
+            for notice_type in data.get("types", []):
+                type_words.update(normalize_keyword(w) for w in notice_type.lower().split())
+
+        severity_keywords = rules.get("severity_keywords", {})
+        self.severity = {
+            level: {normalize_keyword(k) for k in severity_keywords.get(level, defaults)}
+            for level, defaults in DEFAULT_SEVERITY_KEYWORDS.items()
+        }
+
+        keywords = set(type_words)
+        for group in list(self.categories.values()) + list(self.severity.values()):
+            keywords.update(group)
+        keywords.discard("")
+        self.keyword_count = len(keywords)
+
+        # Single words: matched against the text's word set; plural forms map back to the keyword
+        self._words = {k for k in keywords if " " not in k}
+        self._plurals = {}
+        for word in self._words:
+            self._plurals.setdefault(word + "s", word)
+            self._plurals.setdefault(word + "es", word)
+
+        # Phrases: bucketed by first word, with the space-padded forms to search for
+        self._phrases = {}
+        for keyword in keywords - self._words:
+            forms = (f" {keyword} ", f" {keyword}s ", f" {keyword}es ")
+            self._phrases.setdefault(keyword.split(" ")[0], []).append((keyword, forms))
+
+    def scan(self, text: str) -> ScanResult:
+        tokens = tokenize(text)
+        unique = set(tokens)
+
+        found = self._words & unique
+        found.update(self._plurals[t] for t in self._plurals.keys() & unique)
+
+        first_words = self._phrases.keys() & unique
+        if first_words:
+            joined = f" {' '.join(tokens)} "
+            for first in first_words:
+                for keyword, forms in self._phrases[first]:
+                    if any(form in joined for form in forms):
+                        found.add(keyword)
+
+        category_scores = {}
+        for category, keywords in self.categories.items():
+            score = len(keywords & found)
+            if score > 0:
+                category_scores[category] = score
+
+        severity_hits = {level: keywords & found for level, keywords in self.severity.items()}
+        return ScanResult(found, category_scores, severity_hits)
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Lowercase words joined by single spaces, punctuation dropped ("e-Challan" -> "e challan")"""
+    return " ".join(tokenize(keyword))
+
+
+matcher = KeywordMatcher(notice_rules)
+
+
+@lru_cache(maxsize=16)
+def scan_notice(text: str) -> ScanResult:
+    """
+    Scan text against the notice rules. Memoized so classify_notice and
+    analyze_severity share one scan of the same text.
+    """
+    return matcher.scan(text)
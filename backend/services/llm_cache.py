@@ -0,0 +1,34 @@
+import hashlib
+import json
+from core.cache import TieredCache
+from core.config import LLM_CACHE_TTL, LLM_CACHE_MAX_MEMORY_ENTRIES, LLM_CACHE_MAX_ENTRIES
+
+# Layout of cached values; prompt template versions are part of each key instead
+LLM_CACHE_SCHEMA = "1"
+
+# Raw LLM output (the text before parsing), shared by every LLM call site
+_responses = TieredCache(
+    "llm_responses", LLM_CACHE_SCHEMA, LLM_CACHE_TTL, LLM_CACHE_MAX_MEMORY_ENTRIES,
+    max_persistent_entries=LLM_CACHE_MAX_ENTRIES
+)
+
+
+def response_key(provider: str, model: str, prompt_version: str, *inputs: str) -> str:
+    """
+    Cache key for one LLM call. inputs are the values the prompt template is
+    filled with, already normalized by the caller.
+    """
+    payload = json.dumps([provider, model, prompt_version, *inputs], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def get_response(key: str):
+    return _responses.get(key)
+
+
+def set_response(key: str, raw: str):
+    _responses.set(key, raw)
+
+
+def cache_stats():
+    return _responses.stats()
@@ -0,0 +1,108 @@
+import httpx
+from core.config import (
+    LLM_PROVIDER, OPENAI_API_KEY, GOOGLE_API_KEY, GROQ_API_KEY,
+    LLM_MAX_CONNECTIONS, LLM_MAX_KEEPALIVE, LLM_KEEPALIVE_EXPIRY,
+    LLM_TIMEOUT, LLM_CONNECT_TIMEOUT, LLM_MAX_RETRIES
+)
+from core.logger import get_logger
+from services.mock_llm import mock_llm, MODEL as MOCK_MODEL
+
+logger = get_logger(__name__)
+
+GROQ_MODEL = "llama-3.3-70b-versatile"
+OPENAI_MODEL = "gpt-3.5-turbo"
+GEMINI_MODEL = "models/gemini-2.0-flash"
+MODELS = {"groq": GROQ_MODEL, "openai": OPENAI_MODEL, "gemini": GEMINI_MODEL, "mock": MOCK_MODEL}
+
+
+class LLMClients:
+    """
+    One long-lived async client per LLM provider, so requests reuse pooled
+    keep-alive connections instead of paying a TLS handshake each time.
+    Created in the app lifespan (or lazily on first use) and closed on shutdown.
+    """
+
+    def __init__(self):
+        self._groq = None
+        self._openai = None
+        self._gemini = None
+
+    def start(self):
+        """Create clients for every provider that has an API key"""
+        if GROQ_API_KEY:
+            self.groq()
+        if OPENAI_API_KEY:
+            self.openai()
+        if GOOGLE_API_KEY:
+            self.gemini()
+        logger.info(f"LLM clients ready: {', '.join(self.stats()['providers']) or 'none'}")
+
+    async def close(self):
+        """Close pooled connections"""
+        if self._groq is not None:
+            await self._groq.close()
+            self._groq = None
+        if self._openai is not None:
+            await self._openai.close()
+            self._openai = None
+        self._gemini = None
+        logger.info("LLM clients closed")
+
+    def groq(self):
+        if self._groq is None:
+            from groq import AsyncGroq
+            self._groq = AsyncGroq(
+                api_key=GROQ_API_KEY,
+                http_client=_http_client(),
+                max_retries=LLM_MAX_RETRIES
+            )
+        return self._groq
+
+    def openai(self):
+        if self._openai is None:
+            from openai import AsyncOpenAI
+            self._openai = AsyncOpenAI(
+                api_key=OPENAI_API_KEY,
+                http_client=_http_client(),
+                max_retries=LLM_MAX_RETRIES
+            )
+        return self._openai
+
+    def gemini(self):
+        """Gemini model handle; the SDK keeps its own gRPC channel per process"""
+        if self._gemini is None:
+            import google.generativeai as genai
+            genai.configure(api_key=GOOGLE_API_KEY)
+            self._gemini = genai.GenerativeModel(GEMINI_MODEL)
+        return self._gemini
+
+    def stats(self):
+        if LLM_PROVIDER == "mock":
+            return {"providers": ["mock"], "mock": mock_llm.stats()}
+        providers = []
+        if self._groq is not None:
+            providers.append("groq")
+        if self._openai is not None:
+            providers.append("openai")
+        if self._gemini is not None:
+            providers.append("gemini")
+        return {
+            "providers": providers,
+            "max_connections": LLM_MAX_CONNECTIONS,
+            "max_keepalive": LLM_MAX_KEEPALIVE,
+            "timeout": LLM_TIMEOUT
+        }
+
+
+def _http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+    )
+
+
+llm_clients = LLMClients()
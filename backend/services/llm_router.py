@@ -0,0 +1,302 @@
+import asyncio
+import math
+import time
+from collections import deque
+from core.config import (
+    LLM_PROVIDER, LLM_PROVIDER_ORDER, OPENAI_API_KEY, GOOGLE_API_KEY, GROQ_API_KEY,
+    LLM_DEADLINE, LLM_HEDGE_ENABLED, LLM_HEDGE_MIN_DELAY, LLM_HEDGE_DEFAULT_DELAY,
+    LLM_LATENCY_WINDOW, LLM_BREAKER_FAILURES, LLM_BREAKER_COOLDOWN
+)
+from core.logger import get_logger
+from services.llm_scheduler import llm_scheduler, PRIORITY_INFORMATIONAL
+
+logger = get_logger(__name__)
+
+API_KEYS = {"groq": GROQ_API_KEY, "gemini": GOOGLE_API_KEY, "openai": OPENAI_API_KEY}
+
+# Samples needed before a provider's own p95 is trusted as its hedge delay
+MIN_LATENCY_SAMPLES = 20
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class LLMUnavailable(Exception):
+    """Raised when no provider produced a response before the deadline"""
+    pass
+
+
+class ProviderHealth:
+    """
+    Recent latencies and a consecutive-failure circuit breaker for one provider.
+    HALF_OPEN means the one trial call allowed after the cooldown is in flight;
+    it is entered only when that call actually starts (start_call()).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies = deque(maxlen=LLM_LATENCY_WINDOW)
+        self.failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.calls = 0
+        self.errors = 0
+
+    def available(self) -> bool:
+        """Closed, or open long enough that one trial request may go through"""
+        if self.state == OPEN:
+            return time.monotonic() - self.opened_at >= LLM_BREAKER_COOLDOWN
+        return self.state == CLOSED
+
+    def start_call(self) -> bool:
+        """
+        Whether a call may start now. The first call after the cooldown
+        becomes the trial (OPEN -> HALF_OPEN); others wait for its outcome.
+        """
+        if self.state == CLOSED:
+            return True
+        if self.available():
+            self.state = HALF_OPEN
+            logger.info(f"LLM provider {self.name}: circuit half-open, sending a trial request")
+            return True
+        return False
+
+    def record_cancelled(self, trial: bool):
+        """A trial cancelled before it finished proved nothing: open for another cooldown"""
+        if trial and self.state == HALF_OPEN:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def record_success(self, latency: float):
+        self.calls += 1
+        self.latencies.append(latency)
+        self.failures = 0
+        if self.state != CLOSED:
+            logger.info(f"LLM provider {self.name}: circuit closed")
+        self.state = CLOSED
+
+    def record_failure(self):
+        self.calls += 1
+        self.errors += 1
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= LLM_BREAKER_FAILURES:
+            if self.state != OPEN:
+                logger.warning(f"LLM provider {self.name}: circuit open after {self.failures} failures")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def p95(self):
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def hedge_delay(self) -> float:
+        p95 = self.p95()
+        return max(LLM_HEDGE_MIN_DELAY, p95 if p95 is not None else LLM_HEDGE_DEFAULT_DELAY)
+
+    def stats(self):
+        p95 = self.p95()
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "calls": self.calls,
+            "errors": self.errors,
+            "p95_seconds": round(p95, 3) if p95 is not None else None
+        }
+
+
+class LLMRouter:
+    """
+    Sends each LLM call to the first healthy provider, failing over to the next
+    on error, hedging with a second provider when the first is slower than its
+    p95, and giving up only at the overall deadline.
+    """
+
+    def __init__(self):
+        if LLM_PROVIDER == "mock":
+            # Offline load testing: never fail over to a real provider
+            self.providers = ["mock"]
+        else:
+            order = [LLM_PROVIDER] + [p for p in LLM_PROVIDER_ORDER if p != LLM_PROVIDER]
+            self.providers = [p for p in order if p in API_KEYS and API_KEYS[p]]
+        self.health = {p: ProviderHealth(p) for p in self.providers}
+        self.hedges = 0
+
+    def available(self) -> bool:
+        return bool(self.providers)
+
+    def candidates(self) -> list:
+        """Providers to try, in order, skipping those with an open circuit"""
+        return [p for p in self.providers if self.health[p].available()]
+
+    async def complete(self, call, priority: int = PRIORITY_INFORMATIONAL, tokens: int = 0,
+                       deadline: float = LLM_DEADLINE):
+        """
+        Run call(provider) -> awaitable result on the best provider.
+        Each attempt first waits its turn in the rate-limit scheduler (queue
+        time counts toward hedging and the deadline, so a throttled provider
+        gets hedged too). Returns the first successful result; raises
+        LLMUnavailable if every candidate failed or the deadline passed.
+        """
+        candidates = self.candidates()
+        if not candidates:
+            raise LLMUnavailable("all LLM providers have an open circuit")
+
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + deadline
+        running = {}
+        errors = []
+        calling = set()  # providers past the rate-limit queue, actually being called
+
+        def launch():
+            while candidates:
+                provider = candidates.pop(0)
+                health = self.health[provider]
+                if not health.start_call():
+                    continue
+                trial = health.state == HALF_OPEN
+                task = asyncio.ensure_future(self._timed(provider, call, priority, tokens, trial, calling))
+                running[task] = provider
+                return provider
+            return None
+
+        if launch() is None:
+            raise LLMUnavailable("all LLM providers have an open circuit")
+        try:
+            while running:
+                remaining = give_up_at - loop.time()
+                if remaining <= 0:
+                    # Only providers that were actually called were too slow; ones
+                    # still queued for their rate limit are cancelled below
+                    for provider in running.values():
+                        if provider in calling:
+                            self.health[provider].record_failure()
+                    raise LLMUnavailable(f"no LLM response within {deadline}s")
+
+                wait = remaining
+                hedge_on = None
+                if LLM_HEDGE_ENABLED and candidates and len(running) == 1:
+                    hedge_on = next(iter(running.values()))
+                    wait = min(remaining, self.health[hedge_on].hedge_delay())
+
+                done, _ = await asyncio.wait(running, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if hedge_on is not None:
+                        hedged = launch()
+                        if hedged is not None:
+                            self.hedges += 1
+                            logger.info(f"LLM provider {hedge_on} slower than {wait:.1f}s, hedging with {hedged}")
+                    continue
+
+                for task in done:
+                    provider = running.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append(f"{provider}: {task.exception()}")
+                    logger.warning(f"LLM provider {provider} failed: {task.exception()}")
+
+                # Fail over straight away instead of waiting for the hedge delay
+                if not running and candidates:
+                    launch()
+
+            raise LLMUnavailable("; ".join(errors) or "no LLM provider available")
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def stream(self, open_stream, priority: int = PRIORITY_INFORMATIONAL, tokens: int = 0,
+                     deadline: float = LLM_DEADLINE):
+        """
+        Yield chunks from open_stream(provider) (an async iterator), failing over
+        to the next provider only while nothing has been yielded yet. The
+        deadline covers the wait for the first chunk, across all providers.
+        """
+        give_up_at = time.monotonic() + deadline
+        errors = []
+        for provider in self.candidates():
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                break
+            health = self.health[provider]
+            if not health.start_call():
+                continue
+            trial = health.state == HALF_OPEN
+            try:
+                try:
+                    await asyncio.wait_for(llm_scheduler.acquire(provider, tokens, priority), remaining)
+                except asyncio.TimeoutError:
+                    health.record_cancelled(trial)
+                    errors.append(f"{provider}: rate limit queue")
+                    break
+                started = time.monotonic()
+                remaining = give_up_at - started
+                iterator = open_stream(provider)
+                try:
+                    try:
+                        first = await asyncio.wait_for(iterator.__anext__(), remaining)
+                    except StopAsyncIteration:
+                        health.record_success(time.monotonic() - started)
+                        return
+                    except Exception as e:
+                        health.record_failure()
+                        error = str(e) or type(e).__name__
+                        errors.append(f"{provider}: {error}")
+                        logger.warning(f"LLM provider {provider} failed to stream: {error}")
+                        continue
+
+                    yield first
+                    try:
+                        async for chunk in iterator:
+                            yield chunk
+                    except Exception:
+                        health.record_failure()
+                        raise
+                    health.record_success(time.monotonic() - started)
+                    return
+                finally:
+                    # Also when the consumer stops early (client disconnect):
+                    # release the provider's connection
+                    await _close(iterator)
+            except (asyncio.CancelledError, GeneratorExit):
+                # The client went away mid-call - not the provider's fault
+                health.record_cancelled(trial)
+                raise
+
+        raise LLMUnavailable("; ".join(errors) or "no LLM provider available")
+
+    def stats(self):
+        return {
+            "providers": {p: self.health[p].stats() for p in self.providers},
+            "hedged_requests": self.hedges
+        }
+
+    async def _timed(self, provider, call, priority, tokens, trial: bool = False, calling: set = None):
+        health = self.health[provider]
+        try:
+            await llm_scheduler.acquire(provider, tokens, priority)
+            if calling is not None:
+                calling.add(provider)
+            started = time.monotonic()
+            result = await call(provider)
+        except asyncio.CancelledError:
+            # Lost a hedge race or hit the deadline - not the provider's fault,
+            # but a cancelled trial must not leave the circuit half-open
+            health.record_cancelled(trial)
+            raise
+        except Exception:
+            health.record_failure()
+            raise
+        health.record_success(time.monotonic() - started)
+        return result
+
+
+async def _close(iterator):
+    try:
+        await iterator.aclose()
+    except Exception:
+        pass
+
+
+llm_router = LLMRouter()
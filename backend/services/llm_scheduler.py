@@ -0,0 +1,205 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from core.config import (
+    LLM_RPM_GROQ, LLM_TPM_GROQ, LLM_RPM_GEMINI, LLM_TPM_GEMINI,
+    LLM_RPM_OPENAI, LLM_TPM_OPENAI, LLM_RPM_MOCK, LLM_TPM_MOCK
+)
+from services.llm_clients import MODELS
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Lower runs first
+PRIORITY_URGENT = 0
+PRIORITY_ACTION_REQUIRED = 1
+PRIORITY_INFORMATIONAL = 2
+PRIORITY_TRANSLATION = 3
+PRIORITY_NAMES = {
+    PRIORITY_URGENT: "urgent",
+    PRIORITY_ACTION_REQUIRED: "action_required",
+    PRIORITY_INFORMATIONAL: "informational",
+    PRIORITY_TRANSLATION: "translation"
+}
+
+LIMITS = {
+    "groq": (LLM_RPM_GROQ, LLM_TPM_GROQ),
+    "gemini": (LLM_RPM_GEMINI, LLM_TPM_GEMINI),
+    "openai": (LLM_RPM_OPENAI, LLM_TPM_OPENAI),
+    "mock": (LLM_RPM_MOCK, LLM_TPM_MOCK)
+}
+
+# Recent queue waits kept per priority for the p95
+WAIT_WINDOW = 500
+
+
+def priority_for_severity(severity: str) -> int:
+    """Queue priority for a notice from analyze_severity's label"""
+    if "Urgent" in severity:
+        return PRIORITY_URGENT
+    if "Action Required" in severity:
+        return PRIORITY_ACTION_REQUIRED
+    return PRIORITY_INFORMATIONAL
+
+
+class TokenBucket:
+    """Refills continuously at per_minute / 60 per second, up to one minute's worth"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available (a request larger than the bucket waits for a full one)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def headroom(self) -> float:
+        """Share of the bucket currently available"""
+        self._refill()
+        return max(0.0, self.level) / self.capacity
+
+    def take(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+
+class ProviderQueue:
+    """Priority queue of calls waiting on one provider/model's RPM and TPM buckets"""
+
+    def __init__(self, key: str, rpm: int, tpm: int):
+        self.key = key
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self._loop = None
+        self._heap = []
+        self._wakeup = None
+        self._dispatcher = None
+
+    async def acquire(self, tokens: int, priority: int, seq: int):
+        if self.requests is None and self.tokens is None:
+            return
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or a new event loop (tests, app restart in-process)
+            self._loop = loop
+            self._heap = []
+            self._wakeup = asyncio.Event()
+            self._dispatcher = None
+        future = loop.create_future()
+        heapq.heappush(self._heap, (priority, seq, tokens, future))
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        # A cancelled waiter leaves a cancelled future behind; the dispatcher skips it
+        await future
+
+    def depth(self) -> int:
+        return sum(1 for item in self._heap if not item[3].done())
+
+    def headroom(self) -> float:
+        buckets = [bucket for bucket in (self.requests, self.tokens) if bucket]
+        return min((bucket.headroom() for bucket in buckets), default=1.0)
+
+    async def _dispatch(self):
+        while True:
+            while self._heap and self._heap[0][3].done():
+                heapq.heappop(self._heap)
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            _, _, tokens, future = self._heap[0]
+            delay = max(
+                self.requests.wait_time(1) if self.requests else 0.0,
+                self.tokens.wait_time(tokens) if self.tokens else 0.0
+            )
+            if delay > 0:
+                # Sleep until the head fits; a new, higher-priority arrival wakes us early
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(tokens)
+            future.set_result(None)
+
+
+class LLMScheduler:
+    """
+    Central gate for outbound LLM calls: each provider/model has token buckets
+    for its requests-per-minute and tokens-per-minute limits, and waiting calls
+    are released in priority order (urgent notices before informational ones,
+    translations last), FIFO within a priority.
+    """
+
+    def __init__(self):
+        self._queues = {}
+        self._seq = itertools.count()
+        self._waits = {p: deque(maxlen=WAIT_WINDOW) for p in PRIORITY_NAMES}
+        self._granted = {p: 0 for p in PRIORITY_NAMES}
+
+    async def acquire(self, provider: str, tokens: int, priority: int = PRIORITY_INFORMATIONAL):
+        """Wait until provider's limits allow a call of about `tokens` prompt+completion tokens"""
+        queue = self._queue(provider)
+        started = time.monotonic()
+        await queue.acquire(tokens, priority, next(self._seq))
+        waited = time.monotonic() - started
+        self._waits[priority].append(waited)
+        self._granted[priority] += 1
+        if waited > 1:
+            logger.info(f"LLM call to {queue.key} ({PRIORITY_NAMES[priority]}) waited {waited:.1f}s for rate limit")
+
+    def pending(self) -> int:
+        """Calls currently waiting on any provider's limits"""
+        return sum(queue.depth() for queue in self._queues.values())
+
+    def headroom(self, provider: str) -> float:
+        """Share of provider's per-minute request/token limits unused right now (1.0 if unlimited)"""
+        return self._queue(provider).headroom()
+
+    def stats(self):
+        waits = {}
+        for priority, name in PRIORITY_NAMES.items():
+            recent = sorted(self._waits[priority])
+            waits[name] = {
+                "granted": self._granted[priority],
+                "avg_wait_ms": round(sum(recent) / len(recent) * 1000, 1) if recent else 0.0,
+                "p95_wait_ms": round(recent[math.ceil(0.95 * len(recent)) - 1] * 1000, 1) if recent else 0.0
+            }
+        return {
+            "queue_depth": {key: queue.depth() for key, queue in self._queues.items()},
+            "wait": waits
+        }
+
+    def _queue(self, provider: str) -> ProviderQueue:
+        key = f"{provider}:{MODELS.get(provider, '')}"
+        queue = self._queues.get(key)
+        if queue is None:
+            rpm, tpm = LIMITS.get(provider, (0, 0))
+            queue = ProviderQueue(key, rpm, tpm)
+            self._queues[key] = queue
+        return queue
+
+
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,134 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+from core.config import (
+    MOCK_LLM_SEED, MOCK_LLM_LATENCY_MS, MOCK_LLM_LATENCY_SIGMA, MOCK_LLM_TOKENS_PER_SECOND,
+    MOCK_LLM_ERROR_RATE, MOCK_LLM_RATE_LIMIT_RATE
+)
+from services.notice_chunker import estimate_tokens
+
+MODEL = "mock-1"
+
+
+class MockLLMError(Exception):
+    """Injected provider failure; status_code mirrors what the real SDKs report"""
+
+    def __init__(self, status_code: int, message: str, retry_after: float = None):
+        super().__init__(f"Error code: {status_code} - {message}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class MockLLM:
+    """
+    Offline stand-in for the Groq/Gemini/OpenAI clients, selected with
+    LLM_PROVIDER=mock. Responses depend only on the prompt; latencies and
+    injected failures come from a generator seeded with MOCK_LLM_SEED, so a
+    load test replays the same way every run.
+    """
+
+    def __init__(self, seed: int = MOCK_LLM_SEED):
+        self._random = random.Random(seed)
+        self.calls = 0
+        self.failures = 0
+
+    async def explain(self, prompt: str) -> str:
+        """The english/hinglish JSON simplify_notice expects"""
+        text = _explanation(prompt)
+        await self._generate(prompt, text)
+        return text
+
+    async def complete(self, prompt: str, max_tokens: int) -> str:
+        """Plain-text completion (section summaries)"""
+        text = _bullets(prompt, max_tokens)
+        await self._generate(prompt, text)
+        return text
+
+    async def translate(self, text: str, target_language: str) -> str:
+        translated = f"[{target_language}] {text}"
+        await self._generate(text, translated)
+        return translated
+
+    async def translate_batch(self, texts: list, target_language: str) -> list:
+        """translate() for several segments in one call"""
+        translated = [f"[{target_language}] {text}" for text in texts]
+        await self._generate("\n".join(texts), "\n".join(translated))
+        return translated
+
+    async def stream(self, prompt: str):
+        """explain() delivered in chunks at MOCK_LLM_TOKENS_PER_SECOND"""
+        text = _explanation(prompt)
+        await self._first_token(prompt)
+        chunk_size = 40
+        for start in range(0, len(text), chunk_size):
+            chunk = text[start:start + chunk_size]
+            await asyncio.sleep(estimate_tokens(chunk) / MOCK_LLM_TOKENS_PER_SECOND)
+            yield chunk
+
+    def stats(self):
+        return {"model": MODEL, "calls": self.calls, "injected_failures": self.failures}
+
+    async def _generate(self, prompt: str, output: str):
+        await self._first_token(prompt)
+        await asyncio.sleep(estimate_tokens(output) / MOCK_LLM_TOKENS_PER_SECOND)
+
+    async def _first_token(self, prompt: str):
+        """Wait the sampled time to first token, then maybe inject a failure"""
+        self.calls += 1
+        latency = MOCK_LLM_LATENCY_MS / 1000 * self._random.lognormvariate(0, MOCK_LLM_LATENCY_SIGMA)
+        roll = self._random.random()
+        await asyncio.sleep(latency)
+        if roll < MOCK_LLM_RATE_LIMIT_RATE:
+            self.failures += 1
+            raise MockLLMError(429, "Rate limit reached for model mock-1", retry_after=1.0)
+        if roll < MOCK_LLM_RATE_LIMIT_RATE + MOCK_LLM_ERROR_RATE:
+            self.failures += 1
+            raise MockLLMError(500, "Internal server error")
+
+
+def _field(prompt: str, name: str, default: str) -> str:
+    match = re.search(rf"^{name}:\s*(.+)$", prompt, re.MULTILINE)
+    return match.group(1).strip() if match else default
+
+
+def _explanation(prompt: str) -> str:
+    """Schema-valid explanation JSON derived only from the prompt"""
+    notice_type = _field(prompt, "Notice Type", "Government Notice")
+    severity = _field(prompt, "Severity", "Informational")
+    reference = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8].upper()
+    english = {
+        "Title": f"{notice_type} (mock)",
+        "Summary": f"This is a mock summary of a {notice_type.lower()} marked {severity}.",
+        "Explanation": "The issuing office has sent this notice and expects a response.",
+        "Reason": "Generated by the offline mock LLM provider.",
+        "Next Steps": ["Read the notice carefully", "Collect the listed documents", "Respond before the deadline"],
+        "Important Deadlines": "As stated in the notice",
+        "Who is affected": "The addressee",
+        "Issuing Authority": "Mock Department",
+        "Notice Number": f"MOCK-{reference}"
+    }
+    hinglish = {
+        **english,
+        "Summary": f"Yeh ek {notice_type} ka mock summary hai ({severity}).",
+        "Explanation": "Issuing office ne yeh notice bheja hai aur jawab chahta hai.",
+        "Next Steps": ["Notice dhyan se padho", "Documents collect karo", "Deadline se pehle jawab do"]
+    }
+    return json.dumps({"is_notice": True, "english": english, "hinglish": hinglish}, ensure_ascii=False)
+
+
+def _bullets(prompt: str, max_tokens: int) -> str:
+    """A few bullet points quoting the section's longest lines, within max_tokens"""
+    section = prompt.split("Section:", 1)[-1]
+    lines = sorted((l.strip() for l in section.splitlines() if l.strip()), key=len, reverse=True)
+    bullets = []
+    for line in lines[:5]:
+        bullet = f"- {line[:160]}"
+        if estimate_tokens("\n".join(bullets + [bullet])) > max_tokens:
+            break
+        bullets.append(bullet)
+    return "\n".join(bullets) or "-"
+
+
+mock_llm = MockLLM()
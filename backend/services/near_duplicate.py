@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from difflib import SequenceMatcher
+from core.config import (
+    CACHE_DB_PATH, NEAR_DUP_MAX_DISTANCE, NEAR_DUP_MIN_SIMILARITY,
+    NEAR_DUP_MAX_SPAN_TOKENS, NEAR_DUP_MAX_ENTRIES
+)
+from core.logger import get_logger
+from utils.text_cleaner import normalize_whitespace
+
+logger = get_logger(__name__)
+
+BITS = 64
+BANDS = 8  # 8-bit bands: any two fingerprints within 7 bits share at least one band
+BAND_BITS = BITS // BANDS
+# Templates (challans, demand notices) are short; long gazettes are not
+# indexed, which also bounds the cost of the word-level diff
+MAX_WORDS = 5000
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_HAS_DIGIT = re.compile(r"\d")
+_EDGES = re.compile(r"^\W+|\W+$", re.UNICODE)
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash over the words of text. Words containing digits are masked
+    first, so notices that differ only in amounts, dates or reference numbers
+    hash identically. Single words rather than shingles: on a short challan,
+    a changed name would otherwise disturb several features per word; word
+    order is checked afterwards by changed_values().
+    """
+    features = Counter("#" if _HAS_DIGIT.search(w) else w for w in text.lower().split())
+    weights = [0] * BITS
+    for feature, count in features.items():
+        value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(BITS):
+            weights[bit] += count if value >> bit & 1 else -count
+    return sum(1 << bit for bit in range(BITS) if weights[bit] > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def changed_values(old_text: str, new_text: str):
+    """
+    Word-level diff of two near-identical texts as a list of (old, new) value
+    pairs, each widened to whole whitespace-delimited words ("12/03/2024" rather
+    than "03"). Returns None if the texts differ by more than template fills:
+    similarity below NEAR_DUP_MIN_SIMILARITY, an edit longer than
+    NEAR_DUP_MAX_SPAN_TOKENS words, or a word inserted or deleted.
+    """
+    old_words = [m for m in _WORD.finditer(old_text)]
+    new_words = [m for m in _WORD.finditer(new_text)]
+    matcher = SequenceMatcher(None, [m.group() for m in old_words], [m.group() for m in new_words], autojunk=False)
+    if matcher.ratio() < NEAR_DUP_MIN_SIMILARITY:
+        return None
+
+    changes = []
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            continue
+        if max(i2 - i1, j2 - j1) > NEAR_DUP_MAX_SPAN_TOKENS:
+            return None
+        if i1 == i2 or j1 == j2:
+            # An added or removed word ("will not be disconnected") can change
+            # the meaning, and there is no old value to swap out
+            return None
+        old = _widen(old_text, old_words[i1].start(), old_words[i2 - 1].end())
+        new = _widen(new_text, new_words[j1].start(), new_words[j2 - 1].end())
+        if old != new and (old, new) not in changes:
+            changes.append((old, new))
+    return changes
+
+
+def _widen(text: str, start: int, end: int) -> str:
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    while end < len(text) and not text[end].isspace():
+        end += 1
+    return _EDGES.sub("", text[start:end])
+
+
+def patch_explanation(explanation, changes):
+    """
+    Replace each old value with the new one wherever it appears as a whole
+    word. Returns None unless every old value was found: the explanation may
+    restate a value differently ("12 March 2024" for 12/03/2024, "Rs. 4,500"
+    for 4500), and reusing it would then show the earlier notice's value.
+    """
+    serialized = json.dumps(explanation, ensure_ascii=False)
+    for old, new in changes:
+        if not old:
+            return None
+        pattern = re.compile(rf"(?<!\w){re.escape(json.dumps(old, ensure_ascii=False)[1:-1])}(?!\w)")
+        replacement = json.dumps(new, ensure_ascii=False)[1:-1]
+        serialized, count = pattern.subn(lambda _: replacement, serialized)
+        if count == 0:
+            return None
+    return json.loads(serialized)
+
+
+class NearDuplicateIndex:
+    """
+    SimHash index of analyzed notice texts and their LLM explanations.
+    Fingerprints are split into 8 bands of 8 bits; candidates share a band
+    with the query and are kept if within NEAR_DUP_MAX_DISTANCE bits, then
+    confirmed with a word-level diff. Entries live in memory (oldest evicted
+    beyond NEAR_DUP_MAX_ENTRIES) and in a SQLite table next to the caches.
+    Entries from another version (prompt or rules change) are dropped, and a
+    match must have the same context (notice type and severity), so a template
+    with an added "final notice" line is not treated as the earlier one.
+    """
+
+    def __init__(self, version: str, db_path: str = CACHE_DB_PATH, max_entries: int = NEAR_DUP_MAX_ENTRIES):
+        self.version = version
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # id -> (fingerprint, context, text, explanation)
+        self._bands = [{} for _ in range(BANDS)]  # band value -> set of ids
+        self._lock = threading.Lock()
+        self._conn = None
+        self._loaded = False
+
+    def find(self, text: str, context: str):
+        """(explanation, changes) of the closest prior notice with this context, or None"""
+        text = normalize_whitespace(text)
+        if text.count(" ") >= MAX_WORDS:
+            return None
+        fingerprint = simhash(text)
+        with self._lock:
+            self._load()
+            candidates = set()
+            for band, index in zip(_band_values(fingerprint), self._bands):
+                candidates.update(index.get(band, ()))
+            ranked = sorted(
+                (hamming(fingerprint, self._entries[i][0]), i) for i in candidates
+            )
+            ranked = [
+                (d, self._entries[i]) for d, i in ranked
+                if d <= NEAR_DUP_MAX_DISTANCE and self._entries[i][1] == context
+            ]
+
+        for _, (_, _, prior_text, explanation) in ranked:
+            changes = changed_values(prior_text, text)
+            if changes is not None:
+                self.hits += 1
+                return explanation, changes
+        self.misses += 1
+        return None
+
+    def add(self, text: str, context: str, explanation):
+        text = normalize_whitespace(text)
+        if text.count(" ") >= MAX_WORDS:
+            return
+        fingerprint = simhash(text)
+        with self._lock:
+            self._load()
+            entry_id = None
+            if self._conn is not None:
+                try:
+                    cursor = self._conn.execute(
+                        "INSERT INTO near_duplicates (version, fingerprint, context, text, explanation, created_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (self.version, _to_signed(fingerprint), context, text,
+                         json.dumps(explanation, ensure_ascii=False), time.time())
+                    )
+                    entry_id = cursor.lastrowid
+                    self._conn.execute(
+                        "DELETE FROM near_duplicates WHERE id <= ?", (entry_id - self.max_entries,)
+                    )
+                    self._conn.commit()
+                except Exception as e:
+                    logger.error(f"Near-duplicate index: failed to persist entry: {e}")
+            if entry_id is None:
+                entry_id = (next(reversed(self._entries)) + 1) if self._entries else 1
+            self._remember(entry_id, fingerprint, context, text, explanation)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _remember(self, entry_id, fingerprint, context, text, explanation):
+        self._entries[entry_id] = (fingerprint, context, text, explanation)
+        for band, index in zip(_band_values(fingerprint), self._bands):
+            index.setdefault(band, set()).add(entry_id)
+        while len(self._entries) > self.max_entries:
+            old_id, (old_fingerprint, _, _, _) = self._entries.popitem(last=False)
+            for band, index in zip(_band_values(old_fingerprint), self._bands):
+                ids = index.get(band)
+                if ids:
+                    ids.discard(old_id)
+                    if not ids:
+                        del index[band]
+
+    def _load(self):
+        """Open the SQLite table and load recent entries (once, on first use)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS near_duplicates ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, version TEXT NOT NULL, fingerprint INTEGER NOT NULL, "
+                "context TEXT NOT NULL, text TEXT NOT NULL, explanation TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM near_duplicates WHERE version != ?", (self.version,))
+            self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT id, fingerprint, context, text, explanation FROM near_duplicates ORDER BY id DESC LIMIT ?",
+                (self.max_entries,)
+            ).fetchall()
+            for entry_id, fingerprint, context, text, explanation in reversed(rows):
+                self._remember(entry_id, fingerprint & (2 ** BITS - 1), context, text, json.loads(explanation))
+        except Exception as e:
+            logger.error(f"Near-duplicate index: SQLite unavailable, using memory only: {e}")
+            self._conn = None
+
+
+def _band_values(fingerprint: int):
+    mask = (1 << BAND_BITS) - 1
+    return [(fingerprint >> (band * BAND_BITS)) & mask for band in range(BANDS)]
+
+
+def _to_signed(fingerprint: int) -> int:
+    """SQLite integers are signed 64-bit"""
+    return fingerprint - (1 << BITS) if fingerprint >= 1 << (BITS - 1) else fingerprint
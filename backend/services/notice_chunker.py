@@ -0,0 +1,97 @@
+import math
+import re
+
+# Lines that start a new section in gazettes, circulars and legal notices:
+# "1.", "12)", "(a)", "(iv)", "Section 4", "Clause 2", "SCHEDULE", "Annexure-I", ...
+_HEADING = re.compile(
+    r"^\s*(?:\(?\d{1,3}[.)]|\([a-z]{1,4}\)|(?:section|clause|chapter|schedule|annexure|"
+    r"appendix|part|rule|form)\b|[A-Z][A-Z0-9 ,:&()/-]{3,60}$)",
+    re.IGNORECASE
+)
+_SENTENCE_END = re.compile(r"(?<=[.!?।])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count without a tokenizer: ~4 ASCII characters per token;
+    Devanagari and other non-ASCII scripts tokenize far worse (~2 chars/token).
+    """
+    return _tokens_for(len(text), _non_ascii(text))
+
+
+def _non_ascii(text: str) -> int:
+    return sum(1 for c in text if ord(c) > 127)
+
+
+def _tokens_for(length: int, non_ascii: int) -> int:
+    return math.ceil((length - non_ascii) / 4 + non_ascii / 2)
+
+
+def split_into_chunks(text: str, max_tokens: int) -> list:
+    """
+    Split text into chunks of at most ~max_tokens, breaking at section headings
+    and blank lines where possible, then at sentences, and only as a last
+    resort inside a sentence.
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for block in _sections(text):
+        block_tokens = estimate_tokens(block)
+        if block_tokens > max_tokens:
+            pieces = _split_block(block, max_tokens)
+        else:
+            pieces = [block]
+
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _sections(text: str) -> list:
+    """Blocks of consecutive lines; a heading line or blank line starts a new block"""
+    blocks = []
+    lines = []
+    for line in text.splitlines():
+        if not line.strip() or _HEADING.match(line):
+            if lines:
+                blocks.append("\n".join(lines))
+            lines = [line] if line.strip() else []
+        else:
+            lines.append(line)
+    if lines:
+        blocks.append("\n".join(lines))
+    return blocks
+
+
+def _split_block(block: str, max_tokens: int) -> list:
+    """Break an oversized block at sentence ends, hard-splitting run-on sentences"""
+    pieces = []
+    for sentence in _SENTENCE_END.split(block):
+        if estimate_tokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+            continue
+        # Run-on text (OCR tables, lists without punctuation): cut by words,
+        # counting characters as we go rather than re-estimating the piece
+        piece = []
+        length = non_ascii = 0
+        for word in sentence.split():
+            piece.append(word)
+            length += len(word) + (len(piece) > 1)  # joining space
+            non_ascii += _non_ascii(word)
+            if _tokens_for(length, non_ascii) >= max_tokens:
+                pieces.append(" ".join(piece))
+                piece = []
+                length = non_ascii = 0
+        if piece:
+            pieces.append(" ".join(piece))
+    return pieces
@@ -1,14 +1,4 @@
-import json
-import os
-from core.config import DATA_DIR
-
-# Load notice classification rules
-rules_path = os.path.join(DATA_DIR, "notice_rules.json")
-notice_rules = {}
-
-if os.path.exists(rules_path):
-    with open(rules_path, 'r', encoding='utf-8') as f:
-        notice_rules = json.load(f)
+from services.keyword_matcher import notice_rules, scan_notice
 
 def classify_notice(text: str) -> str:
     """
@@ -18,20 +8,9 @@ def classify_notice(text: str) -> str:
     if not notice_rules:
         return "General Government Notice"
     
-    text_lower = text.lower()
-    
-    # Score each category based on keyword matches
-    category_scores = {}
-    
-    for category, data in notice_rules.items():
-        if category == "severity_keywords":
-            continue  # Skip severity keywords
-            
-        keywords = data.get("keywords", [])
-        score = sum(1 for keyword in keywords if keyword in text_lower)
-        
-        if score > 0:
-            category_scores[category] = score
+    # Score each category based on keyword matches (one shared scan)
+    scan = scan_notice(text)
+    category_scores = scan.category_scores
     
     # Return the category with highest score
     if category_scores:
@@ -40,7 +19,7 @@ def classify_notice(text: str) -> str:
         
         # Try to match specific type within category
         for notice_type in types:
-            if any(word in text_lower for word in notice_type.lower().split()):
+            if any(scan.has(word) for word in notice_type.lower().split()):
                 return notice_type
         
         # Return first type if no specific match
@@ -0,0 +1,305 @@
+import asyncio
+import os
+import tempfile
+from services.ocr_service import (
+    extract_text_from_bytes, count_pdf_pages, extract_pdf_pages, enough_text_for_triage
+)
+from services.notice_classifier import classify_notice
+from services.severity_analyzer import analyze_severity
+from services.simplifier import (
+    simplify_notice, stream_simplify_notice, parse_explanation,
+    fallback_explanation, is_fallback_explanation, is_unparsed_explanation, llm_available
+)
+from services import analysis_cache
+from services.scheme_engine import suggest_schemes
+from core.workers import pools, WorkerPoolBusy
+from core.singleflight import SingleFlight, SingleFlightTimeout
+from core.config import OCR_POOL_SIZE, PDF_MAX_PAGES, PDF_PAGES_PER_TASK, SINGLEFLIGHT_TIMEOUT
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+ALLOWED_CONTENT_TYPES = ['image/jpeg', 'image/png', 'image/jpg', 'application/pdf']
+
+# Stage names reported to on_stage callbacks, in pipeline order
+STAGES = ["extracting", "classifying", "analyzing_severity", "simplifying", "matching_schemes"]
+
+# Concurrent uploads of the same file (by content hash) share one pipeline run,
+# and one OCR pass across the plain and streaming endpoints
+_notice_flights = SingleFlight("notice", SINGLEFLIGHT_TIMEOUT)
+_extraction_flights = SingleFlight("extraction", SINGLEFLIGHT_TIMEOUT)
+
+
+def no_text_result() -> dict:
+    """Response returned when OCR finds no usable text"""
+    return {
+        "notice_type": "No_Text_Detected",
+        "severity": "Rejected",
+        "explanation": {
+            "english": "We could not detect any text in this image. It appears to be a picture of an object, scene, or a very blurry document.",
+            "hinglish": "Is tasveer mein koi text nahi mila. Yeh kisi object ya scene ki photo lag rahi hai.",
+            "is_notice": False
+        },
+        "scheme_suggestions": []
+    }
+
+
+def has_enough_text(text: str) -> bool:
+    """More lenient validation - allow shorter text for demo"""
+    return bool(text) and len(text.strip()) >= 5
+
+
+def _with_schemes(cached: dict, text: str) -> dict:
+    """A cached analysis with scheme suggestions ranked against the current catalog (they are never cached)"""
+    result = {k: v for k, v in cached.items() if k != "text"}
+    result["scheme_suggestions"] = suggest_schemes(text, result["notice_type"]) if has_enough_text(text) else []
+    return result
+
+
+async def extract_notice_text(file_bytes: bytes, filename: str) -> str:
+    """OCR/PDF extraction in the process pool"""
+    if filename.lower().endswith('.pdf'):
+        text = await _extract_pdf_text(file_bytes)
+    else:
+        text = await pools.run_ocr(extract_text_from_bytes, file_bytes, filename)
+    logger.info(f"Extracted text length: {len(text)} characters")
+    return text
+
+
+def _report(on_stage, stage: str):
+    if on_stage is not None:
+        on_stage(stage)
+
+
+async def _extract_pdf_text(file_bytes: bytes) -> str:
+    """
+    Extract PDF pages in parallel: page ranges of PDF_PAGES_PER_TASK are spread
+    over the OCR pool one wave (OCR_POOL_SIZE tasks) at a time, so early exit
+    can stop between waves. The PDF is written to a temporary file once and
+    workers are sent its path, not the whole file per task.
+    """
+    pdf_path = await asyncio.to_thread(_spool_pdf, file_bytes)
+    try:
+        return await _extract_pdf_file(pdf_path)
+    finally:
+        os.unlink(pdf_path)
+
+
+async def _extract_pdf_file(pdf_path: str) -> str:
+    page_count = await pools.run_ocr(count_pdf_pages, pdf_path)
+    logger.info(f"PDF has {page_count} pages")
+    if page_count > PDF_MAX_PAGES:
+        logger.info(f"Only extracting the first {PDF_MAX_PAGES} pages")
+        page_count = PDF_MAX_PAGES
+
+    ranges = [
+        (start, min(start + PDF_PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PDF_PAGES_PER_TASK)
+    ]
+    page_texts = []
+    for wave in range(0, len(ranges), OCR_POOL_SIZE):
+        tasks = [
+            asyncio.ensure_future(pools.run_ocr(extract_pdf_pages, pdf_path, start, stop))
+            for start, stop in ranges[wave:wave + OCR_POOL_SIZE]
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # One range failed (e.g. WorkerPoolBusy) or we were cancelled:
+            # don't leave the rest of the wave queued in the pool
+            for task in tasks:
+                task.cancel()
+            raise
+        for pages in results:
+            page_texts.extend(pages)
+        if enough_text_for_triage(sum(len(text) for text in page_texts)):
+            logger.info(f"Stopping PDF extraction early after {len(page_texts)} pages")
+            break
+
+    return "\n".join(page_texts).strip()
+
+
+def _spool_pdf(file_bytes: bytes) -> str:
+    with tempfile.NamedTemporaryFile(prefix="notice-", suffix=".pdf", delete=False) as f:
+        f.write(file_bytes)
+    return f.name
+
+
+async def analyze_notice_text(text: str, on_stage=None) -> dict:
+    """
+    Classify, score severity, simplify and suggest schemes for extracted text.
+    Rule-based steps run inline (microseconds); the LLM call awaits the shared async client.
+    """
+    key = analysis_cache.text_key(text)
+    cached = analysis_cache.get_by_text(key)
+    if cached is not None:
+        logger.info("Analysis cache hit (text)")
+        return _with_schemes(cached, text)
+
+    _report(on_stage, "classifying")
+    notice_type = classify_notice(text)
+    _report(on_stage, "analyzing_severity")
+    severity = analyze_severity(text)
+    _report(on_stage, "simplifying")
+    explanation = analysis_cache.reuse_near_duplicate(text, notice_type, severity)
+    if explanation is None:
+        explanation = await simplify_notice(text, notice_type, severity)
+        if not is_fallback_explanation(explanation) and not is_unparsed_explanation(explanation):
+            analysis_cache.remember_explanation(text, notice_type, severity, explanation)
+    _report(on_stage, "matching_schemes")
+    schemes = suggest_schemes(text, notice_type)
+
+    logger.info(f"Successfully processed notice: {notice_type}")
+
+    result = {
+        "notice_type": notice_type,
+        "severity": severity,
+        "explanation": explanation,
+        "scheme_suggestions": schemes
+    }
+    # Never cache the rule-based fallback - the next request should retry the LLM
+    if not is_fallback_explanation(explanation):
+        analysis_cache.set_by_text(key, result)
+    return result
+
+
+async def process_notice(file_bytes: bytes, filename: str, on_stage=None) -> dict:
+    """
+    Full OCR → classify → severity → simplify → schemes pipeline.
+    on_stage, if given, is called with each stage name from STAGES as it starts.
+    """
+    key = analysis_cache.file_key(file_bytes)
+    cached = analysis_cache.get_by_file(key)
+    if cached is not None:
+        logger.info(f"Analysis cache hit (file): {filename}")
+        return _with_schemes(cached, cached.get("text", ""))
+
+    # Only the first of several identical concurrent uploads reports stages
+    return await _notice_flights.do(key, _process_uncached, key, file_bytes, filename, on_stage)
+
+
+async def _process_uncached(key: str, file_bytes: bytes, filename: str, on_stage=None) -> dict:
+    _report(on_stage, "extracting")
+    text = await _extraction_flights.do(key, extract_notice_text, file_bytes, filename)
+
+    if not has_enough_text(text):
+        logger.warning(f"Insufficient text extracted: '{text[:100] if text else ''}'")
+        result = no_text_result()
+        analysis_cache.set_by_file(key, result, text)
+        return result
+
+    logger.debug(f"Extracted text preview: {text[:100]}...")
+
+    result = await analyze_notice_text(text, on_stage)
+    if not is_fallback_explanation(result["explanation"]):
+        analysis_cache.set_by_file(key, result, text)
+    return result
+
+
+async def process_notice_when_ready(file_bytes: bytes, filename: str, on_stage=None) -> dict:
+    """
+    process_notice for background callers (jobs, batches): instead of failing
+    when the OCR queue is full (or an identical upload is taking too long),
+    wait and try again.
+    """
+    while True:
+        try:
+            return await process_notice(file_bytes, filename, on_stage)
+        except (WorkerPoolBusy, SingleFlightTimeout):
+            await asyncio.sleep(1)
+
+
+def _cached_events(result: dict):
+    """Replay a cached result as the same events stream_notice emits"""
+    yield "analysis", {
+        "notice_type": result["notice_type"],
+        "severity": result["severity"],
+        "scheme_suggestions": result["scheme_suggestions"]
+    }
+    yield "explanation", result["explanation"]
+    yield "done", result
+
+
+async def stream_notice(file_bytes: bytes, filename: str):
+    """
+    Progressive version of process_notice, as an async generator of (event, data).
+    Rule-based results are sent as soon as OCR finishes, then the LLM output:
+      status             {"stage": ...} while waiting on OCR
+      analysis           notice_type, severity, scheme_suggestions
+      explanation_delta  {"text": chunk} as the LLM generates
+      explanation        the final parsed explanation
+      done               the full result (same shape as process_notice)
+    """
+    file_hash = analysis_cache.file_key(file_bytes)
+    cached = analysis_cache.get_by_file(file_hash)
+    if cached is not None:
+        logger.info(f"Analysis cache hit (file): {filename}")
+        for event in _cached_events(_with_schemes(cached, cached.get("text", ""))):
+            yield event
+        return
+
+    yield "status", {"stage": "extracting"}
+    text = await _extraction_flights.do(file_hash, extract_notice_text, file_bytes, filename)
+
+    if not has_enough_text(text):
+        logger.warning(f"Insufficient text extracted: '{text[:100] if text else ''}'")
+        result = no_text_result()
+        analysis_cache.set_by_file(file_hash, result, text)
+        for event in _cached_events(result):
+            yield event
+        return
+
+    text_hash = analysis_cache.text_key(text)
+    cached = analysis_cache.get_by_text(text_hash)
+    if cached is not None:
+        logger.info("Analysis cache hit (text)")
+        for event in _cached_events(_with_schemes(cached, text)):
+            yield event
+        return
+
+    notice_type = classify_notice(text)
+    severity = analyze_severity(text)
+    schemes = suggest_schemes(text, notice_type)
+    yield "analysis", {
+        "notice_type": notice_type,
+        "severity": severity,
+        "scheme_suggestions": schemes
+    }
+
+    explanation = analysis_cache.reuse_near_duplicate(text, notice_type, severity)
+    if explanation is None and llm_available():
+        chunks = []
+        try:
+            async for chunk in stream_simplify_notice(text, notice_type, severity):
+                chunks.append(chunk)
+                yield "explanation_delta", {"text": chunk}
+            explanation = parse_explanation("".join(chunks))
+            # Only reuse explanations the LLM returned as JSON
+            if not is_fallback_explanation(explanation) and not is_unparsed_explanation(explanation):
+                analysis_cache.remember_explanation(text, notice_type, severity, explanation)
+        except Exception as e:
+            logger.error(f"LLM streaming failed, using fallback: {str(e)}")
+    if explanation is None:
+        explanation = fallback_explanation(text, notice_type, severity)
+    yield "explanation", explanation
+
+    logger.info(f"Successfully processed notice: {notice_type}")
+
+    result = {
+        "notice_type": notice_type,
+        "severity": severity,
+        "explanation": explanation,
+        "scheme_suggestions": schemes
+    }
+    if not is_fallback_explanation(explanation):
+        analysis_cache.set_by_text(text_hash, result)
+        analysis_cache.set_by_file(file_hash, result, text)
+    yield "done", result
+
+
+def coalescing_stats():
+    """In-flight and coalesced counts for the pipeline's single-flight groups"""
+    return {
+        "notice": _notice_flights.stats(),
+        "extraction": _extraction_flights.stats()
+    }
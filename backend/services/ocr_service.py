@@ -1,25 +1,33 @@
 import pytesseract
 from PIL import Image
 import io
+import cv2
+import numpy as np
 import PyPDF2
+from core.config import (
+    OCR_TARGET_DPI, OCR_MIN_CONFIDENCE, OCR_MAX_RETRY_REGIONS,
+    PDF_MAX_PAGES, PDF_MIN_PAGE_CHARS, PDF_EARLY_EXIT_CHARS
+)
 from core.logger import get_logger
 
 logger = get_logger(__name__)
 
-def extract_text(file) -> str:
+A4_LONG_SIDE_INCHES = 11.69
+
+def extract_text_from_bytes(file_bytes: bytes, filename: str) -> str:
     """
-    Extract text from uploaded file (image or PDF).
-    Supports: JPG, PNG, PDF
+    Extract text from raw file bytes (image or PDF).
+    Module-level and picklable so it can run in the OCR process pool.
     """
-    filename = file.filename.lower()
+    filename = filename.lower()
     
     try:
         logger.info(f"Extracting text from: {filename}")
         
         if filename.endswith('.pdf'):
-            text = _extract_from_pdf(file)
+            text = _extract_from_pdf(file_bytes)
         else:
-            text = _extract_from_image(file)
+            text = _extract_from_image(file_bytes)
         
         logger.info(f"Extracted {len(text)} characters from {filename}")
         return text
@@ -29,46 +37,18 @@ def extract_text(file) -> str:
         raise Exception(f"Failed to extract text: {str(e)}")
 
 
-def _extract_from_image(file) -> str:
-    """Extract text from image using Tesseract OCR"""
+def _extract_from_image(file_bytes: bytes) -> str:
+    """
+    Extract text from image using a single adaptive Tesseract pass.
+    The image is rescaled to OCR_TARGET_DPI and deskewed, the page segmentation
+    mode is picked from the detected text layout, and only blocks that come back
+    with low confidence are re-read (as cropped, binarized regions).
+    """
     try:
-        # Read file bytes
-        file_bytes = file.file.read()
-        
-        # Reset file pointer for potential re-reads
-        file.file.seek(0)
-        
         # Open image
         image = Image.open(io.BytesIO(file_bytes))
         
-        # Convert to RGB if necessary (some images might be RGBA or other formats)
-        if image.mode not in ('L', 'RGB'):
-            image = image.convert('RGB')
-        
-        # Extract text using Tesseract (Attempt 1: Default)
-        text = pytesseract.image_to_string(image, lang='eng')
-        
-        # Attempt 2: PSM 6 (Assume a single uniform block of text)
-        if not text.strip():
-            logger.info("Default OCR yielded no text, retrying with PSM 6...")
-            text = pytesseract.image_to_string(image, lang='eng', config='--psm 6')
-
-        # Attempt 3: Pre-processing (Grayscale + Thresholding)
-        if not text.strip():
-            logger.info("OCR still empty, applying image preprocessing...")
-            try:
-                # Convert to grayscale
-                gray = image.convert('L')
-                # Binarize (Thresholding)
-                binary = gray.point(lambda p: 255 if p > 128 else 0)
-                text = pytesseract.image_to_string(binary, lang='eng')
-            except Exception as preprocess_error:
-                logger.warning(f"Preprocessing failed: {preprocess_error}")
-
-        extracted_text = text.strip()
-        logger.info(f"OCR extracted {len(extracted_text)} characters from image (Size: {image.size}, Mode: {image.mode})")
-        
-        return extracted_text
+        return _ocr_image(image)
         
     except pytesseract.TesseractNotFoundError:
         logger.error("Tesseract not found. Please install tesseract-ocr.")
@@ -81,27 +61,256 @@ def _extract_from_image(file) -> str:
         raise
 
 
-def _extract_from_pdf(file) -> str:
-    """Extract text from PDF document"""
-    try:
-        # Read file bytes
-        file_bytes = file.file.read()
+def _ocr_image(image) -> str:
+    """Adaptive single-pass OCR of a PIL image (see _extract_from_image)"""
+    # Convert to RGB if necessary (some images might be RGBA or other formats)
+    if image.mode not in ('L', 'RGB'):
+        image = image.convert('RGB')
+    
+    gray = _prepare_image(image)
+    regions = _detect_text_regions(gray)
+    psm = _choose_psm(regions, gray.shape)
+    
+    data = pytesseract.image_to_data(
+        gray, lang='eng', config=f'--psm {psm}', output_type=pytesseract.Output.DICT
+    )
+    blocks = _group_blocks(data)
+    
+    if not blocks:
+        # Nothing recognised in the full pass: read the detected regions one by one instead
+        blocks = [{"text": "", "conf": 0.0, "box": box} for box in regions]
+    
+    retried = _retry_low_confidence(gray, blocks)
+    
+    extracted_text = "\n\n".join(block["text"] for block in blocks if block["text"]).strip()
+    logger.info(
+        f"OCR extracted {len(extracted_text)} characters from image "
+        f"(Size: {image.size}, Mode: {image.mode}, PSM: {psm}, "
+        f"Regions: {len(regions)}, Retried: {retried})"
+    )
+    
+    return extracted_text
+
+
+def _prepare_image(image) -> np.ndarray:
+    """Grayscale, rescale to the target DPI and deskew"""
+    gray = np.array(image.convert('L'))
+    
+    scale = _target_scale(gray.shape, image.info.get('dpi'))
+    if abs(scale - 1.0) > 0.1:
+        interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation)
+    
+    return _deskew(gray)
+
+
+def _target_scale(shape, dpi) -> float:
+    """
+    Scale factor that brings the image to OCR_TARGET_DPI. Embedded DPI is only
+    trusted when it implies a plausible page size (phone photos usually claim
+    72 DPI); otherwise the image is assumed to be an A4 page.
+    """
+    long_side = max(shape)
+    if dpi and dpi[0] and 3 <= long_side / float(dpi[0]) <= 20:
+        scale = OCR_TARGET_DPI / float(dpi[0])
+    else:
+        scale = (A4_LONG_SIDE_INCHES * OCR_TARGET_DPI) / long_side
+    # Upscaling past 2x only adds interpolation noise
+    return min(max(scale, 0.25), 2.0)
+
+
+def _binarize(gray: np.ndarray) -> np.ndarray:
+    """Inverted binary (text = 255), tolerant of uneven phone-camera lighting"""
+    return cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 31, 15
+    )
+
+
+def _deskew(gray: np.ndarray) -> np.ndarray:
+    """Rotate so text lines are horizontal, using the median angle of line-shaped contours"""
+    h, w = gray.shape
+    binary = _binarize(gray)
+    
+    # Smear words horizontally into line blobs
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(15, w // 60), 3))
+    lines = cv2.dilate(binary, kernel)
+    contours, _ = cv2.findContours(lines, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    angles = []
+    for contour in contours:
+        _, (rect_w, rect_h), angle = cv2.minAreaRect(contour)
+        if rect_w < rect_h:
+            rect_w, rect_h = rect_h, rect_w
+            angle -= 90
+        if rect_w < w * 0.1 or rect_w < 4 * rect_h:
+            continue  # not a text line
+        while angle <= -45:
+            angle += 90
+        while angle > 45:
+            angle -= 90
+        angles.append(angle)
+    
+    if len(angles) < 3:
+        return gray
+    
+    angle = float(np.median(angles))
+    # Tiny skew doesn't hurt Tesseract; large "skew" is usually a misdetection
+    if abs(angle) < 0.5 or abs(angle) > 15:
+        return gray
+    
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    return cv2.warpAffine(
+        gray, matrix, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE
+    )
+
+
+def _detect_text_regions(gray: np.ndarray) -> list:
+    """Bounding boxes (x, y, w, h) of text blocks, found by dilating the binary image"""
+    h, w = gray.shape
+    binary = _binarize(gray)
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(20, w // 40), max(10, h // 80)))
+    blocks = cv2.dilate(binary, kernel)
+    contours, _ = cv2.findContours(blocks, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    min_area = 0.0005 * w * h
+    regions = [cv2.boundingRect(contour) for contour in contours]
+    regions = [box for box in regions if box[2] * box[3] >= min_area]
+    # Reading order: top to bottom, then left to right
+    return sorted(regions, key=lambda box: (box[1], box[0]))
+
+
+def _choose_psm(regions: list, shape) -> int:
+    """Pick the Tesseract page segmentation mode from the text layout"""
+    if not regions:
+        return 11  # sparse text: find as much text as possible in no particular order
+    
+    h, w = shape
+    areas = [bw * bh for _, _, bw, bh in regions]
+    text_area = sum(areas)
+    
+    if max(areas) >= 0.6 * text_area:
+        return 6  # one dominant block of uniform text
+    
+    # Two tall regions side by side means a multi-column page
+    tall = [box for box in regions if box[3] > 0.15 * h]
+    for i, (x1, y1, w1, h1) in enumerate(tall):
+        for x2, y2, w2, h2 in tall[i + 1:]:
+            overlaps_vertically = y1 < y2 + h2 and y2 < y1 + h1
+            separate_horizontally = x1 + w1 <= x2 or x2 + w2 <= x1
+            if overlaps_vertically and separate_horizontally:
+                return 3  # fully automatic layout analysis
+    
+    if text_area < 0.15 * w * h:
+        return 11  # scattered text (receipts, challans, photos of boards)
+    return 4  # single column of variable-size text
+
+
+def _group_blocks(data: dict) -> list:
+    """Group image_to_data words into Tesseract blocks with text, mean confidence and bounding box"""
+    blocks = {}
+    for i, word in enumerate(data["text"]):
+        word = word.strip()
+        conf = float(data["conf"][i])
+        if not word or conf < 0:
+            continue
+        block = blocks.setdefault(data["block_num"][i], {"lines": {}, "confs": [], "boxes": []})
+        block["lines"].setdefault((data["par_num"][i], data["line_num"][i]), []).append(word)
+        block["confs"].append(conf)
+        block["boxes"].append((data["left"][i], data["top"][i], data["width"][i], data["height"][i]))
+    
+    grouped = []
+    for block_num in sorted(blocks):
+        block = blocks[block_num]
+        x0 = min(x for x, _, _, _ in block["boxes"])
+        y0 = min(y for _, y, _, _ in block["boxes"])
+        x1 = max(x + bw for x, _, bw, _ in block["boxes"])
+        y1 = max(y + bh for _, y, _, bh in block["boxes"])
+        grouped.append({
+            "text": "\n".join(" ".join(words) for _, words in sorted(block["lines"].items())),
+            "conf": sum(block["confs"]) / len(block["confs"]),
+            "box": (x0, y0, x1 - x0, y1 - y0)
+        })
+    return grouped
+
+
+def _retry_low_confidence(gray: np.ndarray, blocks: list) -> int:
+    """
+    Re-read low-confidence blocks from a padded, Otsu-binarized crop and keep
+    whichever reading is more confident. Updates blocks in place and returns
+    the number of regions retried.
+    """
+    h, w = gray.shape
+    retried = 0
+    
+    for block in sorted(blocks, key=lambda b: b["conf"]):
+        if block["conf"] >= OCR_MIN_CONFIDENCE or retried >= OCR_MAX_RETRY_REGIONS:
+            break
+        
+        x, y, bw, bh = block["box"]
+        pad = 10
+        crop = gray[max(0, y - pad):min(h, y + bh + pad), max(0, x - pad):min(w, x + bw + pad)]
+        if crop.size == 0:
+            continue
+        _, crop = cv2.threshold(crop, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
         
-        # Reset file pointer
-        file.file.seek(0)
+        data = pytesseract.image_to_data(
+            crop, lang='eng', config='--psm 6', output_type=pytesseract.Output.DICT
+        )
+        retried += 1
         
+        retry_blocks = _group_blocks(data)
+        if not retry_blocks:
+            continue
+        retry_conf = sum(b["conf"] for b in retry_blocks) / len(retry_blocks)
+        if retry_conf > block["conf"]:
+            block["text"] = "\n".join(b["text"] for b in retry_blocks)
+            block["conf"] = retry_conf
+    
+    return retried
+
+
+def count_pdf_pages(pdf_path: str) -> int:
+    """Number of pages in a PDF file (cheap; used to plan parallel extraction)"""
+    return len(PyPDF2.PdfReader(pdf_path).pages)
+
+
+def extract_pdf_pages(pdf_path: str, start: int, stop: int) -> list:
+    """
+    Text of PDF pages [start, stop), one string per page.
+    Module-level and picklable so page ranges can be spread across the OCR
+    process pool; workers read the PDF from disk rather than each being
+    sent the whole file.
+    """
+    pdf_reader = PyPDF2.PdfReader(pdf_path)
+    stop = min(stop, len(pdf_reader.pages))
+    return [_extract_pdf_page(pdf_reader.pages[i], i) for i in range(start, stop)]
+
+
+def enough_text_for_triage(char_count: int) -> bool:
+    """True once PDF extraction may stop early (PDF_EARLY_EXIT_CHARS, 0 = never)"""
+    return PDF_EARLY_EXIT_CHARS > 0 and char_count >= PDF_EARLY_EXIT_CHARS
+
+
+def _extract_from_pdf(file_bytes: bytes) -> str:
+    """Extract text from PDF document, page by page in this process"""
+    try:
         # Create PDF reader
         pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
         
         logger.info(f"PDF has {len(pdf_reader.pages)} pages")
         
-        text = ""
-        for i, page in enumerate(pdf_reader.pages):
-            page_text = page.extract_text()
-            text += page_text + "\n"
-            logger.debug(f"Page {i+1}: extracted {len(page_text)} characters")
+        page_count = min(len(pdf_reader.pages), PDF_MAX_PAGES)
+        page_texts = []
+        char_count = 0
+        for i in range(page_count):
+            page_text = _extract_pdf_page(pdf_reader.pages[i], i)
+            page_texts.append(page_text)
+            char_count += len(page_text)
+            if enough_text_for_triage(char_count):
+                logger.info(f"Stopping PDF extraction early after {i + 1} pages")
+                break
         
-        extracted_text = text.strip()
+        extracted_text = "\n".join(page_texts).strip()
         logger.info(f"PDF extraction: {len(extracted_text)} total characters")
         
         return extracted_text
@@ -110,3 +319,62 @@ def _extract_from_pdf(file) -> str:
         logger.error(f"PDF extraction failed: {str(e)}")
         raise
 
+
+def _extract_pdf_page(page, index: int) -> str:
+    """Text layer of one page; pages without one (scans) go through image OCR"""
+    page_text = page.extract_text() or ""
+    
+    if len(page_text.strip()) < PDF_MIN_PAGE_CHARS:
+        images = _page_images(page)
+        if images:
+            logger.info(f"Page {index+1}: no text layer, running OCR on {len(images)} embedded image(s)")
+            try:
+                ocr_text = "\n".join(_ocr_image(image) for image in images).strip()
+                if len(ocr_text) > len(page_text.strip()):
+                    page_text = ocr_text
+            except Exception as e:
+                # Keep whatever the other pages give us rather than failing the whole PDF
+                logger.warning(f"Page {index+1}: OCR failed: {str(e)}")
+    
+    logger.debug(f"Page {index+1}: extracted {len(page_text)} characters")
+    return page_text
+
+
+def _page_images(page) -> list:
+    """
+    PIL images embedded in a PDF page. Handles JPEG/JPEG2000 streams and
+    raw (Flate/LZW) gray, RGB and 1-bit pixels, which covers what scanners produce.
+    """
+    try:
+        x_objects = page["/Resources"]["/XObject"].get_object()
+    except (KeyError, TypeError):
+        return []
+    
+    images = []
+    for name in x_objects:
+        obj = x_objects[name].get_object()
+        if obj.get("/Subtype") != "/Image":
+            continue
+        try:
+            filters = obj.get("/Filter")
+            if not isinstance(filters, list):
+                filters = [filters]
+            data = obj.get_data()
+            if filters[-1] in ("/DCTDecode", "/JPXDecode"):
+                images.append(Image.open(io.BytesIO(data)))
+                continue
+            
+            size = (obj["/Width"], obj["/Height"])
+            color_space = obj.get("/ColorSpace")
+            if obj.get("/BitsPerComponent") == 1:
+                mode = "1"
+            elif color_space == "/DeviceRGB":
+                mode = "RGB"
+            elif color_space == "/DeviceGray":
+                mode = "L"
+            else:
+                continue  # indexed/CMYK/CCITT scans are rare; skip rather than misread
+            images.append(Image.frombytes(mode, size, data))
+        except Exception as e:
+            logger.warning(f"Could not decode embedded image {name}: {str(e)}")
+    return images
@@ -0,0 +1,208 @@
+import asyncio
+from bson import ObjectId
+from core.config import (
+    PRETRANSLATE_LANGUAGES, PRETRANSLATE_MAX_QUEUED, PRETRANSLATE_MIN_HEADROOM, PRETRANSLATE_IDLE_POLL
+)
+from core.database import db
+from core.logger import get_logger
+from core.workers import pools
+from services.job_queue import job_queue
+from services.llm_scheduler import llm_scheduler
+from services.notice_pipeline import coalescing_stats as notice_coalescing_stats
+from services.simplifier import coalescing_stats as llm_coalescing_stats
+from services.translator import translate_segments, TRANSLATE_PROVIDER
+
+logger = get_logger(__name__)
+
+
+class PreTranslator:
+    """
+    Background worker translating the explanation of each saved document into
+    PRETRANSLATE_LANGUAGES and storing the result under the document's
+    "translations" field, so viewing it in those languages needs no LLM call.
+    It only uses idle capacity: before every language it waits until no user
+    work (notice jobs, OCR, LLM calls, rate-limited calls) is pending.
+    """
+
+    def __init__(self, languages: list = PRETRANSLATE_LANGUAGES):
+        self.languages = languages
+        self.translated = 0
+        self.failed = 0
+        self.dropped = 0
+        self.skipped = 0
+        self.paused = 0
+        self._queue = None
+        self._worker = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.languages)
+
+    def start(self):
+        if not self.enabled:
+            return
+        self._queue = asyncio.Queue(maxsize=PRETRANSLATE_MAX_QUEUED)
+        self._worker = asyncio.create_task(self._run())
+        logger.info(f"Pre-translation started for {', '.join(self.languages)}")
+
+    async def stop(self):
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+
+    def submit(self, doc_id: str):
+        """Queue a saved document; dropped (and picked up on next start) when the queue is full"""
+        if self._queue is None:
+            return
+        try:
+            self._queue.put_nowait(doc_id)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "languages": self.languages,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "translated": self.translated,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "skipped": self.skipped,
+            "paused": self.paused
+        }
+
+    async def _run(self):
+        await self._requeue_missing()
+        while True:
+            doc_id = await self._queue.get()
+            try:
+                await self._translate_document(doc_id)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Pre-translation of document {doc_id} failed: {str(e)}")
+
+    async def _requeue_missing(self):
+        """Queue saved documents (newest first) still missing a language, e.g. after a restart"""
+        database = db.get_db()
+        if database is None:
+            return
+        missing = {"$and": [
+            {"$or": [{f"translations.{language}": {"$exists": False}} for language in self.languages]},
+            # Only documents with an English explanation to translate (see _english)
+            {"$or": [{"explanation.english": {"$exists": True}}, {"explanation": {"$type": "string"}}]}
+        ]}
+        try:
+            cursor = database.documents.find(missing, {"_id": 1}).sort("created_at", -1).limit(PRETRANSLATE_MAX_QUEUED)
+            async for doc in cursor:
+                self.submit(str(doc["_id"]))
+        except Exception as e:
+            logger.error(f"Pre-translation: could not list untranslated documents: {e}")
+            return
+        if self._queue.qsize():
+            logger.info(f"Pre-translation: {self._queue.qsize()} saved documents queued")
+
+    async def _translate_document(self, doc_id: str):
+        database = db.get_db()
+        if database is None:
+            return
+        doc = await database.documents.find_one({"_id": ObjectId(doc_id)}, {"explanation": 1, "translations": 1})
+        if doc is None:
+            return  # deleted meanwhile
+
+        english = _english(doc.get("explanation"))
+        segments = _segments(english)
+        if not segments:
+            self.skipped += 1
+            return
+
+        done = doc.get("translations") or {}
+        for language in self.languages:
+            if language in done:
+                continue
+            await self._wait_until_idle()
+            translations = await translate_segments(segments, [language])
+            translated = _rebuild(english, iter(translations[language]))
+            await database.documents.update_one(
+                {"_id": doc["_id"]}, {"$set": {f"translations.{language}": translated}}
+            )
+            self.translated += 1
+
+    async def _wait_until_idle(self):
+        reason = _busy()
+        if reason:
+            self.paused += 1
+            logger.debug(f"Pre-translation paused: {reason}")
+        while reason:
+            await asyncio.sleep(PRETRANSLATE_IDLE_POLL)
+            reason = _busy()
+
+
+def _busy():
+    """Why pre-translation should wait right now, or None when the service is idle"""
+    if job_queue.stats()["queued"]:
+        return "notice jobs queued"
+    if pools.ocr_pending:
+        return "OCR running"
+    if notice_coalescing_stats()["notice"]["in_flight"] or llm_coalescing_stats()["in_flight"]:
+        return "notices being analyzed"
+    if llm_scheduler.pending():
+        return "LLM calls waiting for rate limits"
+    if llm_scheduler.headroom(TRANSLATE_PROVIDER) < PRETRANSLATE_MIN_HEADROOM:
+        return "LLM rate limit mostly used"
+    return None
+
+
+def _english(explanation):
+    """
+    The english part of an explanation (older documents may store a plain
+    string), or None if it has none: the other fields (hinglish, ...) are
+    already localized and must not be translated.
+    """
+    if isinstance(explanation, dict):
+        return explanation.get("english")
+    return explanation
+
+
+def _segments(english) -> list:
+    """
+    The texts POST /translate is sent for this explanation: one per field, a
+    list field's items joined by line breaks (as the results page sends them),
+    so pre-translating fills the cache entries its requests look up. Fields
+    that are neither text nor a list of text are not translated.
+    """
+    if isinstance(english, dict):
+        return [text for text in map(_field_text, english.values()) if text is not None]
+    return [english] if isinstance(english, str) else []
+
+
+def _field_text(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return "\n".join(value)
+    return None
+
+
+def _rebuild(english, translated):
+    """english with every _segments text replaced by the next translation"""
+    if isinstance(english, str):
+        return next(translated)
+    if not isinstance(english, dict):
+        return english
+    rebuilt = {}
+    for key, value in english.items():
+        if _field_text(value) is None:
+            rebuilt[key] = value
+        elif isinstance(value, str):
+            rebuilt[key] = next(translated)
+        else:
+            # Split back into items, unless the translation merged or split lines
+            text = next(translated)
+            lines = text.split("\n")
+            rebuilt[key] = lines if len(lines) == len(value) else [text]
+    return rebuilt
+
+
+pretranslator = PreTranslator()
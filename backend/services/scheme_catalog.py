@@ -0,0 +1,46 @@
+import time
+from services.scheme_index import SchemeIndex
+from services.scheme_ranker import SchemeRanker
+from services.scheme_search import SchemeSearchIndex
+from services.catalog_response import CatalogResponses
+
+
+class CatalogSnapshot:
+    """
+    One version of the scheme catalog together with everything derived from
+    it: the eligibility index, the suggestion ranker, the search index and
+    the pre-serialized responses. Built completely before it is published
+    and never modified afterwards, so a reader holding a snapshot always sees
+    a consistent catalog without locking.
+    """
+
+    __slots__ = ("version", "schemes", "index", "ranker", "search_index", "responses", "loaded_at")
+
+    def __init__(self, version: int, schemes: tuple, index: SchemeIndex, ranker: SchemeRanker,
+                 search_index: SchemeSearchIndex, responses: CatalogResponses):
+        self.version = version
+        self.schemes = schemes
+        self.index = index
+        self.ranker = ranker
+        self.search_index = search_index
+        self.responses = responses
+        self.loaded_at = time.time()
+
+    @classmethod
+    def empty(cls) -> "CatalogSnapshot":
+        return cls(0, (), SchemeIndex([]), SchemeRanker([]), SchemeSearchIndex(), CatalogResponses(()))
+
+    def successor(self, schemes: list):
+        """
+        The next version for `schemes`. The search index is copied from this
+        snapshot and updated incrementally; this snapshot is left untouched.
+        Returns (snapshot, search index changes).
+        """
+        schemes = tuple(schemes)
+        search_index = self.search_index.copy()
+        changes = search_index.update(schemes)
+        snapshot = CatalogSnapshot(
+            self.version + 1, schemes, SchemeIndex(schemes), SchemeRanker(schemes),
+            search_index, CatalogResponses(schemes)
+        )
+        return snapshot, changes
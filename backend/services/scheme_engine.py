@@ -1,70 +1,62 @@
+import asyncio
 import json
 import os
-import requests
-from core.config import DATA_DIR
+import threading
+import time
+from core.config import DATA_DIR, DATA_GOV_IN_API_KEY, SCHEMES_REFRESH_INTERVAL
 from core.logger import get_logger
+from core.singleflight import SingleFlight
+from services.scheme_fetcher import fetch_resources, SCHEME_RESOURCES
+from services.scheme_catalog import CatalogSnapshot
 
 logger = get_logger(__name__)
 
-# data.gov.in API Configuration
-DATA_GOV_IN_API_BASE = "https://api.data.gov.in/resource"
-DATA_GOV_IN_API_KEY = os.getenv("DATA_GOV_IN_API_KEY", "")
-
-# Real data.gov.in resource IDs for government schemes
-SCHEME_RESOURCES = {
-    # Insurance & Protection Schemes
-    "pmfby": "102819a6-2e35-4f2a-9281-1a23c4d35918",  # PM Fasal Bima Yojana (Crop Insurance)
-    "pmjjby_pmsby_coverage": "584e6cc5-6448-4bdd-9b35-944ccc8b4924",  # PMJJBY & PMSBY Coverage
-    "pmjjby_pmsby_enrollment": "0192c599-8129-41d0-a538-6b61af0766be",  # PMJJBY & PMSBY Enrollment
-    
-    # Fisheries & Agriculture
-    "matsya_sampada": "bf697329-f58d-4007-a927-3fd504a0458a",  # PM Matsya Sampada Yojana
-    
-    # Social Assistance & Pension
-    "nsap_goa": "6d8e94ea-7a3b-4fdc-bc4e-1eb1a0cf8f9b",  # National Social Assistance Programme (NSAP) Goa
-    
-    # Note: Add more resource IDs here as you discover them on data.gov.in
-    # You can search at: https://data.gov.in/search
-    # Common schemes to look for:
-    # - PM Awas Yojana (PMAY) housing data
-    # - PM Ujjwala Yojana LPG connections
-    # - Ayushman Bharat beneficiaries
-    # - PM Kisan Samman Nidhi farmer data
-}
-
 # Local cache file
 SCHEMES_CACHE_FILE = os.path.join(DATA_DIR, "schemes_cache.json")
 
 class SchemeEngine:
     """
     Government schemes management system.
-    Fetches real-time data from data.gov.in API with fallback to cache.
+    Serves the cached catalog immediately; data.gov.in is fetched in the
+    background (see SchemeRefresher) and the current catalog stays in use
+    until a refresh completes.
+
+    The catalog and its indexes live in one immutable CatalogSnapshot. A
+    reload builds the next snapshot off to the side and publishes it with a
+    single reference assignment; every read takes self.snapshot once and
+    works on that, so it never sees a half-loaded catalog and never locks.
     """
     
     def __init__(self):
-        self.schemes = []
+        self.snapshot = CatalogSnapshot.empty()
+        self._publish_lock = threading.Lock()  # one snapshot build at a time (writers only)
         self.api_data_available = False
+        self.api_records = {}
+        self.last_refresh = None
         self._load_cache()
-        
-        # Try to fetch from API if key exists
-        if DATA_GOV_IN_API_KEY:
-            logger.info("API key found, attempting to fetch from data.gov.in...")
-            self._fetch_from_api()
     
     def _load_cache(self):
         """Load schemes from cache file"""
         if os.path.exists(SCHEMES_CACHE_FILE):
             try:
                 with open(SCHEMES_CACHE_FILE, 'r', encoding='utf-8') as f:
-                    self.schemes = json.load(f)
-                logger.info(f"Loaded {len(self.schemes)} schemes from cache")
+                    schemes = json.load(f)
+                self._set_schemes(schemes)
+                logger.info(f"Loaded {len(schemes)} schemes from cache")
                 # Reload triggered for new schemes
             except Exception as e:
+                # Keep serving the catalog already loaded, if any
                 logger.error(f"Error loading cache: {e}")
-                self.schemes = []
         else:
             logger.warning("Cache file not found")
-            self.schemes = []
+
+    def _set_schemes(self, schemes):
+        """Build the next catalog snapshot and publish it (readers switch over atomically)"""
+        with self._publish_lock:
+            snapshot, changes = self.snapshot.successor(schemes)
+            self.snapshot = snapshot
+        logger.info(f"Published scheme catalog v{snapshot.version}: {len(snapshot.schemes)} schemes; search index "
+                    f"{changes['added']} added, {changes['removed']} removed, {changes['changed']} changed")
     
     def _save_cache(self, schemes):
         """Save fetched schemes to cache"""
@@ -75,148 +67,162 @@ class SchemeEngine:
         except Exception as e:
             logger.error(f"Error saving cache: {e}")
     
-    def _fetch_from_api(self):
+    async def _fetch_from_api(self):
         """
-        Fetch schemes from data.gov.in API using real resource IDs.
-        Combines data from multiple APIs into unified scheme format.
+        Fetch schemes from data.gov.in API using real resource IDs,
+        all resources concurrently with retries (see scheme_fetcher).
         """
         if not DATA_GOV_IN_API_KEY:
             logger.info("No API key configured")
             return
-        
-        api_schemes = []
-        successful_fetches = 0
-        
-        for scheme_name, resource_id in SCHEME_RESOURCES.items():
-            try:
-                logger.info(f"Fetching {scheme_name} from data.gov.in...")
-                
-                # data.gov.in requires API key in query params
-                params = {
-                    'api-key': DATA_GOV_IN_API_KEY,
-                    'format': 'json',
-                    'limit': 10
-                }
-                
-                headers = {
-                    'User-Agent': 'CivicSenseAI/1.0'
-                }
-                
-                url = f"{DATA_GOV_IN_API_BASE}/{resource_id}"
-                response = requests.get(url, params=params, headers=headers, timeout=10)
-                
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        logger.info(f"✓ Successfully fetched {scheme_name} - {len(data.get('records', []))} records")
-                        successful_fetches += 1
-                        
-                        # Store raw API data for reference
-                        # Note: This is scheme statistics data, not full scheme details
-                        # We'll keep using our curated cache for full scheme info
-                        
-                    except json.JSONDecodeError:
-                        logger.error(f"Invalid JSON response for {scheme_name}")
-                else:
-                    logger.warning(f"API returned {response.status_code} for {scheme_name}: {response.text[:100]}")
-                    
-            except requests.Timeout:
-                logger.error(f"Timeout fetching {scheme_name}")
-            except Exception as e:
-                logger.error(f"Error fetching {scheme_name}: {e}")
-        
-        if successful_fetches > 0:
-            logger.info(f"✓ Successfully fetched {successful_fetches}/{len(SCHEME_RESOURCES)} scheme APIs from data.gov.in")
+
+        logger.info(f"Fetching {len(SCHEME_RESOURCES)} scheme resources from data.gov.in...")
+        results = await fetch_resources()
+        if results:
+            logger.info(f"✓ Successfully fetched {len(results)}/{len(SCHEME_RESOURCES)} scheme APIs from data.gov.in")
             self.api_data_available = True
+            self.api_records = {name: len(data.get('records', [])) for name, data in results.items()}
             # Note: API returns statistics/beneficiary data, not full scheme details
             # For now, we'll continue using our comprehensive cache with full details
             # In production, you could enrich cache data with API statistics
         else:
             logger.info("No API data fetched, using cache only")
 
-    
     def get_all_schemes(self):
         """Return all available schemes"""
-        return self.schemes
+        return list(self.snapshot.schemes)
     
+    def get_catalog_response(self, fields: tuple = (), offset: int = 0, limit: int = None):
+        """Pre-serialized GET /schemes body (see CatalogResponses)"""
+        return self.snapshot.responses.get(fields, offset, limit)
+
     def get_api_status(self):
         """Return API connection status"""
+        snapshot = self.snapshot
         return {
             "api_key_configured": bool(DATA_GOV_IN_API_KEY),
             "api_data_available": self.api_data_available,
-            "total_schemes": len(self.schemes),
+            "total_schemes": len(snapshot.schemes),
+            "catalog_version": snapshot.version,
+            "catalog_loaded_at": snapshot.loaded_at,
+            "resources_fetched": len(self.api_records),
+            "last_refresh": self.last_refresh,
             "data_source": "data.gov.in API + Cache" if self.api_data_available else "Cache"
         }
     
-    def suggest_schemes(self, text: str):
+    def suggest_schemes(self, text: str, notice_type: str = "", limit: int = 3):
         """
         Suggest schemes based on notice content.
-        Returns top 3 schemes as suggestions.
+        Returns the top 3 schemes by BM25 relevance to the notice text and type,
+        topped up with the first schemes of the catalog (the widely applicable
+        central schemes) when fewer than 3 match the notice well enough.
         """
-        return self.schemes[:3] if len(self.schemes) >= 3 else self.schemes
+        snapshot = self.snapshot
+        picked = snapshot.ranker.top(text, notice_type, limit)
+        for i in range(min(limit, len(snapshot.schemes))):
+            if len(picked) >= limit:
+                break
+            if i not in picked:
+                picked.append(i)
+        return [snapshot.schemes[i] for i in picked]
     
+    def search_schemes(self, query: str, limit: int = 20, offset: int = 0):
+        """Fuzzy full-text search over the catalog (see SchemeSearchIndex)"""
+        return self.snapshot.search_index.search(query, limit, offset)
+
     def match_schemes(self, user_data: dict):
         """
-        Find schemes user is eligible for based on their profile.
-        Returns full scheme objects with all details.
+        Find schemes user is eligible for based on their profile
+        (age, income, state, category, occupation).
+        Returns full scheme objects with all details, best matches first.
         """
-        if not self.schemes:
+        snapshot = self.snapshot
+        if not snapshot.schemes:
             return []
-        
-        eligible = []
-        age = user_data.get("age", 0)
-        income = user_data.get("income", 0)
-        
-        for scheme in self.schemes:
-            # Check income eligibility
-            max_income = scheme.get("max_income", float('inf'))
-            if income > max_income:
-                continue
-            
-            # Check age eligibility
-            age_min = scheme.get("age_min", 0)
-            age_max = scheme.get("age_max", 150)
-            
-            if age < age_min or age > age_max:
-                continue
-            
-            # Passed all checks - user is eligible
-            eligible.append(scheme)
-        
-        return eligible
+
+        return [snapshot.schemes[i] for i in snapshot.index.match(user_data).tolist()]
     
-    def refresh(self):
+    async def refresh(self):
         """
-        Try to fetch fresh data from API, fallback to reloading cache.
+        Try to fetch fresh data from API, then reload the cache off the event
+        loop. Requests keep being served from the current catalog meanwhile.
         """
         if DATA_GOV_IN_API_KEY:
             logger.info("Refreshing from data.gov.in API...")
-            self._fetch_from_api()
+            await self._fetch_from_api()
         else:
             logger.info("No API key, reloading cache...")
-            self._load_cache()
-        return self.schemes
+        await asyncio.to_thread(self._load_cache)
+        self.last_refresh = time.time()
+        return list(self.snapshot.schemes)
+
+
+class SchemeRefresher:
+    """
+    Background task refreshing the catalog: once at startup when a
+    data.gov.in key is set, then every SCHEMES_REFRESH_INTERVAL seconds.
+    """
+
+    def __init__(self, interval: int = SCHEMES_REFRESH_INTERVAL):
+        self.interval = interval
+        self._task = None
+
+    def start(self):
+        if not DATA_GOV_IN_API_KEY and self.interval <= 0:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self):
+        if DATA_GOV_IN_API_KEY:
+            await self._refresh()
+        while self.interval > 0:
+            await asyncio.sleep(self.interval)
+            await self._refresh()
+
+    async def _refresh(self):
+        try:
+            await refresh_schemes()
+        except Exception as e:
+            logger.error(f"Scheme refresh failed: {e}")
+
 
 # Singleton instance
 _engine = SchemeEngine()
+_refresh_flights = SingleFlight("scheme-refresh")
+scheme_refresher = SchemeRefresher()
 
 # Public API functions
 def get_all_schemes():
     """Get all available government schemes"""
     return _engine.get_all_schemes()
 
+def get_catalog_response(fields: tuple = (), offset: int = 0, limit: int = None):
+    """Catalog page, projected to fields, serialized and compressed once per catalog version"""
+    return _engine.get_catalog_response(fields, offset, limit)
+
 def get_api_status():
     """Get API connection status"""
     return _engine.get_api_status()
 
-def suggest_schemes(text: str):
+def suggest_schemes(text: str, notice_type: str = ""):
     """Suggest schemes based on notice content"""
-    return _engine.suggest_schemes(text)
+    return _engine.suggest_schemes(text, notice_type)
+
+def search_schemes(query: str, limit: int = 20, offset: int = 0):
+    """Typo-tolerant, ranked search of the catalog with autocomplete"""
+    return _engine.search_schemes(query, limit, offset)
 
 def match_schemes(user_data: dict):
     """Find eligible schemes for user"""
     return _engine.match_schemes(user_data)
 
-def refresh_schemes():
-    """Refresh schemes from API or reload cache"""
-    return _engine.refresh()
+async def refresh_schemes():
+    """Refresh schemes from API or reload cache (concurrent calls share one refresh)"""
+    return await _refresh_flights.do("catalog", _engine.refresh)
@@ -0,0 +1,97 @@
+import asyncio
+import random
+import httpx
+from core.config import (
+    DATA_GOV_IN_API_BASE, DATA_GOV_IN_API_KEY, SCHEMES_FETCH_TIMEOUT, SCHEMES_FETCH_RETRIES,
+    SCHEMES_FETCH_BACKOFF, SCHEMES_FETCH_CONCURRENCY
+)
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Real data.gov.in resource IDs for government schemes
+SCHEME_RESOURCES = {
+    # Insurance & Protection Schemes
+    "pmfby": "102819a6-2e35-4f2a-9281-1a23c4d35918",  # PM Fasal Bima Yojana (Crop Insurance)
+    "pmjjby_pmsby_coverage": "584e6cc5-6448-4bdd-9b35-944ccc8b4924",  # PMJJBY & PMSBY Coverage
+    "pmjjby_pmsby_enrollment": "0192c599-8129-41d0-a538-6b61af0766be",  # PMJJBY & PMSBY Enrollment
+
+    # Fisheries & Agriculture
+    "matsya_sampada": "bf697329-f58d-4007-a927-3fd504a0458a",  # PM Matsya Sampada Yojana
+
+    # Social Assistance & Pension
+    "nsap_goa": "6d8e94ea-7a3b-4fdc-bc4e-1eb1a0cf8f9b",  # National Social Assistance Programme (NSAP) Goa
+
+    # Note: Add more resource IDs here as you discover them on data.gov.in
+    # You can search at: https://data.gov.in/search
+    # Common schemes to look for:
+    # - PM Awas Yojana (PMAY) housing data
+    # - PM Ujjwala Yojana LPG connections
+    # - Ayushman Bharat beneficiaries
+    # - PM Kisan Samman Nidhi farmer data
+}
+
+# Worth another attempt: rate limiting and server-side failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Longest Retry-After honoured between attempts
+MAX_RETRY_AFTER = 60
+
+
+async def fetch_resources(base_url: str = DATA_GOV_IN_API_BASE, api_key: str = DATA_GOV_IN_API_KEY,
+                          resources: dict = SCHEME_RESOURCES) -> dict:
+    """
+    Fetch every data.gov.in resource concurrently (at most
+    SCHEMES_FETCH_CONCURRENCY at once). Returns scheme name -> parsed JSON for
+    the resources that succeeded; failures are logged and left out.
+    """
+    semaphore = asyncio.Semaphore(SCHEMES_FETCH_CONCURRENCY)
+    async with httpx.AsyncClient(
+        base_url=base_url.rstrip("/"),
+        timeout=SCHEMES_FETCH_TIMEOUT,
+        headers={'User-Agent': 'CivicSenseAI/1.0'}
+    ) as client:
+        names = list(resources)
+        results = await asyncio.gather(
+            *(_fetch_resource(client, semaphore, name, resources[name], api_key) for name in names)
+        )
+    return {name: data for name, data in zip(names, results) if data is not None}
+
+
+async def _fetch_resource(client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                          scheme_name: str, resource_id: str, api_key: str):
+    # data.gov.in requires API key in query params
+    params = {'api-key': api_key, 'format': 'json', 'limit': 10}
+    for attempt in range(SCHEMES_FETCH_RETRIES + 1):
+        retry_after = None
+        try:
+            async with semaphore:
+                response = await client.get(f"/{resource_id}", params=params)
+            if response.status_code == 200:
+                data = response.json()
+                logger.info(f"✓ Successfully fetched {scheme_name} - {len(data.get('records', []))} records")
+                return data
+            logger.warning(f"API returned {response.status_code} for {scheme_name}: {response.text[:100]}")
+            if response.status_code not in RETRY_STATUSES:
+                return None
+            retry_after = _retry_after(response)
+        except ValueError:
+            logger.error(f"Invalid JSON response for {scheme_name}")
+            return None
+        except httpx.TimeoutException:
+            logger.error(f"Timeout fetching {scheme_name}")
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching {scheme_name}: {e}")
+
+        if attempt < SCHEMES_FETCH_RETRIES:
+            # Exponential backoff with full jitter, so retries from several
+            # resources do not hit the API in lockstep
+            delay = random.uniform(0, SCHEMES_FETCH_BACKOFF * 2 ** attempt)
+            await asyncio.sleep(max(delay, retry_after or 0))
+    return None
+
+
+def _retry_after(response: httpx.Response):
+    try:
+        return min(float(response.headers.get("retry-after")), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return None
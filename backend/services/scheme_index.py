@@ -0,0 +1,109 @@
+import numpy as np
+
+# Profile/catalog values meaning "no restriction" (the frontend also sends
+# its "Select ..." placeholders when a field is left unset)
+_UNRESTRICTED = {"", "all", "any", "general", "none", "n/a"}
+
+# Occupation -> scheme categories ranked first for it
+OCCUPATION_CATEGORIES = {
+    "student": {"student"},
+    "farmer": {"farmer"},
+    "salaried": {"employed"},
+    "self-employed": {"self-employed", "business", "startup", "artisan", "unorganized worker"},
+    "unemployed": {"unorganized worker"},
+    "senior citizen": {"senior citizen"},
+}
+
+# Categories only offered to their own occupation once the occupation is known
+# (a salaried applicant is not shown farmer income support or scholarships)
+EXCLUSIVE_CATEGORIES = {"student", "farmer"}
+
+
+def normalize(value) -> str:
+    return str(value or "").strip().lower()
+
+
+def profile_value(value) -> str:
+    """Normalized profile field, or "" when it places no restriction"""
+    value = normalize(value)
+    if value in _UNRESTRICTED or value.startswith("select"):
+        return ""
+    return value
+
+
+def _number(value, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class SchemeIndex:
+    """
+    Columnar view of the scheme catalog for eligibility matching: income and
+    age limits as NumPy arrays plus one boolean bitmap per state and per
+    category, built once per catalog load. match() evaluates every profile
+    filter as whole-array operations instead of looping over scheme dicts.
+    """
+
+    def __init__(self, schemes: list):
+        self.size = len(schemes)
+        self.max_income = np.array([_number(s.get("max_income"), np.inf) for s in schemes], dtype=np.float64)
+        self.age_min = np.array([_number(s.get("age_min"), 0) for s in schemes], dtype=np.float64)
+        self.age_max = np.array([_number(s.get("age_max"), 150) for s in schemes], dtype=np.float64)
+
+        states = {}
+        categories = {}
+        for i, scheme in enumerate(schemes):
+            states.setdefault(normalize(scheme.get("state")), []).append(i)
+            categories.setdefault(normalize(scheme.get("category")), []).append(i)
+
+        # Schemes without a state ("All") are available everywhere; same for "General" categories
+        self.all_states = self._bitmap([i for s, ids in states.items() if s in _UNRESTRICTED for i in ids])
+        self.open_categories = self._bitmap([i for c, ids in categories.items() if c in _UNRESTRICTED for i in ids])
+        self.states = {s: self._bitmap(ids) for s, ids in states.items() if s not in _UNRESTRICTED}
+        self.categories = {c: self._bitmap(ids) for c, ids in categories.items() if c not in _UNRESTRICTED}
+        self.exclusive = self.any_category(EXCLUSIVE_CATEGORIES)
+
+    def match(self, profile: dict) -> np.ndarray:
+        """
+        Indices of the schemes the profile is eligible for, best matches first:
+        schemes aimed at the profile's occupation or category, then schemes of
+        the profile's state, then national ones (catalog order within each group).
+        """
+        age = _number(profile.get("age"), 0)
+        income = _number(profile.get("income"), 0)
+        eligible = (income <= self.max_income) & (age >= self.age_min) & (age <= self.age_max)
+
+        state = profile_value(profile.get("state"))
+        if state:
+            eligible &= self.all_states | self.states.get(state, self._bitmap([]))
+
+        category = profile_value(profile.get("category"))
+        if category:
+            eligible &= self.open_categories | self.categories.get(category, self._bitmap([]))
+
+        occupation = profile_value(profile.get("occupation"))
+        preferred = set(OCCUPATION_CATEGORIES.get(occupation, {occupation} if occupation else ()))
+        if occupation:
+            eligible &= ~self.exclusive | self.any_category(preferred)
+        if category:
+            preferred.add(category)
+
+        indices = np.flatnonzero(eligible)
+        score = self.any_category(preferred)[indices] * 2
+        if state:
+            score += ~self.all_states[indices]
+        return indices[np.argsort(-score, kind="stable")]
+
+    def any_category(self, categories) -> np.ndarray:
+        mask = self._bitmap([])
+        for category in categories:
+            if category in self.categories:
+                mask |= self.categories[category]
+        return mask
+
+    def _bitmap(self, indices: list) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        mask[indices] = True
+        return mask
@@ -0,0 +1,118 @@
+import math
+from collections import Counter
+from functools import lru_cache
+import numpy as np
+from services.keyword_matcher import tokenize
+
+# Scheme fields indexed for suggestions, with how often their words count
+FIELD_WEIGHTS = {"name": 2, "category": 2, "description": 1, "eligibility": 1, "ministry": 1}
+
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+# A long notice is reduced to its most informative words before scoring
+MAX_QUERY_TERMS = 32
+# Notice type words count this many times in the query
+NOTICE_TYPE_WEIGHT = 3
+# A suggestion must share at least this many distinct terms with the notice,
+# or a notice type term: a lone shared place name ("delhi") is no reason to
+# suggest a scheme
+MIN_MATCHED_TERMS = 2
+# ... and score at least this fraction of the best suggestion
+MIN_SCORE_RATIO = 0.25
+
+STOPWORDS = {
+    "the", "and", "for", "with", "from", "under", "this", "that", "your", "you", "are",
+    "was", "were", "has", "have", "had", "not", "all", "any", "per", "its", "their",
+    "will", "shall", "may", "can", "into", "upon", "which", "who", "whom", "been",
+    "also", "such", "other", "than", "then", "there", "these", "those", "our", "out",
+}
+
+
+def terms(text: str) -> list:
+    """Index terms of text: lowercase words of 3+ letters, stopwords dropped, plurals folded"""
+    return [term for term in map(_term, tokenize(text)) if term]
+
+
+@lru_cache(maxsize=65536)
+def _term(word: str) -> str:
+    if len(word) < 3 or not word.isalpha() or word in STOPWORDS:
+        return ""
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+class SchemeRanker:
+    """
+    Inverted index over the scheme catalog for suggesting schemes relevant to
+    a notice. Every posting stores its precomputed BM25 term weight, so a
+    query only gathers the postings of its terms and sums them with one
+    np.bincount. Built once per catalog load.
+    """
+
+    def __init__(self, schemes: list):
+        self.size = len(schemes)
+        vocabulary = {}  # term -> term id
+        doc_ids, term_ids, tfs = [], [], []
+        for doc, scheme in enumerate(schemes):
+            words = []
+            for field, weight in FIELD_WEIGHTS.items():
+                words.extend(terms(str(scheme.get(field) or "")) * weight)
+            counts = Counter(words)
+            doc_ids.extend([doc] * len(counts))
+            term_ids.extend(vocabulary.setdefault(term, len(vocabulary)) for term in counts)
+            tfs.extend(counts.values())
+
+        doc_ids = np.array(doc_ids, dtype=np.int64)
+        term_ids = np.array(term_ids, dtype=np.int64)
+        tfs = np.array(tfs, dtype=np.float64)
+        lengths = np.bincount(doc_ids, weights=tfs, minlength=self.size)
+        average = lengths.mean() if self.size else 1.0
+        weights = tfs * (K1 + 1) / (tfs + K1 * (1 - B + B * lengths[doc_ids] / max(average, 1.0)))
+
+        # Group the (doc, weight) pairs by term: one slice per term after a stable sort
+        order = np.argsort(term_ids, kind="stable")
+        bounds = np.searchsorted(term_ids[order], np.arange(len(vocabulary) + 1))
+        self.idf = {}
+        self.postings = {}
+        for term, term_id in vocabulary.items():
+            rows = order[bounds[term_id]:bounds[term_id + 1]]
+            idf = math.log(1 + (self.size - len(rows) + 0.5) / (len(rows) + 0.5))
+            self.idf[term] = idf
+            self.postings[term] = (doc_ids[rows], idf * weights[rows])
+
+    def top(self, text: str, notice_type: str = "", k: int = 3) -> list:
+        """
+        Indices of the k best-scoring schemes for the notice; fewer (possibly
+        none) if few schemes match enough of it (MIN_MATCHED_TERMS, MIN_SCORE_RATIO).
+        """
+        query = Counter(t for t in terms(text) if t in self.idf)
+        type_terms = {t for t in terms(notice_type) if t in self.idf}
+        for term in type_terms:
+            query[term] += NOTICE_TYPE_WEIGHT
+        if not query:
+            return []
+
+        # Rarer terms and repeated terms carry the notice's topic
+        best = sorted(query, key=lambda t: self.idf[t] * (1 + math.log(query[t])), reverse=True)[:MAX_QUERY_TERMS]
+        docs = np.concatenate([self.postings[t][0] for t in best])
+        weights = np.concatenate([self.postings[t][1] * (1 + math.log(query[t])) for t in best])
+        scores = np.bincount(docs, weights=weights, minlength=self.size)
+
+        # One posting per (term, scheme): counting postings counts distinct terms matched
+        qualified = np.bincount(docs, minlength=self.size) >= MIN_MATCHED_TERMS
+        for term in type_terms & set(best):
+            qualified[self.postings[term][0]] = True
+        scores[~qualified] = 0.0
+        if scores.any():
+            scores[scores < MIN_SCORE_RATIO * scores.max()] = 0.0
+
+        k = min(k, np.count_nonzero(scores))
+        if k == 0:
+            return []
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        return candidates[np.argsort(-scores[candidates], kind="stable")].tolist()
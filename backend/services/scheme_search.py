@@ -0,0 +1,231 @@
+import hashlib
+import json
+from bisect import bisect_left
+from collections import Counter
+from types import MappingProxyType
+import numpy as np
+from services.keyword_matcher import tokenize
+
+# Where a query word may match, and how much a match there counts
+FIELD_WEIGHTS = {"name": 3.0, "tags": 2.0, "category": 2.0, "ministry": 1.0, "description": 1.0, "eligibility": 1.0}
+
+# Trigram (Jaccard) similarity a catalog word needs to count as a fuzzy match
+# for a query word (the pg_trgm default)
+MIN_SIMILARITY = 0.3
+# Similarity given to completions of the last query word (search-as-you-type)
+PREFIX_SIMILARITY = 0.9
+# Query words shorter than this only match exactly or as a prefix
+MIN_FUZZY_LENGTH = 3
+# A single typed letter would match most of the vocabulary as a prefix
+MIN_PREFIX_LENGTH = 2
+MAX_COMPLETIONS = 5
+
+
+def trigrams(word: str) -> set:
+    """Character trigrams of a word, padded so its start and end count ("  k", " ki", ..., "an ")"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _fingerprint(scheme: dict) -> str:
+    return hashlib.sha256(json.dumps(scheme, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _field_text(value) -> str:
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value)
+    return str(value or "")
+
+
+class SchemeSearchIndex:
+    """
+    Typo-tolerant full-text search over the scheme catalog. Catalog words are
+    indexed by character trigram, so a misspelled or Hinglish query word
+    ("ujwala", "yojna") finds the catalog words it resembles, which in turn
+    lead to the schemes containing them. The last query word also matches as
+    a prefix for autocomplete. update() applies a new catalog incrementally:
+    only added, removed and changed schemes are (re)indexed. Scoring runs on
+    per-word NumPy postings (catalog positions and weights). Postings and
+    the sorted vocabulary are rebuilt, read-only, at the end of update(), so
+    searches on a published index only ever read it.
+    """
+
+    def __init__(self):
+        self._docs = {}        # key -> {"scheme", "fingerprint", "position", "words"}
+        self._keys = []        # catalog position -> key
+        self._postings = MappingProxyType({})  # word -> (positions, weights) arrays, read-only
+        self._word_docs = {}   # word -> {key: field weight}
+        self._trigram_words = {}  # trigram -> set of words
+        self._trigram_counts = {}  # word -> number of distinct trigrams
+        self._sorted_words = ()  # vocabulary in order, for prefix lookups
+
+    def update(self, schemes: list) -> dict:
+        """Make the index match `schemes`; returns how many were added/removed/changed"""
+        keys = []
+        seen = Counter()
+        for scheme in schemes:
+            key = f"{str(scheme.get('name', '')).strip().lower()}|{str(scheme.get('state', '')).strip().lower()}"
+            seen[key] += 1
+            keys.append(key if seen[key] == 1 else f"{key}#{seen[key]}")
+
+        added = removed = changed = 0
+        for key in set(self._docs) - set(keys):
+            self._remove(key)
+            removed += 1
+        for position, (key, scheme) in enumerate(zip(keys, schemes)):
+            doc = self._docs.get(key)
+            fingerprint = _fingerprint(scheme)
+            if doc is None:
+                added += 1
+            elif doc["fingerprint"] != fingerprint:
+                self._remove(key)
+                changed += 1
+            else:
+                doc["scheme"] = scheme
+                doc["position"] = position
+                continue
+            self._add(key, scheme, fingerprint, position)
+
+        # Positions may have shifted: rebuild postings here rather than on the
+        # first search, which would write to an index already being served
+        self._keys = keys
+        self._postings = MappingProxyType(
+            {word: self._build_postings(docs) for word, docs in self._word_docs.items()}
+        )
+        self._sorted_words = tuple(sorted(self._word_docs))
+        return {"added": added, "removed": removed, "changed": changed}
+
+    def copy(self) -> "SchemeSearchIndex":
+        """
+        Independent copy to update() while this index keeps serving searches.
+        Containers update() mutates are copied; per-scheme word sets and the
+        scheme dicts themselves are shared (they are replaced, never modified),
+        as are the read-only postings and sorted vocabulary.
+        """
+        other = SchemeSearchIndex()
+        other._docs = {key: dict(doc) for key, doc in self._docs.items()}
+        other._keys = self._keys
+        other._word_docs = {word: dict(docs) for word, docs in self._word_docs.items()}
+        other._trigram_words = {trigram: set(words) for trigram, words in self._trigram_words.items()}
+        other._trigram_counts = dict(self._trigram_counts)
+        other._postings = self._postings
+        other._sorted_words = self._sorted_words
+        return other
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> dict:
+        """
+        Schemes matching the query, ranked by how many query words they match
+        and then by match quality, plus completions for the last query word.
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words:
+            return {"results": [], "total": 0, "completions": []}
+
+        size = len(self._keys)
+        matched = np.zeros(size, dtype=np.int64)  # query words each scheme matches
+        scores = np.zeros(size, dtype=np.float64)  # summed best match per query word
+        for i, word in enumerate(words):
+            best = np.zeros(size, dtype=np.float64)
+            for candidate, similarity in self._similar(word, prefix=i == len(words) - 1).items():
+                positions, weights = self._postings[candidate]
+                best[positions] = np.maximum(best[positions], similarity * weights)
+            matched += best > 0
+            scores += best
+
+        hits = np.flatnonzero(matched)
+        if offset >= len(hits):
+            return {"results": [], "total": int(len(hits)), "completions": self._completions(words[-1])}
+
+        # One unique integer per hit: query words matched, then score, then
+        # catalog order, so a page can be cut with argpartition deterministically
+        rank = (matched[hits] << 40) | (np.minimum(scores[hits] * 1000, 2 ** 20 - 1).astype(np.int64) << 20) \
+            | (2 ** 20 - 1 - hits)
+        end = min(offset + limit, len(hits))
+        top = np.argpartition(-rank, end - 1)[:end]
+        page = hits[top[np.argsort(-rank[top])]][offset:]
+        return {
+            "results": [self._docs[self._keys[position]]["scheme"] for position in page.tolist()],
+            "total": int(len(hits)),
+            "completions": self._completions(words[-1])
+        }
+
+    def stats(self):
+        return {"schemes": len(self._docs), "words": len(self._word_docs), "trigrams": len(self._trigram_words)}
+
+    def _build_postings(self, docs: dict):
+        positions = np.fromiter((self._docs[key]["position"] for key in docs), dtype=np.int64, count=len(docs))
+        weights = np.fromiter(docs.values(), dtype=np.float64, count=len(docs))
+        positions.flags.writeable = False
+        weights.flags.writeable = False
+        return positions, weights
+
+    def _add(self, key: str, scheme: dict, fingerprint: str, position: int):
+        words = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for word in tokenize(_field_text(scheme.get(field))):
+                if weight > words.get(word, 0.0):
+                    words[word] = weight
+        self._docs[key] = {"scheme": scheme, "fingerprint": fingerprint, "position": position, "words": words}
+        for word, weight in words.items():
+            docs = self._word_docs.get(word)
+            if docs is None:
+                docs = self._word_docs[word] = {}
+                word_trigrams = trigrams(word)
+                self._trigram_counts[word] = len(word_trigrams)
+                for trigram in word_trigrams:
+                    self._trigram_words.setdefault(trigram, set()).add(word)
+            docs[key] = weight
+
+    def _remove(self, key: str):
+        doc = self._docs.pop(key)
+        for word in doc["words"]:
+            docs = self._word_docs[word]
+            del docs[key]
+            if docs:
+                continue
+            # Last scheme using this word: drop it from the vocabulary
+            del self._word_docs[word]
+            del self._trigram_counts[word]
+            for trigram in trigrams(word):
+                bucket = self._trigram_words[trigram]
+                bucket.discard(word)
+                if not bucket:
+                    del self._trigram_words[trigram]
+
+    def _similar(self, word: str, prefix: bool) -> dict:
+        """Catalog words matching a query word -> similarity (1.0 for the word itself)"""
+        candidates = {}
+        if len(word) >= MIN_FUZZY_LENGTH:
+            query_trigrams = trigrams(word)
+            shared = Counter()
+            for trigram in query_trigrams:
+                shared.update(self._trigram_words.get(trigram, ()))
+            for candidate, count in shared.items():
+                similarity = count / (len(query_trigrams) + self._trigram_counts[candidate] - count)
+                if similarity >= MIN_SIMILARITY:
+                    candidates[candidate] = similarity
+        elif word in self._word_docs:
+            candidates[word] = 1.0
+
+        if prefix and len(word) >= MIN_PREFIX_LENGTH:
+            for candidate in self._prefixed(word):
+                if candidates.get(candidate, 0.0) < PREFIX_SIMILARITY and candidate != word:
+                    candidates[candidate] = PREFIX_SIMILARITY
+        return candidates
+
+    def _prefixed(self, prefix: str) -> list:
+        vocabulary = self._sorted_words
+        words = []
+        i = bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            words.append(vocabulary[i])
+            i += 1
+        return words
+
+    def _completions(self, prefix: str) -> list:
+        """Catalog words extending the last query word, most widely used first"""
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            return []
+        words = [w for w in self._prefixed(prefix) if w != prefix]
+        words.sort(key=lambda w: -len(self._word_docs[w]))
+        return words[:MAX_COMPLETIONS]
@@ -1,16 +1,293 @@
-from core.config import LLM_PROVIDER, OPENAI_API_KEY, GOOGLE_API_KEY, GROQ_API_KEY
+import asyncio
+import json
+import time
+from core.config import LLM_PROVIDER, LLM_DEADLINE
+from core.config import (
+    LLM_CONDENSE_MIN_TOKENS, LLM_INPUT_TOKEN_BUDGET, LLM_CHUNK_TOKENS, LLM_MAP_MAX_TOKENS, LLM_MAP_CONCURRENCY, LLM_MAX_CHUNKS
+)
+from services.llm_clients import llm_clients, GROQ_MODEL, OPENAI_MODEL, MODELS
+from services import llm_cache
+from services.llm_router import llm_router, LLMUnavailable
+from services.mock_llm import mock_llm
+from services.llm_scheduler import priority_for_severity
+from utils.text_cleaner import normalize_whitespace
+from core.singleflight import SingleFlight
+from core.config import SINGLEFLIGHT_TIMEOUT
+from core.logger import get_logger
+from services.notice_chunker import estimate_tokens, split_into_chunks
+from services.field_extractor import extract_fields, format_fields, condense_notice
 
-def simplify_notice(text: str, notice_type: str = "", severity: str = ""):
+logger = get_logger(__name__)
+
+# Bump whenever the prompt or output schema changes; cached analyses are keyed on it
+PROMPT_VERSION = "2"
+# Same for the per-section prompt used on long notices
+SECTION_PROMPT_VERSION = "section-1"
+
+# Completion budget reserved against tokens-per-minute limits for one explanation
+EXPLANATION_MAX_TOKENS = 1000
+
+FALLBACK_ENGLISH = "This is a government notice. Please review the details carefully."
+# English placeholder of parse_explanation() when the LLM did not return JSON
+UNPARSED_ENGLISH = ("English summary not available via API.", "English summary available in Hinglish section.")
+
+# Identical concurrent prompts share one provider call
+_llm_flights = SingleFlight("llm", SINGLEFLIGHT_TIMEOUT)
+
+async def simplify_notice(text: str, notice_type: str = "", severity: str = ""):
     """
     Converts government/legal notice into simple Hinglish explanation
     with actionable next steps using LLM.
     """
     
-    prompt = f"""You are an AI assistant helping Indian citizens understand government and legal notices.
+    if not llm_available():
+        # Fallback to rule-based if no API key
+        return fallback_explanation(text, notice_type, severity)
+
+    cached = _cached_response(lambda provider: _response_key(provider, text, notice_type, severity))
+    if cached is not None:
+        return parse_explanation(cached)
+
+    key = _response_key(LLM_PROVIDER, text, notice_type, severity)
+    # One deadline for the whole explanation, section summaries included
+    give_up_at = time.monotonic() + LLM_DEADLINE
+    try:
+        # Followers share the leader's response, or its error (and fall back too)
+        raw = await _llm_flights.do(key, _complete_and_cache, text, notice_type, severity, give_up_at)
+        return parse_explanation(raw)
+        
+    except Exception as e:
+        print(f"LLM Error: {e}")
+        # Auto-fallback if API fails
+        return fallback_explanation(text, notice_type, severity)
+
+
+async def _complete_and_cache(text: str, notice_type: str, severity: str, give_up_at: float) -> str:
+    prompt = await _notice_prompt(text, notice_type, severity, give_up_at)
+    # LLM_PROVIDER first, failing over / hedging to the others; the rule-based
+    # fallback is only used once the notice's deadline (LLM_DEADLINE) has passed
+    provider, raw = await llm_router.complete(
+        lambda provider: _answered_by(provider, _SIMPLIFIERS[provider](prompt)),
+        priority=priority_for_severity(severity),
+        tokens=estimate_tokens(prompt) + EXPLANATION_MAX_TOKENS,
+        deadline=_remaining(give_up_at)
+    )
+    llm_cache.set_response(_response_key(provider, text, notice_type, severity), raw)
+    return raw
+
+
+def coalescing_stats():
+    return _llm_flights.stats()
+
+
+def _remaining(give_up_at: float) -> float:
+    """Seconds left before give_up_at; LLMUnavailable once it has passed"""
+    remaining = give_up_at - time.monotonic()
+    if remaining <= 0:
+        raise LLMUnavailable(f"no LLM response within {LLM_DEADLINE}s")
+    return remaining
+
+
+async def stream_simplify_notice(text: str, notice_type: str = "", severity: str = ""):
+    """
+    Async generator version of simplify_notice: yields the raw LLM output in
+    chunks as it is generated. Join the chunks and pass them to parse_explanation()
+    for the final explanation. Errors propagate to the caller, which should
+    use fallback_explanation(); callers must check llm_available() first.
+    A cached response is yielded as a single chunk.
+    """
+    cached = _cached_response(lambda provider: _response_key(provider, text, notice_type, severity))
+    if cached is not None:
+        yield cached
+        return
+
+    chunks = []
+    answered = {}
+    # The deadline for the first chunk covers section summaries too
+    give_up_at = time.monotonic() + LLM_DEADLINE
+    prompt = await _notice_prompt(text, notice_type, severity, give_up_at)
+    stream = llm_router.stream(
+        lambda provider: _stream_answer(provider, prompt, answered),
+        priority=priority_for_severity(severity),
+        tokens=estimate_tokens(prompt) + EXPLANATION_MAX_TOKENS,
+        deadline=_remaining(give_up_at)
+    )
+    async for chunk in stream:
+        chunks.append(chunk)
+        yield chunk
+    if "provider" in answered:
+        llm_cache.set_response(_response_key(answered["provider"], text, notice_type, severity), "".join(chunks))
+
+
+async def _notice_prompt(text: str, notice_type: str, severity: str, give_up_at: float) -> str:
+    """
+    Prompt for the final explanation. Rule-extracted fields always go with
+    it. Short notices are sent whole; longer ones are cut down to their
+    relevant sentences, and if that is still over the budget, condensed
+    section by section first (map-reduce), so nothing past the provider's
+    context is silently cut and each call stays fast. Section summaries
+    share the notice's deadline (give_up_at, a time.monotonic() value).
+    """
+    fields = extract_fields(text)
+    tokens = estimate_tokens(text)
+    if tokens > LLM_CONDENSE_MIN_TOKENS:
+        text = condense_notice(text, fields)
+        logger.info(f"Condensed notice from ~{tokens} to ~{estimate_tokens(text)} tokens")
+        tokens = estimate_tokens(text)
+    if tokens <= LLM_INPUT_TOKEN_BUDGET:
+        return build_prompt(text, notice_type, severity, fields)
+
+    sections = split_into_chunks(text, LLM_CHUNK_TOKENS)
+    if len(sections) > LLM_MAX_CHUNKS:
+        logger.warning(f"Notice has {len(sections)} sections, summarizing the first {LLM_MAX_CHUNKS}")
+        sections = sections[:LLM_MAX_CHUNKS]
+    logger.info(f"Long notice (~{tokens} tokens): summarizing {len(sections)} sections")
+
+    semaphore = asyncio.Semaphore(LLM_MAP_CONCURRENCY)
+    priority = priority_for_severity(severity)
+    summaries = await asyncio.gather(*[
+        _summarize_section(section, semaphore, priority, give_up_at) for section in sections
+    ])
+    condensed = "\n\n".join(
+        f"[Section {i} of {len(summaries)}]\n{summary}" for i, summary in enumerate(summaries, 1)
+    )
+    return build_prompt(
+        "(Long notice - condensed section by section, in order)\n\n" + condensed,
+        notice_type, severity, fields
+    )
+
+
+async def _summarize_section(section: str, semaphore: asyncio.Semaphore, priority: int, give_up_at: float) -> str:
+    """Map step: condense one section, cached and coalesced like full responses"""
+    cached = _cached_response(lambda provider: _section_key(provider, section))
+    if cached is not None:
+        return cached
+
+    async def summarize():
+        async with semaphore:
+            prompt = build_section_prompt(section)
+            provider, summary = await llm_router.complete(
+                lambda provider: _answered_by(provider, _complete_text(provider, prompt, LLM_MAP_MAX_TOKENS)),
+                priority=priority,
+                tokens=estimate_tokens(prompt) + LLM_MAP_MAX_TOKENS,
+                deadline=_remaining(give_up_at)
+            )
+        llm_cache.set_response(_section_key(provider, section), summary)
+        return summary
+
+    return await _llm_flights.do(_section_key(LLM_PROVIDER, section), summarize)
+
+
+def build_section_prompt(section: str) -> str:
+    """Prompt condensing one section of a long notice into plain-text facts"""
+    return f"""Below is one section of a long Indian government or legal notice.
+Condense it into short plain-text bullet points. Keep every fact a citizen would need:
+who issued it, notice/reference numbers, who is affected, amounts, dates and deadlines,
+required actions and penalties. Do not add anything that is not in the text.
+If the section has nothing of that kind (boilerplate, signatures, tables of contents), reply "-".
+
+Section:
+{section}
+"""
+
+
+def _response_key(provider: str, text: str, notice_type: str, severity: str) -> str:
+    """LLM cache key for a notice prompt; whitespace-only OCR differences share an entry"""
+    return llm_cache.response_key(
+        provider, MODELS.get(provider, ""), PROMPT_VERSION,
+        normalize_whitespace(text), notice_type, severity
+    )
+
+
+def _section_key(provider: str, section: str) -> str:
+    return llm_cache.response_key(
+        provider, MODELS.get(provider, ""), SECTION_PROMPT_VERSION, normalize_whitespace(section)
+    )
+
+
+def _cached_response(key_for):
+    """
+    Cached response from any configured provider, in failover order.
+    Entries are keyed on the provider that actually answered, so a
+    failover or hedged answer is never served as another model's output.
+    """
+    for provider in llm_router.providers or [LLM_PROVIDER]:
+        cached = llm_cache.get_response(key_for(provider))
+        if cached is not None:
+            return cached
+    return None
+
+
+async def _answered_by(provider: str, call):
+    """Tag a provider call's result with the provider, for the cache key"""
+    return provider, await call
+
+
+async def _stream_answer(provider: str, prompt: str, answered: dict):
+    """_stream_from_provider, noting in answered which provider produced output"""
+    async for chunk in _stream_from_provider(provider, prompt):
+        answered["provider"] = provider
+        yield chunk
+
+
+async def _stream_from_provider(provider: str, prompt: str):
+    """Raw streamed output chunks from one provider"""
+    if provider == "groq":
+        # JSON mode is not used while streaming; the prompt already asks for JSON
+        # and parse_explanation() copes with anything else
+        stream = await llm_clients.groq().chat.completions.create(
+            model=GROQ_MODEL,
+            messages=_groq_messages(prompt),
+            temperature=0.3,
+            max_tokens=1000,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    elif provider == "gemini":
+        response = await llm_clients.gemini().generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+    elif provider == "mock":
+        async for chunk in mock_llm.stream(prompt):
+            yield chunk
+
+    elif provider == "openai":
+        stream = await llm_clients.openai().chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=_openai_messages(prompt),
+            temperature=0.7,
+            max_tokens=500,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+def llm_available() -> bool:
+    """True if any LLM provider has an API key"""
+    return llm_router.available()
+
+
+def build_prompt(text: str, notice_type: str = "", severity: str = "", fields: dict = None) -> str:
+    """Prompt asking the LLM for the english/hinglish explanation JSON"""
+    extracted = format_fields(fields) if fields else ""
+    if extracted:
+        extracted = f"""
+Fields extracted by rules from the full notice (verify against the text; use them for
+deadlines, notice number and issuing authority):
+{extracted}
+"""
+    return f"""You are an AI assistant helping Indian citizens understand government and legal notices.
 
 Notice Text:
 {text}
-
+{extracted}
 Notice Type: {notice_type}
 Severity: {severity}
 
@@ -41,54 +318,77 @@ For INVALID documents (is_notice: false):
 - "hinglish": "Yeh ek [Document Type] lag raha hai, jo ki sarkari notice nahi hai. Kripya sahi notice upload karein."
 """
 
-    import json
-    
-    explanation = None
+
+def parse_explanation(raw: str) -> dict:
+    """
+    Turn raw LLM output into the explanation dict. Any provider may have
+    answered (see llm_router), so JSON is tried first for all of them.
+    """
     try:
-        # Try API first (in priority order), fallback if it fails
-        if LLM_PROVIDER == "groq" and GROQ_API_KEY:
-            # Groq now returns JSON string
-            json_str = _simplify_with_groq(prompt)
-            try:
-                explanation = json.loads(json_str)
-            except:
-                # Fallback if valid JSON not returned
-                explanation = {"hinglish": json_str, "english": "English summary not available via API."}
-                
-        elif LLM_PROVIDER == "gemini" and GOOGLE_API_KEY:
-            text_resp = _simplify_with_gemini(prompt)
-            explanation = {"hinglish": text_resp, "english": "English summary available in Hinglish section."}
-            
-        elif LLM_PROVIDER == "openai" and OPENAI_API_KEY:
-            text_resp = _simplify_with_openai(prompt)
-            explanation = {"hinglish": text_resp, "english": "English summary available in Hinglish section."}
-            
-        else:
-            # Fallback to rule-based if no API key
-            fallback_text = _fallback_simplification(text, notice_type, severity)
-            explanation = {"hinglish": fallback_text, "english": "This is a government notice. Please review the details carefully."}
-            
-        return explanation
-        
-    except Exception as e:
-        print(f"LLM Error: {e}")
-        # Auto-fallback if API fails
-        fallback_text = _fallback_simplification(text, notice_type, severity)
-        return {"hinglish": fallback_text, "english": "This is a government notice. Please review the details carefully."}
+        parsed = json.loads(_strip_code_fence(raw))
+        if isinstance(parsed, dict):
+            return parsed
+    except ValueError:
+        pass
+    if LLM_PROVIDER == "groq":
+        # Fallback if valid JSON not returned
+        return {"hinglish": raw, "english": UNPARSED_ENGLISH[0]}
+    return {"hinglish": raw, "english": UNPARSED_ENGLISH[1]}
 
 
-def _simplify_with_openai(prompt: str) -> str:
+def _strip_code_fence(raw: str) -> str:
+    """Gemini/OpenAI often wrap JSON in ```json ... ``` fences"""
+    stripped = raw.strip()
+    if stripped.startswith("```") and stripped.endswith("```"):
+        stripped = stripped[3:-3]
+        if stripped.startswith("json"):
+            stripped = stripped[4:]
+    return stripped
+
+
+def fallback_explanation(text: str, notice_type: str = "", severity: str = "") -> dict:
+    """Rule-based explanation used when no LLM is configured or the call fails"""
+    fallback_text = _fallback_simplification(text, notice_type, severity)
+    return {"hinglish": fallback_text, "english": FALLBACK_ENGLISH}
+
+
+def is_fallback_explanation(explanation) -> bool:
+    """True if the explanation came from the rule-based fallback instead of an LLM"""
+    return isinstance(explanation, dict) and explanation.get("english") == FALLBACK_ENGLISH
+
+
+def is_unparsed_explanation(explanation) -> bool:
+    """True if parse_explanation() got LLM output that was not JSON and wrapped it raw"""
+    return isinstance(explanation, dict) and explanation.get("english") in UNPARSED_ENGLISH
+
+
+async def _complete_text(provider: str, prompt: str, max_tokens: int) -> str:
+    """Plain-text completion from one provider (no JSON mode)"""
+    if provider == "mock":
+        return await mock_llm.complete(prompt, max_tokens)
+    messages = [{"role": "user", "content": prompt}]
+    if provider == "groq":
+        response = await llm_clients.groq().chat.completions.create(
+            model=GROQ_MODEL, messages=messages, temperature=0.2, max_tokens=max_tokens
+        )
+        return response.choices[0].message.content.strip()
+    if provider == "gemini":
+        response = await llm_clients.gemini().generate_content_async(
+            prompt, generation_config={"max_output_tokens": max_tokens, "temperature": 0.2}
+        )
+        return response.text.strip()
+    response = await llm_clients.openai().chat.completions.create(
+        model=OPENAI_MODEL, messages=messages, temperature=0.2, max_tokens=max_tokens
+    )
+    return response.choices[0].message.content.strip()
+
+
+async def _simplify_with_openai(prompt: str) -> str:
     """Use OpenAI API for simplification"""
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that explains government notices in simple Hinglish."},
-                {"role": "user", "content": prompt}
-            ],
+        response = await llm_clients.openai().chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=_openai_messages(prompt),
             temperature=0.7,
             max_tokens=500
         )
@@ -98,34 +398,22 @@ def _simplify_with_openai(prompt: str) -> str:
         raise Exception(f"OpenAI API error: {e}")
 
 
-def _simplify_with_gemini(prompt: str) -> str:
+async def _simplify_with_gemini(prompt: str) -> str:
     """Use Google Gemini API for simplification"""
     try:
-        import google.generativeai as genai
-        genai.configure(api_key=GOOGLE_API_KEY)
-        
-        # Use latest stable Gemini model
-        model = genai.GenerativeModel('models/gemini-2.0-flash')
-        response = model.generate_content(prompt)
+        response = await llm_clients.gemini().generate_content_async(prompt)
         
         return response.text.strip()
     except Exception as e:
         raise Exception(f"Gemini API error: {e}")
 
 
-def _simplify_with_groq(prompt: str) -> str:
+async def _simplify_with_groq(prompt: str) -> str:
     """Use Groq API with Mixtral for simplification - FAST & FREE!"""
     try:
-        from groq import Groq
-        
-        client = Groq(api_key=GROQ_API_KEY)
-        
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",  # Current supported model
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant. You must provide your response in valid JSON format with two keys: 'english' and 'hinglish'."},
-                {"role": "user", "content": prompt + "\n\nProvide the response as a JSON object with 'english' and 'hinglish' fields. Ensure all sub-fields (Title, Summary, Explanation, Reason, Next Steps, Important Deadlines, Who is affected, Issuing Authority, Notice Number) are present."}
-            ],
+        response = await llm_clients.groq().chat.completions.create(
+            model=GROQ_MODEL,  # Current supported model
+            messages=_groq_messages(prompt),
             temperature=0.3,
             max_tokens=1000,
             response_format={"type": "json_object"}
@@ -137,6 +425,28 @@ def _simplify_with_groq(prompt: str) -> str:
 
 
 
+_SIMPLIFIERS = {
+    "groq": _simplify_with_groq,
+    "gemini": _simplify_with_gemini,
+    "openai": _simplify_with_openai,
+    "mock": mock_llm.explain
+}
+
+
+def _openai_messages(prompt: str) -> list:
+    return [
+        {"role": "system", "content": "You are a helpful assistant that explains government notices in simple Hinglish."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _groq_messages(prompt: str) -> list:
+    return [
+        {"role": "system", "content": "You are a helpful assistant. You must provide your response in valid JSON format with two keys: 'english' and 'hinglish'."},
+        {"role": "user", "content": prompt + "\n\nProvide the response as a JSON object with 'english' and 'hinglish' fields. Ensure all sub-fields (Title, Summary, Explanation, Reason, Next Steps, Important Deadlines, Who is affected, Issuing Authority, Notice Number) are present."}
+    ]
+
+
 def _fallback_simplification(text: str, notice_type: str, severity: str) -> str:
     """Fallback rule-based simplification - extracts key info from actual text"""
     
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import re
+from core.config import LLM_PROVIDER, TRANSLATE_MAX_TOKENS, TRANSLATE_PACK_TOKENS, TRANSLATE_CONCURRENCY
+from core.logger import get_logger
+from services.llm_clients import llm_clients, GROQ_MODEL, MODELS
+from services import llm_cache
+from services.mock_llm import mock_llm
+from services.llm_scheduler import llm_scheduler, PRIORITY_TRANSLATION
+from services.notice_chunker import estimate_tokens, split_into_chunks
+
+logger = get_logger(__name__)
+
+# Bump whenever the translation prompts change; cached translations are keyed on it
+TRANSLATE_PROMPT_VERSION = "translate-1"
+
+# Translations go to Groq, or to the offline mock when LLM_PROVIDER=mock
+TRANSLATE_PROVIDER = "mock" if LLM_PROVIDER == "mock" else "groq"
+
+# Where oversized segments may be split: line breaks, then sentence ends
+_BREAK = re.compile(r"(\n\s*|(?<=[.!?।])[ \t]+)")
+
+
+async def translate_segments(segments: list, languages: list) -> dict:
+    """
+    Translate every segment into every language; returns language -> translated
+    segments in input order. Each segment is cached per language, uncached ones
+    are packed into as few calls as fit TRANSLATE_PACK_TOKENS and the calls run
+    concurrently (at most TRANSLATE_CONCURRENCY at once).
+    """
+    semaphore = asyncio.Semaphore(TRANSLATE_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_translate_language(segments, language, semaphore) for language in languages)
+    )
+    return dict(zip(languages, results))
+
+
+async def translate_text(text: str, language: str) -> str:
+    translations = await translate_segments([text], [language])
+    return translations[language][0]
+
+
+async def _translate_language(segments: list, language: str, semaphore: asyncio.Semaphore) -> list:
+    # Oversized segments are translated in parts and joined again
+    plans = [_parts(segment) for segment in segments]
+
+    translated = {}
+    missing = []
+    for parts in plans:
+        for unit, _ in parts:
+            if unit in translated or unit in missing:
+                continue
+            cached = llm_cache.get_response(_cache_key(language, unit))
+            if cached is None:
+                missing.append(unit)
+            else:
+                translated[unit] = cached
+
+    packs = _pack(missing)
+    if packs:
+        logger.info(f"Translating {len(missing)} segments to {language} in {len(packs)} calls")
+    outputs = await asyncio.gather(*(_translate_pack(pack, language, semaphore) for pack in packs))
+    for pack, output in zip(packs, outputs):
+        for unit, text in zip(pack, output):
+            translated[unit] = text
+            llm_cache.set_response(_cache_key(language, unit), text)
+
+    return ["".join(translated[unit] + separator for unit, separator in parts) for parts in plans]
+
+
+def _parts(segment: str) -> list:
+    """
+    (text, separator) pairs of at most TRANSLATE_PACK_TOKENS each, split at
+    line breaks and sentence ends; separator is the whitespace that followed
+    the part. Formatting is preserved in translations, so only outer
+    whitespace is normalized.
+    """
+    text = segment.strip()
+    if not text:
+        return []
+    if estimate_tokens(text) <= TRANSLATE_PACK_TOKENS:
+        return [(text, "")]
+
+    pieces = _BREAK.split(text)  # text, separator, text, ..., text
+    parts = []  # [text, separator, tokens]
+    for i in range(0, len(pieces), 2):
+        piece = pieces[i]
+        separator = pieces[i + 1] if i + 1 < len(pieces) else ""
+        tokens = estimate_tokens(piece)
+        if parts and parts[-1][2] + tokens <= TRANSLATE_PACK_TOKENS:
+            last = parts[-1]
+            last[0] += last[1] + piece
+            last[1] = separator
+            last[2] += tokens
+        elif tokens <= TRANSLATE_PACK_TOKENS:
+            parts.append([piece, separator, tokens])
+        else:
+            # Run-on text without sentence ends: cut by words
+            words = split_into_chunks(piece, TRANSLATE_PACK_TOKENS)
+            parts.extend([word_chunk, " ", TRANSLATE_PACK_TOKENS] for word_chunk in words)
+            parts[-1][1] = separator
+    return [(part, separator) for part, separator, _ in parts]
+
+
+def _pack(units: list) -> list:
+    """Group units into packs of at most TRANSLATE_PACK_TOKENS input tokens"""
+    packs = []
+    current = []
+    current_tokens = 0
+    for unit in units:
+        tokens = estimate_tokens(unit)
+        if current and current_tokens + tokens > TRANSLATE_PACK_TOKENS:
+            packs.append(current)
+            current, current_tokens = [], 0
+        current.append(unit)
+        current_tokens += tokens
+    if current:
+        packs.append(current)
+    return packs
+
+
+def _cache_key(language: str, text: str) -> str:
+    return llm_cache.response_key(
+        TRANSLATE_PROVIDER, MODELS[TRANSLATE_PROVIDER], TRANSLATE_PROMPT_VERSION,
+        language.strip().lower(), text
+    )
+
+
+async def _translate_pack(pack: list, language: str, semaphore: asyncio.Semaphore) -> list:
+    output = await _call(pack, language, semaphore)
+    if output is not None:
+        return output
+    # The model merged, dropped or split strings: translate them one by one
+    logger.warning(f"Packed translation to {language} returned the wrong number of segments, retrying individually")
+    outputs = await asyncio.gather(*(_call([unit], language, semaphore) for unit in pack))
+    return [output[0] for output in outputs]
+
+
+async def _call(pack: list, language: str, semaphore: asyncio.Semaphore):
+    """One provider call; None if a packed response cannot be matched to its segments"""
+    async with semaphore:
+        # Translations queue behind notice explanations when near the rate limit
+        tokens = sum(estimate_tokens(unit) for unit in pack)
+        await llm_scheduler.acquire(TRANSLATE_PROVIDER, 2 * tokens + 100, PRIORITY_TRANSLATION)
+
+        if TRANSLATE_PROVIDER == "mock":
+            if len(pack) == 1:
+                return [await mock_llm.translate(pack[0], language)]
+            return await mock_llm.translate_batch(pack, language)
+
+        if len(pack) == 1:
+            return [await _translate_with_groq(pack[0], language)]
+        return await _translate_many_with_groq(pack, language)
+
+
+async def _translate_with_groq(text: str, language: str) -> str:
+    prompt = f"""Translate the following text to {language}.
+        Maintain the tone and formatting.
+        Return ONLY the translated text, no introductory or concluding remarks.
+
+        Text to translate:
+        {text}
+        """
+
+    response = await llm_clients.groq().chat.completions.create(
+        model=GROQ_MODEL,
+        messages=[
+            {"role": "system", "content": f"You are a professional translator. Translate content to {language} accurately."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.3,
+        max_tokens=TRANSLATE_MAX_TOKENS
+    )
+
+    translated = response.choices[0].message.content.strip()
+
+    # Cleanup if it returns quotes
+    if translated.startswith('"') and translated.endswith('"'):
+        translated = translated[1:-1]
+    return translated
+
+
+async def _translate_many_with_groq(texts: list, language: str):
+    prompt = f"""Translate each string in the JSON array below to {language}.
+        Maintain the tone and formatting of each string.
+        Return a JSON object {{"translations": [...]}} with exactly {len(texts)} translated strings, in the same order.
+
+        Strings to translate:
+        {json.dumps(texts, ensure_ascii=False)}
+        """
+
+    response = await llm_clients.groq().chat.completions.create(
+        model=GROQ_MODEL,
+        messages=[
+            {"role": "system", "content": f"You are a professional translator. Translate content to {language} accurately."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.3,
+        max_tokens=TRANSLATE_MAX_TOKENS,
+        response_format={"type": "json_object"}
+    )
+
+    try:
+        translations = json.loads(response.choices[0].message.content).get("translations")
+    except (ValueError, AttributeError):
+        return None
+    if not isinstance(translations, list) or len(translations) != len(texts):
+        return None
+    if not all(isinstance(t, str) for t in translations):
+        return None
+    return [t.strip() for t in translations]
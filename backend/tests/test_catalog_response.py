@@ -0,0 +1,30 @@
+"""Pre-serialized GET /schemes responses: page variant caching."""
+from services import catalog_response
+from services.catalog_response import CatalogResponses
+
+SCHEMES = tuple({"name": f"Scheme {i}", "category": "Farmer", "state": "Kerala"} for i in range(20))
+
+
+def test_page_variants_are_evicted_least_recently_served_first(monkeypatch):
+    monkeypatch.setattr(catalog_response, "MAX_VARIANTS", 3)
+    responses = CatalogResponses(SCHEMES)
+    first = responses.get((), 0, 1)
+    responses.get((), 1, 1)
+    responses.get((), 2, 1)
+
+    assert responses.get((), 0, 1) is first  # served again: now the most recent
+    responses.get((), 3, 1)
+
+    assert list(responses._variants) == [((), 2, 1), ((), 0, 1), ((), 3, 1)]
+    assert responses.get((), 0, 1) is first
+
+
+def test_canonical_variants_are_never_evicted(monkeypatch):
+    monkeypatch.setattr(catalog_response, "MAX_VARIANTS", 1)
+    responses = CatalogResponses(SCHEMES)
+    full = responses.get()
+    for offset in range(5):
+        responses.get(("name",), offset, 2)
+
+    assert responses.get() is full
+    assert len(responses._variants) == 1
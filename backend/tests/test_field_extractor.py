@@ -0,0 +1,26 @@
+"""Condensing a notice for the LLM prompt: sentences across OCR line breaks, repeats dropped."""
+from services.field_extractor import condense_notice, extract_fields
+
+HEADER = """OFFICE OF THE TEHSILDAR, SADAR
+Notice No. REV/2024/118
+To, Shri Mohan Lal
+Subject: Mutation of land records
+"""
+
+
+def condense(body: str) -> str:
+    text = HEADER + body
+    return condense_notice(text, extract_fields(text))
+
+
+def test_a_sentence_wrapped_across_lines_is_kept_whole():
+    condensed = condense("You are directed to appear before the\nundersigned on 15.04.2024 with the\nsale deed.\n")
+
+    assert "You are directed to appear before the undersigned on 15.04.2024 with the sale deed." in condensed
+
+
+def test_repeated_sentences_are_kept_once():
+    footer = "Failure to appear shall attract\npenalty under the Act.\n\n"
+    condensed = condense(footer + "Page 2 of 3\n\n" + footer.upper() + "Page 3 of 3\n\n" + footer)
+
+    assert condensed.lower().count("failure to appear shall attract penalty") == 1
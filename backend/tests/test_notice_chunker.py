@@ -0,0 +1,13 @@
+"""Splitting long notices into LLM-sized chunks."""
+from services.notice_chunker import estimate_tokens, split_into_chunks
+
+
+def test_run_on_text_is_cut_into_chunks_within_the_limit():
+    words = ["₹5000", "नोटिस", "penalty", "section"] * 5000
+    text = " ".join(words)
+
+    chunks = split_into_chunks(text, 200)
+
+    assert " ".join(chunks).split() == words
+    assert all(estimate_tokens(chunk) <= 200 for chunk in chunks)
+    assert all(estimate_tokens(chunk) >= 195 for chunk in chunks[:-1])
@@ -0,0 +1,78 @@
+"""Parallel PDF extraction: what page-range tasks are sent, and failure mid-wave."""
+import asyncio
+import io
+import os
+
+import pytest
+from PyPDF2 import PdfWriter
+
+from core.workers import WorkerPoolBusy
+from services import notice_pipeline
+
+
+def blank_pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=595, height=842)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+class FakePools:
+    """Runs pool functions inline; the page range starting at busy_start is refused"""
+
+    def __init__(self, busy_start=None):
+        self.busy_start = busy_start
+        self.calls = []
+        self.cancelled = 0
+
+    async def run_ocr(self, fn, *args):
+        self.calls.append(args)
+        if args[1:2] == (self.busy_start,):
+            raise WorkerPoolBusy("OCR queue is full")
+        if len(args) > 1:
+            try:
+                await asyncio.sleep(0.2)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        return fn(*args)
+
+
+@pytest.fixture
+def fake_pools(monkeypatch):
+    def install(busy_start=None):
+        pools = FakePools(busy_start)
+        monkeypatch.setattr(notice_pipeline, "pools", pools)
+        monkeypatch.setattr(notice_pipeline, "OCR_POOL_SIZE", 3)
+        monkeypatch.setattr(notice_pipeline, "PDF_PAGES_PER_TASK", 2)
+        return pools
+    return install
+
+
+def test_tasks_are_sent_a_file_path_not_the_pdf(fake_pools):
+    pools = fake_pools()
+
+    asyncio.run(notice_pipeline._extract_pdf_text(blank_pdf(6)))
+
+    paths = {args[0] for args in pools.calls}
+    assert len(paths) == 1 and all(isinstance(path, str) for path in paths)
+    assert sorted(args[1:] for args in pools.calls if len(args) > 1) == [(0, 2), (2, 4), (4, 6)]
+    assert not os.path.exists(paths.pop())
+
+
+def test_a_busy_pool_cancels_the_rest_of_the_wave(fake_pools):
+    pools = fake_pools(busy_start=2)
+
+    async def extract():
+        try:
+            await notice_pipeline._extract_pdf_text(blank_pdf(6))
+        finally:
+            await asyncio.sleep(0)  # let cancellations land, before asyncio.run cancels leftovers
+            assert pools.cancelled == 2
+
+    with pytest.raises(WorkerPoolBusy):
+        asyncio.run(extract())
+
+    assert not os.path.exists(pools.calls[0][0])
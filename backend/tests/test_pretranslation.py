@@ -0,0 +1,28 @@
+"""Pre-translation segments: the same texts the results page sends to POST /translate."""
+from services.pretranslation import _rebuild, _segments
+
+ENGLISH = {
+    "Summary": "Pay the property tax.",
+    "Important Deadlines": ["Pay by 31 March", "Appeal by 15 April"],
+    "Is Notice": True,
+}
+
+
+def test_a_list_field_is_one_segment_with_one_item_per_line():
+    assert _segments(ENGLISH) == ["Pay the property tax.", "Pay by 31 March\nAppeal by 15 April"]
+
+
+def test_translations_are_put_back_in_their_fields():
+    translated = _rebuild(ENGLISH, iter(["संपत्ति कर चुकाएं।", "31 मार्च तक चुकाएं\n15 अप्रैल तक अपील करें"]))
+
+    assert translated == {
+        "Summary": "संपत्ति कर चुकाएं।",
+        "Important Deadlines": ["31 मार्च तक चुकाएं", "15 अप्रैल तक अपील करें"],
+        "Is Notice": True,
+    }
+
+
+def test_a_list_translated_with_merged_lines_is_kept_whole():
+    translated = _rebuild(ENGLISH, iter(["x", "31 मार्च तक चुकाएं, 15 अप्रैल तक अपील करें"]))
+
+    assert translated["Important Deadlines"] == ["31 मार्च तक चुकाएं, 15 अप्रैल तक अपील करें"]
@@ -0,0 +1,173 @@
+"""
+data.gov.in fetching against a local stand-in server (http.server in a
+thread): retries, Retry-After, concurrency and coalesced refreshes.
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services import scheme_engine, scheme_fetcher
+
+RESOURCES = {f"scheme_{i}": f"resource-{i}" for i in range(5)}
+
+
+class StandIn:
+    """
+    Scripted data.gov.in: each resource id answers with its queued
+    (status, headers) responses in turn, then 200 with two records.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.script = {}
+        self.hits = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def respond(self, resource_id: str, handler: BaseHTTPRequestHandler):
+        with self._lock:
+            self.hits[resource_id] = self.hits.get(resource_id, 0) + 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            queued = self.script.get(resource_id)
+            status, headers = queued.pop(0) if queued else (200, {})
+        try:
+            time.sleep(self.delay)
+            body = json.dumps({"records": [{"id": 1}, {"id": 2}]} if status == 200 else {"error": status}).encode()
+            handler.send_response(status)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(body)))
+            for name, value in headers.items():
+                handler.send_header(name, value)
+            handler.end_headers()
+            handler.wfile.write(body)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def stand_in():
+    state = StandIn()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            assert "api-key=test-key" in self.path
+            state.respond(self.path.split("?")[0].strip("/"), self)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.base_url = f"http://127.0.0.1:{server.server_port}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(scheme_fetcher, "SCHEMES_FETCH_BACKOFF", 0.01)
+    monkeypatch.setattr(scheme_fetcher, "SCHEMES_FETCH_RETRIES", 3)
+    monkeypatch.setattr(scheme_fetcher, "SCHEMES_FETCH_CONCURRENCY", 5)
+
+
+def fetch(stand_in, resources=RESOURCES):
+    return asyncio.run(scheme_fetcher.fetch_resources(stand_in.base_url, "test-key", resources))
+
+
+def test_503_is_retried_until_it_succeeds(stand_in):
+    stand_in.script["resource-0"] = [(503, {}), (503, {})]
+
+    results = fetch(stand_in)
+
+    assert set(results) == set(RESOURCES)
+    assert results["scheme_0"]["records"] == [{"id": 1}, {"id": 2}]
+    assert stand_in.hits["resource-0"] == 3
+
+
+def test_503_gives_up_after_the_configured_retries(stand_in):
+    stand_in.script["resource-0"] = [(503, {})] * 10
+
+    results = fetch(stand_in)
+
+    assert "scheme_0" not in results
+    assert stand_in.hits["resource-0"] == scheme_fetcher.SCHEMES_FETCH_RETRIES + 1
+
+
+def test_404_is_not_retried(stand_in):
+    stand_in.script["resource-1"] = [(404, {})]
+
+    results = fetch(stand_in)
+
+    assert "scheme_1" not in results
+    assert stand_in.hits["resource-1"] == 1
+    assert len(results) == len(RESOURCES) - 1
+
+
+def test_retry_after_is_honoured(stand_in):
+    stand_in.script["resource-0"] = [(429, {"Retry-After": "1"})]
+
+    start = time.monotonic()
+    results = fetch(stand_in, {"scheme_0": "resource-0"})
+
+    assert "scheme_0" in results
+    assert time.monotonic() - start >= 1.0
+
+
+def test_retry_after_is_capped(stand_in, monkeypatch):
+    monkeypatch.setattr(scheme_fetcher, "MAX_RETRY_AFTER", 0.2)
+    stand_in.script["resource-0"] = [(503, {"Retry-After": "3600"})]
+
+    start = time.monotonic()
+    results = fetch(stand_in, {"scheme_0": "resource-0"})
+
+    assert "scheme_0" in results
+    assert 0.2 <= time.monotonic() - start < 5
+
+
+def test_resources_are_fetched_concurrently(stand_in):
+    stand_in.delay = 0.3
+
+    start = time.monotonic()
+    results = fetch(stand_in)
+    elapsed = time.monotonic() - start
+
+    assert len(results) == len(RESOURCES)
+    assert stand_in.max_in_flight == len(RESOURCES)
+    assert elapsed < 0.3 * len(RESOURCES) / 2
+
+
+def test_concurrency_is_bounded(stand_in, monkeypatch):
+    monkeypatch.setattr(scheme_fetcher, "SCHEMES_FETCH_CONCURRENCY", 2)
+    stand_in.delay = 0.1
+
+    results = fetch(stand_in)
+
+    assert len(results) == len(RESOURCES)
+    assert stand_in.max_in_flight == 2
+
+
+def test_concurrent_refreshes_share_one_fetch(stand_in, monkeypatch):
+    stand_in.delay = 0.2
+    monkeypatch.setattr(scheme_engine, "DATA_GOV_IN_API_KEY", "test-key")
+    monkeypatch.setattr(
+        scheme_engine, "fetch_resources",
+        lambda: scheme_fetcher.fetch_resources(stand_in.base_url, "test-key", RESOURCES)
+    )
+
+    async def refresh_concurrently():
+        return await asyncio.gather(*(scheme_engine.refresh_schemes() for _ in range(5)))
+
+    results = asyncio.run(refresh_concurrently())
+
+    assert stand_in.hits == {resource_id: 1 for resource_id in RESOURCES.values()}
+    assert all(schemes == results[0] for schemes in results)
+    assert scheme_engine.get_api_status()["resources_fetched"] == len(RESOURCES)
@@ -0,0 +1,57 @@
+"""Scheme suggestions for notices: BM25 ranking with a relevance floor."""
+from services.scheme_engine import SchemeEngine
+from services.scheme_ranker import SchemeRanker
+
+SCHEMES = [
+    {"name": "PM Kisan Samman Nidhi", "category": "Farmer", "description": "Income support for farmers",
+     "eligibility": "Small and marginal farmers", "ministry": "Agriculture"},
+    {"name": "Ayushman Bharat", "category": "Health", "description": "Health insurance cover",
+     "eligibility": "Poor families", "ministry": "Health"},
+    {"name": "PM Awas Yojana", "category": "Housing", "description": "Housing for the urban poor",
+     "eligibility": "Families without a pucca house", "ministry": "Housing"},
+    {"name": "Delhi Mukhyamantri Tirth Yatra Yojana", "category": "Senior Citizen",
+     "description": "Free pilgrimage for senior citizens of Delhi", "eligibility": "Residents of Delhi aged 60+",
+     "ministry": "Delhi Government"},
+    {"name": "Pradhan Mantri Fasal Bima Yojana", "category": "Farmer",
+     "description": "Crop insurance against crop loss", "eligibility": "Farmers growing notified crops",
+     "ministry": "Agriculture"},
+]
+
+CHALLAN = ("Delhi Traffic Police e-Challan. Vehicle DL3CAB1234 was found jumping a red light at ITO, "
+           "Delhi. Fine to be paid within 60 days at the virtual court.")
+CROP = "Farmers must file crop insurance claims for crop loss in the kharif season with land records."
+
+
+def engine_with(schemes):
+    engine = SchemeEngine()
+    engine._set_schemes(schemes)
+    return engine
+
+
+def test_a_lone_place_name_match_is_not_a_suggestion():
+    ranker = SchemeRanker(SCHEMES)
+
+    assert ranker.top(CHALLAN, "Traffic Challan") == []
+
+
+def test_relevant_schemes_rank_first():
+    ranker = SchemeRanker(SCHEMES)
+
+    assert ranker.top(CROP, "Agriculture Notice")[0] == 4
+
+
+def test_notice_with_few_matching_terms_still_gets_three_suggestions():
+    engine = engine_with(SCHEMES)
+
+    names = [s["name"] for s in engine.suggest_schemes(CHALLAN, "Traffic Challan")]
+
+    assert names == ["PM Kisan Samman Nidhi", "Ayushman Bharat", "PM Awas Yojana"]
+
+
+def test_fallback_fills_after_matches_without_duplicates():
+    engine = engine_with(SCHEMES)
+
+    names = [s["name"] for s in engine.suggest_schemes(CROP, "Agriculture Notice")]
+
+    assert len(names) == 3 == len(set(names))
+    assert names[0] == "Pradhan Mantri Fasal Bima Yojana"
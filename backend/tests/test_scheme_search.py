@@ -0,0 +1,35 @@
+"""Scheme search index: published indexes are never written by searches or successors."""
+import numpy as np
+import pytest
+
+from services.scheme_catalog import CatalogSnapshot
+
+SCHEMES = [
+    {"name": "PM Kisan Samman Nidhi", "category": "Farmer", "description": "Income support for farmers"},
+    {"name": "Pradhan Mantri Ujjwala Yojana", "category": "Energy", "description": "Free LPG connections"},
+    {"name": "Kisan Credit Card", "category": "Farmer", "description": "Credit for farmers"},
+]
+
+
+def test_search_does_not_modify_a_published_index():
+    index = CatalogSnapshot.empty().successor(SCHEMES)[0].search_index
+    postings, vocabulary = index._postings, index._sorted_words
+
+    found = index.search("kisan ujwala", limit=10)
+
+    assert len(found["results"]) == 3
+    assert index._postings is postings and index._sorted_words is vocabulary
+    with pytest.raises(TypeError):
+        index._postings["kisan"] = (np.array([0]), np.array([1.0]))
+    with pytest.raises(ValueError):
+        index._postings["kisan"][0][0] = 2
+
+
+def test_successor_leaves_the_previous_index_serving():
+    first = CatalogSnapshot.empty().successor(SCHEMES)[0]
+    before = first.search_index.search("kisan")
+
+    second = first.successor(SCHEMES[1:])[0]
+
+    assert first.search_index.search("kisan") == before
+    assert [s["name"] for s in second.search_index.search("kisan")["results"]] == ["Kisan Credit Card"]
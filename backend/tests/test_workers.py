@@ -0,0 +1,26 @@
+"""OCR process pool: recovery after a worker process dies."""
+import asyncio
+import os
+import signal
+import time
+
+from core.workers import WorkerPools
+
+
+def test_ocr_call_after_a_worker_is_killed_succeeds():
+    pools = WorkerPools()
+    pools.start()
+    try:
+        async def scenario():
+            worker = await pools.run_ocr(os.getpid)
+            os.kill(worker, signal.SIGKILL)
+            time.sleep(0.5)  # let the executor notice the dead worker
+            return worker, await pools.run_ocr(os.getpid), await pools.run_ocr(os.getpid)
+
+        killed, first, second = asyncio.run(scenario())
+
+        assert first != killed and second != killed
+        assert pools.stats()["ocr"]["restarts"] == 1
+        assert pools.stats()["ocr"]["pending"] == 0
+    finally:
+        pools.shutdown()
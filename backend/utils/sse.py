@@ -0,0 +1,10 @@
+import json
+
+
+def format_sse(event: str, data) -> str:
+    """Encode one Server-Sent Events message with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+# Comment line that keeps idle SSE connections open through proxies
+SSE_KEEPALIVE = ": keep-alive\n\n"
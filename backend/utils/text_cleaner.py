@@ -1,2 +1,7 @@
 def clean_text(text: str) -> str:
     return text.strip()
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of whitespace so layout differences hash the same"""
+    return " ".join(text.split())
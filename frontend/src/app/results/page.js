@@ -127,6 +127,8 @@ export default function ResultsPage() {
 
     const translateText = async (text, targetLang) => {
         if (!text || targetLang === 'english') return text;
+        // List fields go as one text, one item per line (the backend pre-translates them the same way)
+        if (Array.isArray(text)) text = text.join('\n');
         try {
             const token = localStorage.getItem("cs_token");
             const response = await fetch(`${process.env.NEXT_PUBLIC_API_BASE_URL}/api/v1/translate`, {